@@ -29,12 +29,15 @@ INSTALLED_APPS = [
 ]
 
 MIDDLEWARE = [
+    "core.middleware.PerformanceMiddleware",
+    "core.middleware.MetricsMiddleware",
     "corsheaders.middleware.CorsMiddleware",
     "django.middleware.security.SecurityMiddleware",
     "django.contrib.sessions.middleware.SessionMiddleware",
     "django.middleware.common.CommonMiddleware",
     "django.middleware.csrf.CsrfViewMiddleware",
     "django.contrib.auth.middleware.AuthenticationMiddleware",
+    "core.middleware.ReplicaReadMiddleware",
     "django.contrib.messages.middleware.MessageMiddleware",
     "django.middleware.clickjacking.XFrameOptionsMiddleware",
 ]
@@ -62,24 +65,60 @@ ASGI_APPLICATION = "academy.asgi.application"
 
 # Database: default sqlite; switch to Postgres via env vars
 if os.getenv("DB_NAME"):
-    DATABASES = {
-        "default": {
-            "ENGINE": "django.db.backends.postgresql",
-            "NAME": os.getenv("DB_NAME"),
-            "USER": os.getenv("DB_USER"),
-            "PASSWORD": os.getenv("DB_PASSWORD"),
-            "HOST": os.getenv("DB_HOST", "localhost"),
-            "PORT": os.getenv("DB_PORT", "5432"),
-        }
+    PRIMARY_DATABASE = {
+        "ENGINE": "django.db.backends.postgresql",
+        "NAME": os.getenv("DB_NAME"),
+        "USER": os.getenv("DB_USER"),
+        "PASSWORD": os.getenv("DB_PASSWORD"),
+        "HOST": os.getenv("DB_HOST", "localhost"),
+        "PORT": os.getenv("DB_PORT", "5432"),
+        # Persistent connections, checked before each request reuses them
+        "CONN_MAX_AGE": int(os.getenv("DB_CONN_MAX_AGE", "60")),
+        "CONN_HEALTH_CHECKS": True,
     }
-else:
-    DATABASES = {
-        "default": {
-            "ENGINE": "django.db.backends.sqlite3",
-            "NAME": BASE_DIR / "db.sqlite3",
+    if os.getenv("DB_POOL", "false").lower() == "true":
+        # Needs psycopg 3 with its pool (pip install "psycopg[binary,pool]"); with CONN_HEALTH_CHECKS
+        # connections are checked as they leave the pool
+        PRIMARY_DATABASE["CONN_MAX_AGE"] = 0
+        PRIMARY_DATABASE["OPTIONS"] = {
+            "pool": {
+                "min_size": int(os.getenv("DB_POOL_MIN_SIZE", "2")),
+                "max_size": int(os.getenv("DB_POOL_MAX_SIZE", "10")),
+                "timeout": float(os.getenv("DB_POOL_TIMEOUT", "10")),
+            }
         }
+else:
+    PRIMARY_DATABASE = {
+        "ENGINE": "django.db.backends.sqlite3",
+        "NAME": BASE_DIR / "db.sqlite3",
     }
 
+# Opt-in SQLite profile for concurrent use (core/sqlite.py): WAL journal, busy timeout, synchronous=NORMAL,
+# memory-mapped reads, a larger page cache and BEGIN IMMEDIATE transactions on every new connection
+SQLITE_TUNING = os.getenv("SQLITE_TUNING", "false").lower() == "true"
+SQLITE_BUSY_TIMEOUT_MS = int(os.getenv("SQLITE_BUSY_TIMEOUT_MS", "5000"))
+SQLITE_MMAP_SIZE = int(os.getenv("SQLITE_MMAP_SIZE", str(256 * 1024 * 1024)))
+SQLITE_CACHE_SIZE_KB = int(os.getenv("SQLITE_CACHE_SIZE_KB", str(64 * 1024)))
+
+# Read replicas (core/replicas.py): comma-separated Postgres hosts (host or host:port), or SQLite files as local
+# stand-ins, with the primary's credentials and settings. Tests mirror them onto the test database.
+def _replica_database(location):
+    if PRIMARY_DATABASE["ENGINE"].endswith("sqlite3"):
+        return {**PRIMARY_DATABASE, "NAME": location, "TEST": {"MIRROR": "default"}}
+    host, _, port = location.partition(":")
+    return {**PRIMARY_DATABASE, "HOST": host, "PORT": port or PRIMARY_DATABASE["PORT"], "TEST": {"MIRROR": "default"}}
+
+
+REPLICA_DATABASES = {
+    f"replica{number}": _replica_database(location.strip())
+    for number, location in enumerate(filter(None, os.getenv("DB_REPLICAS", "").split(",")), start=1)
+}
+DATABASE_REPLICAS = list(REPLICA_DATABASES)
+DATABASES = {"default": PRIMARY_DATABASE, **REPLICA_DATABASES}
+DATABASE_ROUTERS = ["core.replicas.ReplicaRouter"]
+# After a write, the client's reads stay on the primary this long (replication lag)
+REPLICA_STICKY_SECONDS = int(os.getenv("REPLICA_STICKY_SECONDS", "10"))
+
 AUTH_PASSWORD_VALIDATORS = [
     {"NAME": "django.contrib.auth.password_validation.UserAttributeSimilarityValidator"},
     {"NAME": "django.contrib.auth.password_validation.MinimumLengthValidator"},
@@ -98,11 +137,34 @@ STATIC_ROOT = BASE_DIR / "staticfiles"
 MEDIA_URL = "/media/"
 MEDIA_ROOT = BASE_DIR / "media"
 
+# Photos are stored under content-hash names and deduplicated (see core/storage.py)
+STORAGES = {
+    "default": {"BACKEND": "core.storage.ContentHashedStorage"},
+    "staticfiles": {"BACKEND": "django.contrib.staticfiles.storage.StaticFilesStorage"},
+}
+MEDIA_HASHED_DIRS = ["player_photos", "coach_photos"]
+# Serve MEDIA_URL from Django (with cache headers); defaults to on in debug only
+SERVE_MEDIA = os.getenv("DJANGO_SERVE_MEDIA", str(DEBUG)).lower() == "true"
+# Cache lifetime (seconds) for media that is not content-addressed
+MEDIA_CACHE_MAX_AGE = int(os.getenv("MEDIA_CACHE_MAX_AGE", "3600"))
+
 DEFAULT_AUTO_FIELD = "django.db.models.BigAutoField"
 
 REST_FRAMEWORK = {
+    # Picked by the Accept / Content-Type header (see core/renderers.py)
+    "DEFAULT_RENDERER_CLASSES": (
+        "core.renderers.ORJSONRenderer",
+        "core.renderers.MessagePackRenderer",
+        "rest_framework.renderers.BrowsableAPIRenderer",
+    ),
+    "DEFAULT_PARSER_CLASSES": (
+        "core.renderers.ORJSONParser",
+        "core.renderers.MessagePackParser",
+        "rest_framework.parsers.FormParser",
+        "rest_framework.parsers.MultiPartParser",
+    ),
     "DEFAULT_AUTHENTICATION_CLASSES": (
-        "rest_framework_simplejwt.authentication.JWTAuthentication",
+        "core.authentication.JWTAuthentication",
     ),
     "DEFAULT_PERMISSION_CLASSES": (
         "rest_framework.permissions.IsAuthenticated",
@@ -118,6 +180,58 @@ SIMPLE_JWT = {
     "REFRESH_TOKEN_LIFETIME": timedelta(days=7),
 }
 
+# Serve player/group list and detail reads from values() rows instead of serializers (core/lean.py)
+LEAN_READS = os.getenv("LEAN_READS", "true").lower() == "true"
+
+# Processes rendering the player reports of a ZIP download (core/pdf.py), one per CPU by default; 1 renders them in the request
+REPORT_RENDER_WORKERS = int(os.getenv("REPORT_RENDER_WORKERS", str(os.cpu_count() or 1)))
+
+# Rows fetched per database round trip by ?stream=1 list responses (core/streaming.py)
+STREAM_CHUNK_SIZE = int(os.getenv("STREAM_CHUNK_SIZE", "500"))
+
+# Rows written per bulk insert by CSV imports (core/importing.py)
+IMPORT_BATCH_SIZE = int(os.getenv("IMPORT_BATCH_SIZE", "500"))
+
+# Age filters (core/ages.py): the season's age cut-off (MM-DD) and the years an age band (U10, U12…) spans
+SEASON_AGE_CUTOFF = os.getenv("SEASON_AGE_CUTOFF", "01-01")
+AGE_BAND_YEARS = int(os.getenv("AGE_BAND_YEARS", "2"))
+
+# Weeks ahead of today up to which training sessions are stored and calendar windows may reach (core/schedule.py)
+SCHEDULE_HORIZON_WEEKS = int(os.getenv("SCHEDULE_HORIZON_WEEKS", "12"))
+
+# Rows moved (or players rolled up) per transaction by manage.py archive_season (core/seasons.py)
+ARCHIVE_BATCH_SIZE = int(os.getenv("ARCHIVE_BATCH_SIZE", "1000"))
+
+# Run core.warmup.warm_up() when a WSGI worker loads the application (see academy/wsgi.py)
+WARMUP_ON_STARTUP = os.getenv("DJANGO_WARMUP", "false").lower() == "true"
+
+# Per-request performance instrumentation (core.middleware.PerformanceMiddleware)
+PERF_INSTRUMENTATION = os.getenv("PERF_INSTRUMENTATION", "true").lower() == "true"
+# Send the breakdown in a Server-Timing header to every client; otherwise only staff users get it
+PERF_SERVER_TIMING = os.getenv("PERF_SERVER_TIMING", str(DEBUG)).lower() == "true"
+# Requests at or above this many milliseconds are logged with their slowest SQL
+PERF_SLOW_REQUEST_MS = int(os.getenv("PERF_SLOW_REQUEST_MS", "500"))
+PERF_SLOW_TOP_QUERIES = int(os.getenv("PERF_SLOW_TOP_QUERIES", "5"))
+
+# Prometheus metrics at /metrics (core.metrics); set PROMETHEUS_MULTIPROC_DIR to aggregate across workers
+METRICS_ENABLED = os.getenv("METRICS_ENABLED", "false").lower() == "true"
+# Bearer token scrapers must send; when set, it replaces the address check (use it behind a reverse proxy)
+METRICS_TOKEN = os.getenv("METRICS_TOKEN", "")
+# Without a token, client addresses allowed to scrape /metrics ("*" allows everyone)
+METRICS_ALLOWED_IPS = [ip.strip() for ip in os.getenv("METRICS_ALLOWED_IPS", "127.0.0.1,::1").split(",") if ip.strip()]
+
+LOGGING = {
+    "version": 1,
+    "disable_existing_loggers": False,
+    "handlers": {
+        "console": {"class": "logging.StreamHandler"},
+    },
+    "loggers": {
+        # INFO logs one JSON line per request; WARNING only logs slow requests
+        "core.perf": {"handlers": ["console"], "level": os.getenv("PERF_LOG_LEVEL", "WARNING"), "propagate": False},
+    },
+}
+
 # CORS for frontend dev
 if DEBUG:
     CORS_ALLOW_ALL_ORIGINS = True
@@ -3,4 +3,12 @@ from django.core.wsgi import get_wsgi_application
 
 os.environ.setdefault("DJANGO_SETTINGS_MODULE", "academy.settings")
 
-application = get_wsgi_application()
\ No newline at end of file
+application = get_wsgi_application()
+
+from django.conf import settings  # noqa: E402
+
+if settings.WARMUP_ON_STARTUP:
+    # Load the URL resolver and report stack before this worker accepts requests
+    from core.warmup import warm_up
+
+    warm_up()
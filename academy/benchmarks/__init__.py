@@ -0,0 +1 @@
+# Benchmark suite (pytest-benchmark); run explicitly, e.g. `pytest benchmarks/bench_pdf.py`
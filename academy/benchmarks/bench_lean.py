@@ -0,0 +1,59 @@
+import pytest
+
+pytest.importorskip("pytest_benchmark")
+
+from rest_framework.test import APIRequestFactory  # noqa: E402
+
+from core.benchmarks import synthetic_group  # noqa: E402
+from core.lean import GroupRows, PlayerRows  # noqa: E402
+from core.models import Group, Player  # noqa: E402
+from core.serializers import GroupSerializer, PlayerSerializer  # noqa: E402
+
+
+SIZES = [1000, 10000]
+
+
+@pytest.fixture(scope="module")
+def groups(django_test_db):
+    return {size: synthetic_group(size, label="lean") for size in SIZES}
+
+
+@pytest.fixture(scope="module")
+def request_():
+    return APIRequestFactory().get("/api/players/")
+
+
+def serializer_players(group, request):
+    queryset = Player.objects.filter(group=group).select_related("group__coach__user", "evaluation")
+    return PlayerSerializer(queryset, many=True, context={"request": request}).data
+
+
+def lean_players(group, request):
+    return PlayerRows(request=request).fetch(Player.objects.filter(group=group))
+
+
+def serializer_group(group, request):
+    queryset = Group.objects.filter(pk=group.pk).select_related("coach__user").prefetch_related("players")
+    return GroupSerializer(queryset, many=True, context={"request": request}).data
+
+
+def lean_group(group, request):
+    return GroupRows(request=request).fetch(Group.objects.filter(pk=group.pk))
+
+
+@pytest.mark.parametrize("path", ["serializer", "lean"])
+@pytest.mark.parametrize("size", SIZES)
+def test_player_list(benchmark, groups, request_, size, path):
+    fn = serializer_players if path == "serializer" else lean_players
+    benchmark.group = f"player_list[{size}]"
+    rows = benchmark.pedantic(fn, args=(groups[size], request_), rounds=3, warmup_rounds=1)
+    assert len(rows) == size
+
+
+@pytest.mark.parametrize("path", ["serializer", "lean"])
+@pytest.mark.parametrize("size", SIZES)
+def test_group_detail(benchmark, groups, request_, size, path):
+    fn = serializer_group if path == "serializer" else lean_group
+    benchmark.group = f"group_detail[{size}]"
+    rows = benchmark.pedantic(fn, args=(groups[size], request_), rounds=3, warmup_rounds=1)
+    assert len(rows[0]["players"]) == size
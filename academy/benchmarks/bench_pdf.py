@@ -0,0 +1,43 @@
+import pytest
+
+pytest.importorskip("pytest_benchmark")
+
+from core.benchmarks import arabic_shaping, synthetic_group  # noqa: E402
+from core.pdf import build_group_report, build_player_report  # noqa: E402
+
+
+SIZES = [10, 100, 500]
+
+
+@pytest.fixture(scope="module")
+def groups(media_root):
+    """One plain and one photo-heavy synthetic group per size, shared by the module."""
+    return {
+        (size, photos): synthetic_group(size, media_root=media_root, photo_size=(1600, 1200) if photos else None)
+        for size in SIZES
+        for photos in (False, True)
+    }
+
+
+@pytest.mark.parametrize("arabic", [False, True], ids=["latin", "arabic"])
+@pytest.mark.parametrize("photos", [False, True], ids=["no-photos", "photos"])
+@pytest.mark.parametrize("size", SIZES)
+def test_group_report(benchmark, groups, size, photos, arabic):
+    group = groups[(size, photos)]
+    benchmark.group = f"group_report[{size}]"
+    with arabic_shaping(arabic):
+        pdf = benchmark(build_group_report, group)
+    benchmark.extra_info["output_bytes"] = len(pdf)
+    assert pdf[:4] == b"%PDF"
+
+
+@pytest.mark.parametrize("arabic", [False, True], ids=["latin", "arabic"])
+@pytest.mark.parametrize("photos", [False, True], ids=["no-photos", "photos"])
+def test_player_report(benchmark, groups, photos, arabic):
+    group = groups[(SIZES[0], photos)]
+    player = group.players.select_related("group__coach__user", "evaluation__coach__user").first()
+    benchmark.group = "player_report"
+    with arabic_shaping(arabic):
+        pdf = benchmark(build_player_report, player)
+    benchmark.extra_info["output_bytes"] = len(pdf)
+    assert pdf[:4] == b"%PDF"
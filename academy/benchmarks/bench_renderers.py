@@ -0,0 +1,52 @@
+import gzip
+import io
+
+import pytest
+
+pytest.importorskip("pytest_benchmark")
+
+from rest_framework.parsers import JSONParser  # noqa: E402
+from rest_framework.renderers import JSONRenderer  # noqa: E402
+from rest_framework.test import APIRequestFactory  # noqa: E402
+
+from core.benchmarks import synthetic_group  # noqa: E402
+from core.models import Group  # noqa: E402
+from core.renderers import MessagePackParser, MessagePackRenderer, ORJSONParser, ORJSONRenderer  # noqa: E402
+from core.serializers import GroupSerializer  # noqa: E402
+
+
+PLAYERS = 1000
+
+RENDERERS = {
+    "drf-json": (JSONRenderer, JSONParser),
+    "orjson": (ORJSONRenderer, ORJSONParser),
+    "msgpack": (MessagePackRenderer, MessagePackParser),
+}
+
+
+@pytest.fixture(scope="module")
+def listing(django_test_db):
+    """Serialized group listing (as returned by GET /api/groups/) for one 1,000-player group."""
+    group = synthetic_group(PLAYERS, label="renderers")
+    request = APIRequestFactory().get("/api/groups/")
+    queryset = Group.objects.filter(pk=group.pk).select_related("coach__user").prefetch_related("players")
+    return GroupSerializer(queryset, many=True, context={"request": request}).data
+
+
+@pytest.mark.parametrize("name", list(RENDERERS))
+def test_encode_group_listing(benchmark, listing, name):
+    renderer = RENDERERS[name][0]()
+    benchmark.group = f"encode[{PLAYERS}]"
+    body = benchmark(renderer.render, listing)
+    benchmark.extra_info["output_bytes"] = len(body)
+    benchmark.extra_info["gzip_bytes"] = len(gzip.compress(body, 6))
+
+
+@pytest.mark.parametrize("name", list(RENDERERS))
+def test_decode_group_listing(benchmark, listing, name):
+    renderer_class, parser_class = RENDERERS[name]
+    body = renderer_class().render(listing)
+    parser = parser_class()
+    benchmark.group = f"decode[{PLAYERS}]"
+    parsed = benchmark(lambda: parser.parse(io.BytesIO(body), parser_class.media_type, {}))
+    assert len(parsed) == 1
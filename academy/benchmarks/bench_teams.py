@@ -0,0 +1,31 @@
+import random
+
+import pytest
+
+pytest.importorskip("pytest_benchmark")
+
+from core.models import RATING_FIELDS  # noqa: E402
+from core.teams import balanced_teams  # noqa: E402
+
+
+SIZES = [20, 40, 100, 200]
+
+
+def pool(size):
+    """Random ratings for ``size`` players, about one in ten left unrated."""
+    rng = random.Random(size)
+    return [
+        {"id": i, "name": f"Player {i}", **{f: rng.randint(1, 5) if rng.random() > 0.1 else None for f in RATING_FIELDS}}
+        for i in range(size)
+    ]
+
+
+@pytest.mark.parametrize("k", [2, 4])
+@pytest.mark.parametrize("size", SIZES)
+def test_balanced_teams(benchmark, size, k):
+    rows = pool(size)
+    benchmark.group = f"balanced_teams[{size}]"
+    result = benchmark.pedantic(balanced_teams, args=(rows, k), kwargs={"seed": 1}, rounds=5, warmup_rounds=1)
+    benchmark.extra_info.update(strength_spread=result["strength_spread"], average_spread=result["average_spread"])
+    assert sum(len(team["players"]) for team in result["teams"]) == size
+    assert result == balanced_teams(rows, k, seed=1)
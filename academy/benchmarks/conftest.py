@@ -0,0 +1,35 @@
+import os
+import shutil
+import tempfile
+
+import django
+import pytest
+
+os.environ.setdefault("DJANGO_SETTINGS_MODULE", "academy.settings")
+django.setup()
+
+
+@pytest.fixture(scope="session")
+def django_test_db():
+    """Create Django's throw-away test database once for the whole benchmark session."""
+    from django.test.runner import DiscoverRunner
+    from django.test.utils import setup_test_environment, teardown_test_environment
+
+    runner = DiscoverRunner(verbosity=0, interactive=False)
+    setup_test_environment()
+    old_config = runner.setup_databases()
+    try:
+        yield
+    finally:
+        runner.teardown_databases(old_config)
+        teardown_test_environment()
+
+
+@pytest.fixture(scope="session")
+def media_root(django_test_db):
+    from django.test import override_settings
+
+    path = tempfile.mkdtemp(prefix="academy-bench-media-")
+    with override_settings(MEDIA_ROOT=path):
+        yield path
+    shutil.rmtree(path, ignore_errors=True)
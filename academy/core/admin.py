@@ -1,24 +1,69 @@
 from django.contrib import admin
 
-from .models import Coach, Group, Player, PlayerEvaluation, PlayerAttendance
+from .history import record_snapshots
+from .search import matching
+from .models import (
+    Academy,
+    AttendanceArchive,
+    Coach,
+    EvaluationRollup,
+    EvaluationSnapshot,
+    Group,
+    Player,
+    PlayerAttendance,
+    PlayerEvaluation,
+    Season,
+    TrainingSchedule,
+    TrainingSession,
+    TrainingSessionArchive,
+)
+
+
+class IndexedSearchMixin:
+    """Searches by name through the search index (word prefixes) rather than ``icontains`` over joins."""
+
+    search_kind = None
+
+    def get_search_results(self, request, queryset, search_term):
+        if not search_term.strip():
+            return queryset, False
+        entries = matching(search_term).filter(kind=self.search_kind)
+        return queryset.filter(pk__in=entries.values("object_id")), False
+
+
+@admin.register(Academy)
+class AcademyAdmin(admin.ModelAdmin):
+    list_display = ("id", "name", "slug", "domain", "is_default")
+    search_fields = ("name", "slug", "domain")
 
 
 @admin.register(Coach)
-class CoachAdmin(admin.ModelAdmin):
-    list_display = ("id", "user", "bio")
+class CoachAdmin(IndexedSearchMixin, admin.ModelAdmin):
+    search_kind = "coach"
+    list_display = ("id", "user", "academy", "bio")
+    list_filter = ("academy",)
     search_fields = ("user__username", "user__first_name", "user__last_name")
 
 
+@admin.register(Season)
+class SeasonAdmin(admin.ModelAdmin):
+    # New seasons are started with manage.py start_season, which carries groups over
+    list_display = ("id", "name", "starts_on", "ends_on", "is_active", "archived_at")
+
+
 @admin.register(Group)
-class GroupAdmin(admin.ModelAdmin):
-    list_display = ("id", "name", "coach")
+class GroupAdmin(IndexedSearchMixin, admin.ModelAdmin):
+    search_kind = "group"
+    list_display = ("id", "name", "coach", "academy", "season")
+    list_filter = ("academy", "season")
     search_fields = ("name",)
 
 
 @admin.register(Player)
-class PlayerAdmin(admin.ModelAdmin):
+class PlayerAdmin(IndexedSearchMixin, admin.ModelAdmin):
+    search_kind = "player"
     list_display = ("id", "name", "group", "phone", "age", "attendance_days")
-    list_filter = ("group",)
+    list_filter = ("academy", "season", "group")
     search_fields = ("name",)
 
 
@@ -32,12 +77,70 @@ class PlayerEvaluationAdmin(admin.ModelAdmin):
         "attendance_and_punctuality",
         "updated_at",
     )
-    list_filter = ("coach",)
+    list_filter = ("academy", "coach")
     search_fields = ("player__name", "coach__user__username")
 
+    def save_model(self, request, obj, form, change):
+        super().save_model(request, obj, form, change)
+        record_snapshots([obj], "save")
+
+
+@admin.register(EvaluationSnapshot)
+class EvaluationSnapshotAdmin(admin.ModelAdmin):
+    list_display = ("id", "player", "group", "reason", "average_rating", "created_at")
+    list_filter = ("reason", "group")
+    search_fields = ("player__name",)
+
+    # Snapshots are append-only
+    def has_add_permission(self, request):
+        return False
+
+    def has_change_permission(self, request, obj=None):
+        return False
+
 
 @admin.register(PlayerAttendance)
 class PlayerAttendanceAdmin(admin.ModelAdmin):
     list_display = ("id", "player", "month", "days", "updated_at")
-    list_filter = ("month", "player__group")
-    search_fields = ("player__name",)
\ No newline at end of file
+    list_filter = ("academy", "month", "player__group")
+    search_fields = ("player__name",)
+
+
+@admin.register(TrainingSchedule)
+class TrainingScheduleAdmin(admin.ModelAdmin):
+    list_display = ("id", "group", "weekday", "start_time", "starts_on", "ends_on")
+    list_filter = ("group", "weekday")
+
+
+@admin.register(TrainingSession)
+class TrainingSessionAdmin(admin.ModelAdmin):
+    list_display = ("id", "group", "date", "start_time", "location", "cancelled")
+    list_filter = ("group", "cancelled")
+    date_hierarchy = "date"
+
+
+class ArchiveAdmin(admin.ModelAdmin):
+    """Archived rows are written by manage.py archive_season only."""
+
+    list_filter = ("season",)
+
+    def has_add_permission(self, request):
+        return False
+
+    def has_change_permission(self, request, obj=None):
+        return False
+
+
+@admin.register(AttendanceArchive)
+class AttendanceArchiveAdmin(ArchiveAdmin):
+    list_display = ("id", "season", "player_id", "month", "days")
+
+
+@admin.register(TrainingSessionArchive)
+class TrainingSessionArchiveAdmin(ArchiveAdmin):
+    list_display = ("id", "season", "group_id", "date", "start_time", "cancelled")
+
+
+@admin.register(EvaluationRollup)
+class EvaluationRollupAdmin(ArchiveAdmin):
+    list_display = ("id", "season", "player_id", "snapshots", "average_rating", "final_average_rating")
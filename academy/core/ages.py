@@ -0,0 +1,89 @@
+"""Ages and age bands computed from ``birth_date``.
+
+``Player.age`` is only recomputed on ``save()``, so it goes stale on every
+birthday. Age filters therefore become ``birth_date`` range predicates for a
+reference date (today or the season cut-off), which use the ``birth_date``
+index; players without a birth date keep their entered ``age``.
+``refresh_ages`` rewrites the stale stored ages in one ``UPDATE``.
+"""
+import re
+from datetime import date
+
+from django.conf import settings
+from django.db.models import Case, IntegerField, Q, Value, When
+from django.db.models.functions import ExtractYear
+from django.utils import timezone
+
+
+BAND_PATTERN = re.compile(r"^U(\d{1,2})$", re.IGNORECASE)
+# Accepted range of age filter values
+MAX_AGE = 100
+
+
+def years_before(day: date, years: int) -> date:
+    """The same month and day ``years`` earlier (28 February for a 29 February that does not exist)."""
+    try:
+        return day.replace(year=day.year - years)
+    except ValueError:
+        return day.replace(year=day.year - years, day=28)
+
+
+def season_cutoff(today=None) -> date:
+    """Latest ``SEASON_AGE_CUTOFF`` (``MM-DD``, default ``01-01``) on or before ``today``."""
+    today = today or timezone.localdate()
+    month, day = (int(part) for part in getattr(settings, "SEASON_AGE_CUTOFF", "01-01").split("-"))
+    cutoff = date(today.year, month, day)
+    return cutoff if cutoff <= today else cutoff.replace(year=today.year - 1)
+
+
+def parse_reference_date(value) -> date:
+    """``age_on`` parameter: empty for today, ``season`` or ``YYYY-MM-DD``; raises ``ValueError``."""
+    if not value:
+        return timezone.localdate()
+    if value == "season":
+        return season_cutoff()
+    try:
+        return date.fromisoformat(value)
+    except ValueError:
+        raise ValueError("Invalid age_on; expected YYYY-MM-DD or season")
+
+
+def parse_band(value) -> tuple[int, int]:
+    """``U12`` → the ages of that band: the ``AGE_BAND_YEARS`` (default 2) years below 12, i.e. 10–11."""
+    match = BAND_PATTERN.match(value.strip())
+    if not match:
+        raise ValueError("Invalid band; expected U<age>, e.g. U12")
+    limit = int(match.group(1))
+    return max(limit - getattr(settings, "AGE_BAND_YEARS", 2), 0), limit - 1
+
+
+def age_q(min_age=None, max_age=None, on=None) -> Q:
+    """Players aged ``min_age``..``max_age`` (inclusive, either open) on ``on`` (default today).
+
+    A player is at least ``n`` when born on or before ``on`` minus ``n`` years
+    and at most ``n`` when born after ``on`` minus ``n + 1`` years.
+    """
+    on = on or timezone.localdate()
+    born, entered = Q(), Q()
+    if min_age is not None:
+        born &= Q(birth_date__lte=years_before(on, min_age))
+        entered &= Q(age__gte=min_age)
+    if max_age is not None:
+        born &= Q(birth_date__gt=years_before(on, max_age + 1))
+        entered &= Q(age__lte=max_age)
+    return Q(born, birth_date__isnull=False) | Q(entered, birth_date__isnull=True)
+
+
+def age_expression(on=None):
+    """SQL for the age on ``on`` (default today) of a row's ``birth_date``; mirrors ``models.age_on``."""
+    on = on or timezone.localdate()
+    before_birthday = Q(birth_date__month__gt=on.month) | Q(birth_date__month=on.month, birth_date__day__gt=on.day)
+    return Value(on.year) - ExtractYear("birth_date") - Case(
+        When(before_birthday, then=Value(1)), default=Value(0), output_field=IntegerField()
+    )
+
+
+def refresh_ages(queryset, on=None) -> int:
+    """Rewrite the stale ``age`` of every player in ``queryset`` that has a birth date, in one ``UPDATE``."""
+    current = age_expression(on)
+    return queryset.filter(birth_date__isnull=False).exclude(age=current).update(age=current)
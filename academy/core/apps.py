@@ -3,4 +3,10 @@ from django.apps import AppConfig
 
 class CoreConfig(AppConfig):
     default_auto_field = "django.db.models.BigAutoField"
-    name = "core"
\ No newline at end of file
+    name = "core"
+
+    def ready(self):
+        # Connects the signals that keep the search entries up to date
+        from . import search  # noqa: F401
+        # Connects the opt-in SQLite tuning applied to new connections
+        from . import sqlite  # noqa: F401
@@ -0,0 +1,170 @@
+"""Per-day attendance stored as one 31-bit bitmap per player and month.
+
+Bit ``n - 1`` of ``PlayerAttendance.day_mask`` is set when the player attended
+on day ``n``; ``days`` is kept equal to the popcount of the mask so every
+existing monthly-count reader keeps working. Rows written before day-level
+tracking (or through the monthly ``days`` endpoint) have ``day_mask = 0`` and
+only a count.
+
+Statistics walk the bitmaps month by month: one query for a group's rows (and
+one for its scheduled sessions), then bit operations, never one row per session.
+"""
+import calendar
+
+from django.db import transaction
+from django.db.models import Subquery
+from django.utils import timezone
+
+from .models import Player, PlayerAttendance
+
+
+def days_in_month(month) -> int:
+    return calendar.monthrange(month.year, month.month)[1]
+
+
+def mask_from_days(days) -> int:
+    mask = 0
+    for day in days:
+        mask |= 1 << (day - 1)
+    return mask
+
+
+def days_from_mask(mask) -> list[int]:
+    return [bit + 1 for bit in range(31) if mask >> bit & 1]
+
+
+def validate_days(days, month) -> list[int]:
+    """Day numbers as ints within ``month``; raises ``ValueError`` otherwise."""
+    last = days_in_month(month)
+    out = []
+    for day in days:
+        if isinstance(day, bool) or not isinstance(day, (int, str)):
+            raise ValueError(f"Invalid day: {day!r}")
+        try:
+            day = int(day)
+        except ValueError:
+            raise ValueError(f"Invalid day: {day!r}")
+        if not 1 <= day <= last:
+            raise ValueError(f"Day {day} is outside {month:%Y-%m} (1-{last})")
+        out.append(day)
+    return out
+
+
+def update_days(player_ids, month, mark=(), unmark=()) -> dict:
+    """Set the ``mark`` days and clear the ``unmark`` days for every player in one month.
+
+    Three queries however many players: create missing rows, lock and read
+    the masks, write them back with their popcounts. Returns ``{player_id: mask}``.
+    New rows take the player's academy from an inline subquery.
+    """
+    set_bits, clear_bits = mask_from_days(mark), mask_from_days(unmark)
+    player_ids = list(player_ids)
+    now = timezone.now()
+    players = Player.objects.values("academy_id")
+    with transaction.atomic():
+        PlayerAttendance.objects.bulk_create(
+            [
+                PlayerAttendance(player_id=pid, month=month, updated_at=now, academy_id=Subquery(players.filter(pk=pid)))
+                for pid in player_ids
+            ],
+            ignore_conflicts=True,
+        )
+        records = list(
+            PlayerAttendance.objects.select_for_update()
+            .filter(player_id__in=player_ids, month=month)
+            .only("id", "player_id", "day_mask", "days")
+        )
+        for record in records:
+            # A count-only month (mask 0) switches to day tracking; its count is replaced
+            record.day_mask = (record.day_mask | set_bits) & ~clear_bits
+            record.days = record.day_mask.bit_count()
+            record.updated_at = now
+        PlayerAttendance.objects.bulk_update(records, ["day_mask", "days", "updated_at"])
+    return {record.player_id: record.day_mask for record in records}
+
+
+class _Runs:
+    """Current and longest run of consecutive attended / missed sessions."""
+
+    def __init__(self):
+        self.streak = self.longest_streak = 0
+        self.absence = self.longest_absence = 0
+
+    def attended(self):
+        self.streak += 1
+        self.absence = 0
+        self.longest_streak = max(self.longest_streak, self.streak)
+
+    def missed(self):
+        self.absence += 1
+        self.streak = 0
+        self.longest_absence = max(self.longest_absence, self.absence)
+
+
+def attendance_stats(player_ids, records, session_masks=None) -> dict:
+    """Attendance rate, streaks and absence runs per player.
+
+    ``records`` are ``(player_id, month, day_mask)`` rows. A session is a day in
+    ``session_masks`` (``{month: mask}``); by default, any day on which at least
+    one of the players attended. Count-only months (mask 0) are skipped.
+    """
+    masks = {}
+    union = {}
+    for player_id, month, mask in records:
+        if mask:
+            masks[player_id, month] = mask
+            union[month] = union.get(month, 0) | mask
+    sessions = session_masks if session_masks is not None else union
+
+    stats = {}
+    for player_id in player_ids:
+        runs = _Runs()
+        attended = total = 0
+        for month in sorted(sessions):
+            session_mask = sessions[month]
+            mask = masks.get((player_id, month), 0)
+            total += session_mask.bit_count()
+            attended += (mask & session_mask).bit_count()
+            while session_mask:
+                low = session_mask & -session_mask
+                if mask & low:
+                    runs.attended()
+                else:
+                    runs.missed()
+                session_mask ^= low
+        stats[player_id] = {
+            "player": player_id,
+            "sessions": total,
+            "attended": attended,
+            "missed": total - attended,
+            "rate": round(attended / total, 4) if total else None,
+            "current_streak": runs.streak,
+            "longest_streak": runs.longest_streak,
+            "current_absence": runs.absence,
+            "longest_absence": runs.longest_absence,
+        }
+    return stats
+
+
+def group_attendance_stats(group, since=None, until=None) -> list[dict]:
+    """``attendance_stats`` for every player in the group (ordered by id).
+
+    Sessions are the group's scheduled sessions (core/schedule.py) when it has
+    any in the range, otherwise the days on which someone attended. Sessions
+    after today are not counted yet.
+    """
+    from .schedule import ensure_sessions, session_masks
+
+    last_day = timezone.localdate()
+    if until:
+        last_day = min(last_day, until.replace(day=days_in_month(until)))
+    ensure_sessions([group.id], last_day)
+    player_ids = list(Player.objects.filter(group=group).order_by("id").values_list("id", flat=True))
+    records = PlayerAttendance.objects.filter(player__group=group).exclude(day_mask=0)
+    if since:
+        records = records.filter(month__gte=since)
+    if until:
+        records = records.filter(month__lte=until)
+    scheduled = session_masks(group, since, last_day) or None
+    stats = attendance_stats(player_ids, records.order_by().values_list("player_id", "month", "day_mask"), scheduled)
+    return [stats[player_id] for player_id in player_ids]
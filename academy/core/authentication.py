@@ -0,0 +1,11 @@
+from rest_framework_simplejwt.authentication import JWTAuthentication as BaseJWTAuthentication
+
+from .perf import timer
+
+
+class JWTAuthentication(BaseJWTAuthentication):
+    """SimpleJWT authentication that reports its time as the request's "auth" phase."""
+
+    def authenticate(self, request):
+        with timer("auth"):
+            return super().authenticate(request)
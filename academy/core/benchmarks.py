@@ -0,0 +1,152 @@
+"""Helpers shared by the benchmark management commands and the pytest-benchmark suite."""
+import json
+import math
+import platform
+import shutil
+import statistics
+import time
+import tracemalloc
+from contextlib import contextmanager
+from datetime import datetime, timezone
+from pathlib import Path
+from unittest import mock
+
+from django.contrib.auth.models import User
+
+from .models import RATING_FIELDS, Coach, Group, Player, PlayerEvaluation
+
+
+def make_photo(path: Path, width: int, height: int, seed: int = 0):
+    """Write a synthetic JPEG roughly as expensive to decode as a phone photo."""
+    from PIL import Image as PILImage
+
+    img = PILImage.new("RGB", (width, height), ((seed * 37) % 256, (seed * 91) % 256, (seed * 53) % 256))
+    # A gradient band keeps the JPEG from compressing to almost nothing
+    band = PILImage.linear_gradient("L").resize((width, height // 4)).convert("RGB")
+    img.paste(band, (0, height // 3))
+    img.save(path, "JPEG", quality=90)
+
+
+def synthetic_group(size: int, media_root=None, photo_size=None, label: str = "bench") -> Group:
+    """Create a coach and a group of ``size`` evaluated players.
+
+    With ``photo_size`` (``(w, h)``) every player gets its own copy of a synthetic
+    photo under ``media_root``, so no two players share decoded images.
+    """
+    user = User.objects.create(username=f"{label}-coach-{size}-{time.monotonic_ns()}", first_name="Bench", last_name="Coach")
+    coach = Coach.objects.create(user=user)
+    group = Group.objects.create(name=f"{label} {size} {user.pk}", coach=coach)
+
+    template = None
+    if photo_size:
+        photo_dir = Path(media_root) / "player_photos"
+        photo_dir.mkdir(parents=True, exist_ok=True)
+        template = photo_dir / f"{label}_template_{group.pk}.jpg"
+        make_photo(template, *photo_size, seed=size)
+
+    players = []
+    for i in range(size):
+        photo = ""
+        if template is not None:
+            photo = f"player_photos/{label}_{group.pk}_{i}.jpg"
+            shutil.copyfile(template, Path(media_root) / photo)
+        players.append(Player(group=group, season_id=group.season_id, academy_id=group.academy_id, name=f"Player {i}", age=10 + i % 8, phone=f"555-{i:04d}", photo=photo))
+    players = Player.objects.bulk_create(players, batch_size=500)
+    PlayerEvaluation.objects.bulk_create(
+        [
+            PlayerEvaluation(
+                player=p,
+                coach=coach,
+                academy_id=p.academy_id,
+                notes="Synthetic evaluation.",
+                **{f: 1 + (p.pk + j) % 5 for j, f in enumerate(RATING_FIELDS)},
+            )
+            for p in players
+        ],
+        batch_size=500,
+    )
+    return Group.objects.select_related("coach__user").get(pk=group.pk)
+
+
+@contextmanager
+def arabic_shaping(enabled: bool):
+    """Run with Arabic shaping on (the default when installed) or replaced by a no-op."""
+    if enabled:
+        yield
+        return
+    with mock.patch("core.pdf._shape_arabic", side_effect=lambda text: text):
+        yield
+
+
+def measure(fn, repeat: int = 3) -> dict:
+    """Time ``fn`` (median of ``repeat`` untraced runs), then trace one run for peak memory.
+
+    ``fn`` returns the size of what it produced in bytes.
+    """
+    timings = []
+    output_bytes = 0
+    for _ in range(max(1, repeat)):
+        started = time.perf_counter()
+        output_bytes = fn()
+        timings.append(time.perf_counter() - started)
+    # Traced separately: tracemalloc itself slows rendering down several times
+    tracemalloc.start()
+    try:
+        fn()
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    return {
+        "seconds": round(statistics.median(timings), 5),
+        "min_seconds": round(min(timings), 5),
+        "peak_memory_bytes": peak,
+        "output_bytes": output_bytes,
+    }
+
+
+def percentile(values, pct: float) -> float:
+    """Nearest-rank percentile of a non-empty sequence."""
+    ordered = sorted(values)
+    index = max(0, min(len(ordered) - 1, math.ceil(pct / 100 * len(ordered)) - 1))
+    return ordered[index]
+
+
+def result_key(result: dict) -> tuple:
+    """Results are ``{"name": ..., "params": {...}, <metrics>}``; name and params identify a case."""
+    return (result["name"], tuple(sorted(result.get("params", {}).items())))
+
+
+def write_results(path, results: list[dict], **meta) -> None:
+    import django
+    import reportlab
+
+    payload = {
+        "meta": {
+            "created_at": datetime.now(timezone.utc).isoformat(),
+            "python": platform.python_version(),
+            "django": django.get_version(),
+            "reportlab": reportlab.Version,
+            "machine": platform.machine(),
+            **meta,
+        },
+        "results": results,
+    }
+    Path(path).write_text(json.dumps(payload, indent=2))
+
+
+def compare_results(previous_path, results: list[dict], metrics=("seconds", "peak_memory_bytes", "output_bytes")) -> list[str]:
+    """Describe how ``results`` moved relative to a previously written results file."""
+    previous = {result_key(r): r for r in json.loads(Path(previous_path).read_text())["results"]}
+    lines = []
+    for result in results:
+        old = previous.get(result_key(result))
+        if old is None:
+            continue
+        parts = []
+        for metric in metrics:
+            if metric in result and old.get(metric):
+                parts.append(f"{metric} {result[metric] / old[metric]:.2f}x")
+        name, params = result_key(result)
+        label = name + "".join(f" {k}={v}" for k, v in params)
+        lines.append(f"{label}: " + ", ".join(parts))
+    return lines
@@ -0,0 +1,166 @@
+"""Flat CSV / NDJSON export of players, evaluations and monthly attendance.
+
+Rows come from two chunked iterators merged on player id: players joined with
+their group, coach and evaluation, and attendance records ordered by player.
+An export is therefore three queries (months, players, attendance) and holds
+only one chunk of each in memory, however many players there are.
+"""
+import csv
+import io
+import re
+from datetime import date
+
+import orjson
+from django.conf import settings
+
+from .lean import average_rating
+from .models import RATING_FIELDS, PlayerAttendance
+from .streaming import STREAM_FLUSH_BYTES
+
+
+PLAYER_FIELDS = {
+    "player_id": "id",
+    "name": "name",
+    "group_id": "group_id",
+    "group": "group__name",
+    "birth_date": "birth_date",
+    "age": "age",
+    "phone": "phone",
+    "attendance_days": "attendance_days",
+}
+COACH_FIELDS = ["group__coach__user__username", "group__coach__user__first_name", "group__coach__user__last_name"]
+EVALUATION_FIELDS = {
+    **{field: f"evaluation__{field}" for field in RATING_FIELDS},
+    "notes": "evaluation__notes",
+    "evaluation_updated_at": "evaluation__updated_at",
+}
+
+# Text cells a spreadsheet could read as a formula get a leading apostrophe
+_FORMULA_PREFIXES = ("=", "+", "-", "@", "\t", "\r")
+# ... except plain signed numbers such as phone numbers ("+20 100 123 4567")
+_SIGNED_NUMBER = re.compile(r"[+-][\d ().]*")
+
+
+def parse_month(value: str) -> date:
+    """``YYYY-MM`` -> first day of that month; raises ``ValueError`` when malformed."""
+    year, month = [int(x) for x in value.split("-")]
+    return date(year, month, 1)
+
+
+def export_columns(months) -> list[str]:
+    return [
+        *PLAYER_FIELDS,
+        "coach",
+        *RATING_FIELDS,
+        "average_rating",
+        "notes",
+        "evaluation_updated_at",
+        *(f"attendance_{month:%Y-%m}" for month in months),
+    ]
+
+
+def export_months(players, since=None, until=None) -> list:
+    """Months (first days) with attendance for these players, oldest first."""
+    records = PlayerAttendance.objects.filter(player__in=players.values("id"))
+    if since:
+        records = records.filter(month__gte=since)
+    if until:
+        records = records.filter(month__lte=until)
+    return list(records.dates("month", "month"))
+
+
+def _coach_name(row):
+    full_name = f"{row['group__coach__user__first_name']} {row['group__coach__user__last_name']}".strip()
+    return full_name or row["group__coach__user__username"] or ""
+
+
+def iter_export_rows(players, months, chunk_size=None):
+    """Yield one flat dict per player (ordered by id) with the ``export_columns(months)`` keys."""
+    chunk_size = chunk_size or getattr(settings, "STREAM_CHUNK_SIZE", 500)
+    columns = list(PLAYER_FIELDS.values()) + COACH_FIELDS + ["evaluation__id"] + list(EVALUATION_FIELDS.values())
+    player_rows = (
+        players.select_related(None).prefetch_related(None).order_by("id").values(*columns).iterator(chunk_size=chunk_size)
+    )
+    attendance = iter(())
+    if months:
+        attendance = (
+            PlayerAttendance.objects.filter(player__in=players.values("id"), month__gte=months[0], month__lte=months[-1])
+            .order_by("player_id")
+            .values_list("player_id", "month", "days")
+            .iterator(chunk_size=chunk_size)
+        )
+    month_columns = [(month, f"attendance_{month:%Y-%m}") for month in months]
+    pending = next(attendance, None)
+
+    for row in player_rows:
+        player_id = row["id"]
+        days = {}
+        # Both sides are ordered by player id, so this is a merge join
+        while pending is not None and pending[0] <= player_id:
+            if pending[0] == player_id:
+                days[pending[1]] = pending[2]
+            pending = next(attendance, None)
+
+        out = {key: row[column] for key, column in PLAYER_FIELDS.items()}
+        out["coach"] = _coach_name(row)
+        has_evaluation = row["evaluation__id"] is not None
+        for key, column in EVALUATION_FIELDS.items():
+            out[key] = row[column]
+        out["average_rating"] = average_rating(row, "evaluation__") if has_evaluation else None
+        for month, key in month_columns:
+            out[key] = days.get(month)
+        yield out
+
+
+def _csv_cell(value):
+    if value is None:
+        return ""
+    if isinstance(value, str) and value.startswith(_FORMULA_PREFIXES) and not _SIGNED_NUMBER.fullmatch(value):
+        return "'" + value
+    if hasattr(value, "isoformat"):
+        return value.isoformat()
+    return value
+
+
+def stream_csv(columns, rows, flush_bytes=STREAM_FLUSH_BYTES):
+    """Yield UTF-8 CSV (with a BOM, so spreadsheets detect the encoding) in chunks."""
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    writer.writerow(columns)
+    yield "\ufeff".encode() + buffer.getvalue().encode()
+    buffer.seek(0)
+    buffer.truncate()
+    for row in rows:
+        writer.writerow([_csv_cell(row[c]) for c in columns])
+        if buffer.tell() >= flush_bytes:
+            yield buffer.getvalue().encode()
+            buffer.seek(0)
+            buffer.truncate()
+    yield buffer.getvalue().encode()
+
+
+def stream_ndjson(rows, flush_bytes=STREAM_FLUSH_BYTES):
+    """Yield one JSON object per line, in chunks."""
+    buffer = bytearray()
+    for row in rows:
+        buffer += orjson.dumps(row, option=orjson.OPT_UTC_Z)
+        buffer += b"\n"
+        if len(buffer) >= flush_bytes:
+            yield bytes(buffer)
+            buffer.clear()
+    yield bytes(buffer)
+
+
+EXPORT_FORMATS = {
+    "csv": "text/csv; charset=utf-8",
+    "ndjson": "application/x-ndjson",
+}
+
+
+def stream_export(players, fmt, since=None, until=None, chunk_size=None):
+    """Encoded chunks of a ``csv`` or ``ndjson`` export of a ``Player`` queryset."""
+    months = export_months(players, since, until)
+    rows = iter_export_rows(players, months, chunk_size)
+    if fmt == "csv":
+        return stream_csv(export_columns(months), rows)
+    return stream_ndjson(rows)
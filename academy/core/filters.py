@@ -0,0 +1,49 @@
+import django_filters
+from rest_framework.exceptions import ValidationError
+
+from .ages import MAX_AGE, age_q, parse_band, parse_reference_date
+from .models import Player
+
+
+class PlayerFilter(django_filters.FilterSet):
+    """``group`` plus age filters that read ``birth_date`` rather than the stored ``age``.
+
+    ``age``, ``age_min``/``age_max`` and ``band`` (``U10``, ``U12``…) are ages
+    on ``age_on``: today by default, ``season`` for the season cut-off, or a date.
+    """
+
+    age = django_filters.NumberFilter(method="filter_age")
+    age_min = django_filters.NumberFilter(method="filter_age")
+    age_max = django_filters.NumberFilter(method="filter_age")
+    band = django_filters.CharFilter(method="filter_band")
+
+    class Meta:
+        model = Player
+        fields = ["group"]
+
+    def reference_date(self):
+        try:
+            return parse_reference_date(self.data.get("age_on"))
+        except ValueError as exc:
+            raise ValidationError({"age_on": str(exc)})
+
+    def filter_ages(self, queryset, bounds):
+        try:
+            return queryset.filter(age_q(*bounds, on=self.reference_date()))
+        except (ValueError, OverflowError):
+            # Birth dates before year 1
+            raise ValidationError({"age_on": "Too early for these ages"})
+
+    def filter_age(self, queryset, name, value):
+        value = int(value)
+        if not 0 <= value <= MAX_AGE:
+            raise ValidationError({name: f"Expected an age from 0 to {MAX_AGE}"})
+        bounds = {"age": (value, value), "age_min": (value, None), "age_max": (None, value)}[name]
+        return self.filter_ages(queryset, bounds)
+
+    def filter_band(self, queryset, name, value):
+        try:
+            bounds = parse_band(value)
+        except ValueError as exc:
+            raise ValidationError({"band": str(exc)})
+        return self.filter_ages(queryset, bounds)
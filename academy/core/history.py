@@ -0,0 +1,121 @@
+"""Evaluation history: append-only snapshots and the trend queries over them.
+
+Every evaluation save, reset or import appends ``EvaluationSnapshot`` rows in
+bulk. Reads are range scans on the ``(player, created_at)`` and
+``(group, created_at)`` indexes, so they cost the same however many
+snapshots other players and groups have.
+"""
+from datetime import date, datetime, time, timedelta
+
+from django.db.models import Avg, Count, F
+from django.db.models.functions import TruncDay, TruncMonth, TruncWeek
+from django.utils import timezone
+
+from .models import RATING_FIELDS, SKILL_RATING_FIELDS, EvaluationSnapshot
+
+
+SNAPSHOT_BATCH_SIZE = 2000
+TREND_INTERVALS = {"day": TruncDay, "week": TruncWeek, "month": TruncMonth}
+
+
+def _skill_average(row):
+    # Like PlayerEvaluation.average_rating, but None when nothing is rated so trends skip it
+    values = [row[f] for f in SKILL_RATING_FIELDS if row[f] is not None]
+    return round(sum(values) / len(values), 2) if values else None
+
+
+def _snapshot(row, reason, at):
+    return EvaluationSnapshot(
+        player_id=row["player_id"],
+        group_id=row["group_id"],
+        coach_id=row["coach_id"],
+        reason=reason,
+        created_at=at,
+        average_rating=_skill_average(row),
+        **{f: row[f] for f in RATING_FIELDS},
+    )
+
+
+def record_snapshots(evaluations, reason, at=None) -> int:
+    """Append a snapshot of each evaluation; ``evaluation.player`` must be loaded (for its group)."""
+    at = at or timezone.now()
+    snapshots = []
+    for evaluation in evaluations:
+        row = {f: getattr(evaluation, f) for f in RATING_FIELDS}
+        row.update(player_id=evaluation.player_id, group_id=evaluation.player.group_id, coach_id=evaluation.coach_id)
+        snapshots.append(_snapshot(row, reason, at))
+    EvaluationSnapshot.objects.bulk_create(snapshots, batch_size=SNAPSHOT_BATCH_SIZE)
+    return len(snapshots)
+
+
+def snapshot_queryset(evaluations, reason, at=None) -> int:
+    """Append a snapshot of every evaluation in a queryset, ``SNAPSHOT_BATCH_SIZE`` rows at a time."""
+    at = at or timezone.now()
+    rows = evaluations.order_by().values("player_id", "coach_id", *RATING_FIELDS, group_id=F("player__group_id"))
+    count = 0
+    batch = []
+    for row in rows.iterator(chunk_size=SNAPSHOT_BATCH_SIZE):
+        batch.append(_snapshot(row, reason, at))
+        if len(batch) >= SNAPSHOT_BATCH_SIZE:
+            EvaluationSnapshot.objects.bulk_create(batch)
+            count += len(batch)
+            batch = []
+    EvaluationSnapshot.objects.bulk_create(batch)
+    return count + len(batch)
+
+
+def parse_date_range(params):
+    """``since``/``until`` (``YYYY-MM-DD``, both inclusive) as aware datetime bounds.
+
+    Raises ``ValueError`` naming the bad parameter.
+    """
+    bounds = {}
+    for param in ("since", "until"):
+        value = params.get(param)
+        if not value:
+            continue
+        try:
+            day = date.fromisoformat(value)
+            if param == "until":
+                day += timedelta(days=1)
+        except (ValueError, OverflowError):
+            # OverflowError: the day after 9999-12-31
+            raise ValueError(f"Invalid {param} format; expected YYYY-MM-DD")
+        bounds[param] = timezone.make_aware(datetime.combine(day, time.min))
+    return bounds.get("since"), bounds.get("until")
+
+
+def _in_range(queryset, since=None, until=None):
+    if since is not None:
+        queryset = queryset.filter(created_at__gte=since)
+    if until is not None:
+        queryset = queryset.filter(created_at__lt=until)
+    return queryset
+
+
+def player_history(player, since=None, until=None):
+    """A player's snapshots in the range, oldest first."""
+    return _in_range(EvaluationSnapshot.objects.filter(player=player), since, until).order_by("created_at", "id")
+
+
+def group_trend(group, since=None, until=None, interval="month") -> list[dict]:
+    """Per ``interval``: snapshot count, distinct players and the mean of every rating and the skill average."""
+    period = TREND_INTERVALS[interval]("created_at")
+    fields = ["average_rating", *RATING_FIELDS]
+    # Aliased, as annotations may not shadow model fields
+    averages = {f"avg_{f}": Avg(f) for f in fields}
+    rows = (
+        _in_range(EvaluationSnapshot.objects.filter(group=group), since, until)
+        .annotate(period=period)
+        .values("period")
+        .annotate(snapshots=Count("id"), players=Count("player", distinct=True), **averages)
+        .order_by("period")
+    )
+    out = []
+    for row in rows:
+        item = {"period": row["period"].date().isoformat(), "snapshots": row["snapshots"], "players": row["players"]}
+        for field in fields:
+            value = row[f"avg_{field}"]
+            item[field] = round(value, 2) if value is not None else None
+        out.append(item)
+    return out
@@ -0,0 +1,135 @@
+from io import BytesIO
+from pathlib import PurePosixPath
+
+from django.conf import settings
+from django.core.files.base import ContentFile
+from django.core.files.storage import default_storage
+
+
+# Longest edge (px) kept for the stored original upload
+MAX_PHOTO_DIMENSION = 1600
+
+# Fixed-size derivatives generated for every photo: name -> longest edge (px)
+PHOTO_VARIANTS = {
+    "thumb": 96,
+    "small": 256,
+    "medium": 800,
+}
+
+# Output encodings for derivatives: key -> (Pillow format, file extension, save options)
+VARIANT_FORMATS = {
+    "webp": ("WEBP", "webp", {"quality": 80, "method": 4}),
+    "jpeg": ("JPEG", "jpg", {"quality": 82, "optimize": True, "progressive": True}),
+}
+
+VARIANTS_DIR = "variants"
+
+
+def _open_oriented(fileobj):
+    """Open an image, apply its EXIF orientation and fully load it into memory."""
+    from PIL import Image, ImageOps
+
+    fileobj.seek(0)
+    with Image.open(fileobj) as im:
+        has_alpha = im.mode in ("RGBA", "LA") or (im.mode == "P" and "transparency" in im.info)
+        oriented = ImageOps.exif_transpose(im)
+        oriented.load()
+        return oriented.convert("RGBA" if has_alpha else "RGB")
+
+
+def normalize_photo(upload, max_dimension=None) -> ContentFile:
+    """Return a cleaned copy of an uploaded photo.
+
+    Orientation from EXIF is applied to the pixels, all metadata (EXIF, GPS, ICC text)
+    is dropped by re-encoding, and the longest edge is capped at ``max_dimension``.
+    Transparent images stay PNG; everything else is stored as JPEG.
+    """
+    max_dimension = max_dimension or getattr(settings, "MAX_PHOTO_DIMENSION", MAX_PHOTO_DIMENSION)
+    im = _open_oriented(upload)
+    im.thumbnail((max_dimension, max_dimension))
+
+    out = BytesIO()
+    stem = PurePosixPath(getattr(upload, "name", "") or "photo").stem or "photo"
+    if im.mode == "RGBA":
+        im.save(out, "PNG", optimize=True)
+        name = f"{stem}.png"
+    else:
+        im.save(out, "JPEG", quality=88, optimize=True, progressive=True)
+        name = f"{stem}.jpg"
+    return ContentFile(out.getvalue(), name=name)
+
+
+def variant_name(name: str, variant: str, fmt: str) -> str:
+    """Storage name of a derivative, e.g. ``player_photos/variants/ali_thumb.webp``."""
+    path = PurePosixPath(name)
+    ext = VARIANT_FORMATS[fmt][1]
+    return str(path.parent / VARIANTS_DIR / f"{path.stem}_{variant}.{ext}")
+
+
+def variant_names(name: str):
+    return [variant_name(name, variant, fmt) for variant in PHOTO_VARIANTS for fmt in VARIANT_FORMATS]
+
+
+def has_photo_variants(field_file) -> bool:
+    if not field_file:
+        return False
+    storage = getattr(field_file, "storage", default_storage)
+    return all(storage.exists(n) for n in variant_names(field_file.name))
+
+
+def generate_photo_variants(field_file) -> list[str]:
+    """Render every size/format derivative of a stored photo; returns the storage names."""
+    if not field_file:
+        return []
+    storage = getattr(field_file, "storage", default_storage)
+    with storage.open(field_file.name, "rb") as fh:
+        source = _open_oriented(fh)
+
+    written = []
+    # Largest first so each step downsamples the previous, smaller image
+    for variant, size in sorted(PHOTO_VARIANTS.items(), key=lambda item: -item[1]):
+        source.thumbnail((size, size))
+        for fmt, (pil_format, _ext, options) in VARIANT_FORMATS.items():
+            im = source if pil_format == "WEBP" or source.mode == "RGB" else source.convert("RGB")
+            out = BytesIO()
+            im.save(out, pil_format, **options)
+            name = variant_name(field_file.name, variant, fmt)
+            # Names are deterministic, so replace instead of letting storage pick a new one
+            if storage.exists(name):
+                storage.delete(name)
+            written.append(storage.save(name, ContentFile(out.getvalue())))
+    return written
+
+
+def ensure_photo_variants(field_file) -> list[str]:
+    """Generate derivatives only when some are missing (e.g. not for a deduplicated re-upload)."""
+    if not field_file or has_photo_variants(field_file):
+        return []
+    return generate_photo_variants(field_file)
+
+
+def photo_variant_urls(field_file) -> dict | None:
+    """Map ``{variant: {format: url}}`` for a photo, or ``None`` when there is no photo.
+
+    A derivative not generated yet (e.g. before ``generate_photo_variants`` ran) maps to the original's URL.
+    """
+    if not field_file:
+        return None
+    return variant_urls(field_file.name, getattr(field_file, "storage", default_storage))
+
+
+def _last_variant_name(name: str) -> str:
+    """The derivative ``generate_photo_variants`` writes last (smallest size, last format)."""
+    variant = min(PHOTO_VARIANTS, key=PHOTO_VARIANTS.get)
+    return variant_name(name, variant, list(VARIANT_FORMATS)[-1])
+
+
+def variant_urls(name: str, storage=default_storage) -> dict:
+    """``photo_variant_urls`` for a stored name (e.g. a ``values()`` row)."""
+    # One lookup per photo: derivatives are written together, so the last one stands for all of them
+    generated = storage.exists(_last_variant_name(name))
+    original = None if generated else storage.url(name)
+    return {
+        variant: {fmt: storage.url(variant_name(name, variant, fmt)) if generated else original for fmt in VARIANT_FORMATS}
+        for variant in PHOTO_VARIANTS
+    }
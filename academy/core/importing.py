@@ -0,0 +1,285 @@
+"""Bulk CSV import of players and their evaluations.
+
+Accepts the columns ``export.py`` writes (unknown columns such as ``coach`` or
+``attendance_YYYY-MM`` are ignored), so an export can be edited and imported
+back. Rows with a ``player_id`` update that player; rows without one create a
+player. Rows are read one at a time and written in batches: per batch one
+query looks up the players being updated, then one ``bulk_create`` inserts new
+players, one upserts existing ones, one upserts evaluations, one appends
+their history snapshots and two refresh the players' search entries. Only the current batch is held in memory, however
+large the file.
+
+Each row goes through the model field rules (lengths, 1–5 ratings) with
+``clean_fields``; groups must exist and, for a coach, be theirs. Ages are
+computed from ``birth_date`` like ``Player.save()`` does.
+"""
+import csv
+import io
+from datetime import date
+
+from django.conf import settings
+from django.core.exceptions import ValidationError
+from django.db import transaction
+
+from . import search
+from .export import _FORMULA_PREFIXES
+from .history import record_snapshots
+from .models import RATING_FIELDS, Group, Player, PlayerEvaluation, age_on
+
+
+# Player columns an import can set, besides ``player_id`` and ``group_id``/``group``
+PLAYER_IMPORT_FIELDS = ["name", "birth_date", "age", "phone", "attendance_days"]
+EVALUATION_IMPORT_FIELDS = [*RATING_FIELDS, "notes"]
+# Text columns keep empty strings; other empty cells mean "no value"
+_TEXT_FIELDS = {"name", "phone", "notes"}
+
+
+def open_csv(binary_file):
+    """Text stream over an uploaded or opened binary file (UTF-8, with or without a BOM)."""
+    return io.TextIOWrapper(binary_file, encoding="utf-8-sig", newline="")
+
+
+class ImportReport:
+    """Counts and per-line errors of one import (at most ``max_errors`` are kept)."""
+
+    def __init__(self, dry_run=False, max_errors=1000):
+        self.dry_run = dry_run
+        self.max_errors = max_errors
+        self.rows = 0
+        self.created = 0
+        self.updated = 0
+        self.evaluations = 0
+        self.error_count = 0
+        self.errors = []
+        self.imported = False
+
+    def add_error(self, line, errors):
+        self.error_count += 1
+        if len(self.errors) < self.max_errors:
+            self.errors.append({"line": line, "errors": errors})
+
+    def as_dict(self) -> dict:
+        return {
+            "dry_run": self.dry_run,
+            "imported": self.imported,
+            "rows": self.rows,
+            "created": self.created,
+            "updated": self.updated,
+            "evaluations": self.evaluations,
+            "error_count": self.error_count,
+            "errors": self.errors,
+        }
+
+
+class PlayerImporter:
+    """Validate and write CSV rows into ``academy``'s groups (default: the default academy).
+
+    ``coach`` limits the import to that coach's groups.
+
+    The whole import is one transaction. Unless ``skip_invalid`` is set, any
+    invalid row rolls it back (the report still lists every error); a
+    ``dry_run`` validates everything and writes nothing.
+    """
+
+    def __init__(self, academy=None, coach=None, dry_run=False, skip_invalid=False, batch_size=None, max_errors=1000):
+        self.skip_invalid = skip_invalid
+        self.batch_size = batch_size or getattr(settings, "IMPORT_BATCH_SIZE", 500)
+        self.report = ImportReport(dry_run=dry_run, max_errors=max_errors)
+        self.today = date.today()
+        # Group names are only unique within an academy; a coach's groups are all in theirs
+        if coach is not None:
+            groups = Group.objects.filter(coach=coach)
+        elif academy is not None:
+            groups = Group.objects.filter(academy=academy)
+        else:
+            groups = Group.objects.filter(academy__is_default=True)
+        # Group id -> coach id and (season id, academy id), and name -> id; groups are few, so they are loaded once
+        self.groups = {}
+        self.group_scopes = {}
+        self.group_names = {}
+        for group_id, name, coach_id, season_id, academy_id in groups.values_list(
+            "id", "name", "coach_id", "season_id", "academy_id"
+        ):
+            self.groups[group_id] = coach_id
+            self.group_scopes[group_id] = (season_id, academy_id)
+            self.group_names[name] = group_id
+        self.seen_ids = set()
+
+    @property
+    def writing(self) -> bool:
+        return not self.report.dry_run and (self.skip_invalid or self.report.error_count == 0)
+
+    def run(self, lines) -> ImportReport:
+        """Import CSV text lines (e.g. ``open_csv(upload)``); raises ``ValueError`` for an unusable file."""
+        reader = csv.DictReader(lines)
+        try:
+            if reader.fieldnames:
+                reader.fieldnames = [column.strip().lstrip("\ufeff") for column in reader.fieldnames]
+            self._set_columns(reader.fieldnames)
+            with transaction.atomic():
+                batch = []
+                for row in reader:
+                    self.report.rows += 1
+                    item = self._clean(reader.line_num, row)
+                    if item is not None:
+                        batch.append(item)
+                    if len(batch) >= self.batch_size:
+                        self._flush(batch)
+                        batch = []
+                self._flush(batch)
+                self.report.imported = self.writing
+                if not self.report.imported:
+                    transaction.set_rollback(True)
+        except (csv.Error, UnicodeDecodeError) as exc:
+            raise ValueError(f"Line {reader.line_num + 1}: {exc}")
+        return self.report
+
+    def _set_columns(self, header):
+        if not header:
+            raise ValueError("The file is empty.")
+        if "name" not in header or not {"group_id", "group"} & set(header):
+            raise ValueError("The header must include name and group_id or group.")
+        # Columns absent from the file are left alone on updated players
+        self.player_fields = ["group", *(f for f in PLAYER_IMPORT_FIELDS if f in header)]
+        if "birth_date" in header and "age" not in self.player_fields:
+            self.player_fields.append("age")
+        self.evaluation_fields = [f for f in EVALUATION_IMPORT_FIELDS if f in header]
+
+    @staticmethod
+    def _cell(row, field):
+        value = (row.get(field) or "").strip()
+        if field in _TEXT_FIELDS:
+            # Undo the export's spreadsheet formula escaping
+            if value.startswith("'") and value[1:].startswith(_FORMULA_PREFIXES):
+                value = value[1:]
+            return value
+        return value or None
+
+    def _clean(self, line, row):
+        """Row-level validation; returns ``(line, player, evaluation)`` or ``None`` when invalid."""
+        errors = {}
+        player_id = self._cell(row, "player_id")
+        if player_id is not None:
+            try:
+                player_id = int(player_id)
+            except ValueError:
+                errors["player_id"] = ["A valid integer is required."]
+                player_id = None
+            else:
+                if player_id in self.seen_ids:
+                    errors["player_id"] = ["This player appears more than once in the file."]
+                self.seen_ids.add(player_id)
+
+        values = {}
+        for field in PLAYER_IMPORT_FIELDS:
+            if field in self.player_fields:
+                value = self._cell(row, field)
+                if value is not None:
+                    values[field] = value
+        player = Player(id=player_id, group_id=self._group(row, errors), **values)
+        try:
+            player.clean_fields(exclude=["id", "group", "photo", "age"])
+        except ValidationError as exc:
+            errors.update(exc.message_dict)
+        if player.birth_date and "birth_date" not in errors:
+            player.age = age_on(player.birth_date, self.today)
+        elif player_id is None or "age" in self.player_fields:
+            try:
+                player.age = Player._meta.get_field("age").clean(player.age, player)
+            except ValidationError as exc:
+                errors["age"] = exc.messages
+
+        evaluation = None
+        cells = {field: self._cell(row, field) for field in self.evaluation_fields}
+        if any(cells.values()):
+            evaluation = PlayerEvaluation(**{f: v for f, v in cells.items() if v is not None})
+            try:
+                evaluation.clean_fields(exclude=["id", "player", "coach", "updated_at"])
+            except ValidationError as exc:
+                errors.update(exc.message_dict)
+
+        if errors:
+            self.report.add_error(line, errors)
+            return None
+        return line, player, evaluation
+
+    def _group(self, row, errors):
+        group_id = self._cell(row, "group_id")
+        if group_id is not None:
+            try:
+                if int(group_id) in self.groups:
+                    return int(group_id)
+            except ValueError:
+                pass
+            errors["group_id"] = [f"Group {group_id} not found."]
+            return None
+        name = self._cell(row, "group")
+        if name is not None:
+            if name in self.group_names:
+                return self.group_names[name]
+            errors["group"] = [f"Group {name!r} not found."]
+        return None
+
+    def _flush(self, batch):
+        """Checks that need the database, then the batch's writes."""
+        if not batch:
+            return
+        ids = [player.id for _, player, _ in batch if player.id is not None]
+        existing = {}
+        if ids:
+            existing = {row["id"]: row for row in Player.objects.filter(id__in=ids).values("id", "group_id", *PLAYER_IMPORT_FIELDS)}
+
+        created, updated, evaluations = [], [], []
+        for line, player, evaluation in batch:
+            errors = {}
+            if player.id is not None:
+                current = existing.get(player.id)
+                if current is None or current["group_id"] not in self.groups:
+                    errors["player_id"] = ["Player not found."]
+                else:
+                    # The upsert is an INSERT first, so the row must be complete
+                    if player.group_id is None:
+                        player.group_id = current["group_id"]
+                    for field in PLAYER_IMPORT_FIELDS:
+                        if field not in self.player_fields:
+                            setattr(player, field, current[field])
+            elif player.group_id is None:
+                errors["group"] = ["New players need a group_id or group."]
+            if evaluation is not None and not errors:
+                # The evaluating coach is always the group's coach
+                evaluation.coach_id = self.groups[player.group_id]
+                if evaluation.coach_id is None:
+                    errors["group"] = ["The group has no coach to own the evaluation."]
+            if errors:
+                self.report.add_error(line, errors)
+                continue
+            # Players are always in their group's season and academy
+            player.season_id, player.academy_id = self.group_scopes[player.group_id]
+            (updated if player.id is not None else created).append(player)
+            if evaluation is not None:
+                evaluations.append((player, evaluation))
+
+        report = self.report
+        report.created += len(created)
+        report.updated += len(updated)
+        report.evaluations += len(evaluations)
+        if not self.writing:
+            return
+        # Players without an id get theirs back from the insert (SQLite 3.35+, PostgreSQL)
+        Player.objects.bulk_create(created)
+        if updated:
+            Player.objects.bulk_create(updated, update_conflicts=True, unique_fields=["id"], update_fields=[*self.player_fields, "season", "academy"])
+        # bulk_create sends no signals
+        search.index(Player.objects.filter(pk__in=[player.pk for player in created + updated]))
+        if evaluations:
+            for player, evaluation in evaluations:
+                evaluation.player = player
+                evaluation.academy_id = player.academy_id
+            evaluations = [evaluation for _, evaluation in evaluations]
+            PlayerEvaluation.objects.bulk_create(
+                evaluations,
+                update_conflicts=True,
+                unique_fields=["player"],
+                update_fields=["coach", "academy", *self.evaluation_fields, "updated_at"],
+            )
+            record_snapshots(evaluations, "import")
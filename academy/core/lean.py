@@ -0,0 +1,236 @@
+"""Read-only fast path for player and group payloads.
+
+Builds exactly what ``PlayerSerializer`` / ``GroupSerializer`` return, but from
+``values()`` rows (one joined query for players and their evaluations) and a
+fixed set of per-field mappers instead of instantiating serializer fields for
+every object. ``core/tests/test_lean.py`` checks the output against the
+serializers, so any serializer change must be mirrored here.
+"""
+from datetime import date
+
+from django.conf import settings
+from django.core.exceptions import ValidationError
+from django.core.files.storage import default_storage
+from django.http import Http404
+from rest_framework import serializers
+from rest_framework.response import Response
+
+from .images import variant_urls
+from .models import RATING_FIELDS, SKILL_RATING_FIELDS, Player, PlayerAttendance
+from .perf import timer
+
+
+PLAYER_COLUMNS = ["id", "group_id", "name", "photo", "birth_date", "age", "phone", "attendance_days"]
+EVALUATION_COLUMNS = ["id", "player_id", "coach_id", *RATING_FIELDS, "notes", "updated_at"]
+GROUP_COLUMNS = ["id", "name", "description", "coach_id"]
+COACH_COLUMNS = ["coach__bio", "coach__photo", "coach__phone"]
+USER_COLUMNS = ["id", "username", "first_name", "last_name", "email", "is_staff"]
+
+# Same output as the serializer fields, created once
+_format_date = serializers.DateField().to_representation
+_format_datetime = serializers.DateTimeField().to_representation
+
+
+def average_rating(row, prefix="") -> float:
+    # PlayerEvaluation.average_rating on a values() row
+    values = [v for v in (row[prefix + f] for f in SKILL_RATING_FIELDS) if isinstance(v, int)]
+    if not values:
+        return 0.0
+    return round(sum(values) / len(values), 2)
+
+
+def _attendance_month(value):
+    """First day of a ``YYYY-MM`` month, or ``None`` (the serializer then uses ``attendance_days``)."""
+    if not value:
+        return None
+    try:
+        year, month = [int(x) for x in value.split("-")]
+        return date(year, month, 1)
+    except Exception:
+        return None
+
+
+class _Urls:
+    """Storage URLs, absolute when there is a request (like DRF's ImageField)."""
+
+    def __init__(self, request):
+        self.request = request
+        self.storage = default_storage
+        # Scheme and host for site-relative URLs, computed once per request
+        self.origin = request.build_absolute_uri("/")[:-1] if request is not None else None
+
+    def absolute(self, url):
+        if self.request is None:
+            return url
+        if url.startswith("/") and not url.startswith("//"):
+            return self.origin + url
+        return self.request.build_absolute_uri(url)
+
+    def photo(self, name):
+        return self.absolute(self.storage.url(name)) if name else None
+
+    def variants(self, name):
+        if not name:
+            return None
+        return {
+            variant: {fmt: self.absolute(url) for fmt, url in fmts.items()}
+            for variant, fmts in variant_urls(name, self.storage).items()
+        }
+
+
+class PlayerRows:
+    """``PlayerSerializer`` output for a ``Player`` queryset (filters and ordering kept)."""
+
+    columns = PLAYER_COLUMNS + [f"evaluation__{c}" for c in EVALUATION_COLUMNS]
+
+    def __init__(self, request=None, attendance_month=None):
+        self.urls = _Urls(request)
+        self.month = _attendance_month(attendance_month)
+
+    def fetch(self, queryset) -> list[dict]:
+        return self.build(list(self._values(queryset)))
+
+    def iterate(self, queryset, chunk_size=500):
+        chunk = []
+        for row in self._values(queryset).iterator(chunk_size=chunk_size):
+            chunk.append(row)
+            if len(chunk) >= chunk_size:
+                yield from self.build(chunk)
+                chunk = []
+        if chunk:
+            yield from self.build(chunk)
+
+    def _values(self, queryset):
+        return queryset.select_related(None).prefetch_related(None).values(*self.columns)
+
+    def build(self, rows) -> list[dict]:
+        attendance = {}
+        if self.month is not None and rows:
+            attendance = dict(
+                PlayerAttendance.objects.filter(player_id__in=[r["id"] for r in rows], month=self.month).values_list("player_id", "days")
+            )
+        urls = self.urls
+        out = []
+        for row in rows:
+            photo = row["photo"]
+            item = {
+                "id": row["id"],
+                "group": row["group_id"],
+                "name": row["name"],
+                "photo": urls.photo(photo),
+                "photo_variants": urls.variants(photo),
+                "birth_date": _format_date(row["birth_date"]) if row["birth_date"] is not None else None,
+                "age": row["age"],
+                "phone": row["phone"],
+                "attendance_days": attendance.get(row["id"], row["attendance_days"]),
+                "evaluation": self._evaluation(row) if row["evaluation__id"] is not None else None,
+            }
+            out.append(item)
+        return out
+
+    @staticmethod
+    def _evaluation(row) -> dict:
+        evaluation = {
+            "id": row["evaluation__id"],
+            "player": row["evaluation__player_id"],
+            "coach": row["evaluation__coach_id"],
+        }
+        for field in RATING_FIELDS:
+            evaluation[field] = row["evaluation__" + field]
+        evaluation["notes"] = row["evaluation__notes"]
+        evaluation["updated_at"] = _format_datetime(row["evaluation__updated_at"])
+        evaluation["average_rating"] = average_rating(row, "evaluation__")
+        return evaluation
+
+
+class GroupRows:
+    """``GroupSerializer`` output for a ``Group`` queryset, players included (ordered by id)."""
+
+    columns = GROUP_COLUMNS + COACH_COLUMNS + [f"coach__user__{c}" for c in USER_COLUMNS]
+
+    def __init__(self, request=None, attendance_month=None):
+        self.players = PlayerRows(request, attendance_month)
+        self.urls = self.players.urls
+
+    def fetch(self, queryset) -> list[dict]:
+        groups = list(queryset.select_related(None).prefetch_related(None).values(*self.columns))
+        players = {g["id"]: [] for g in groups}
+        if groups:
+            player_qs = Player.objects.filter(group_id__in=list(players)).order_by("id")
+            for player in self.players.fetch(player_qs):
+                players[player["group"]].append(player)
+        return [
+            {
+                "id": g["id"],
+                "name": g["name"],
+                "description": g["description"],
+                "coach": self._coach(g),
+                "players": players[g["id"]],
+            }
+            for g in groups
+        ]
+
+    def _coach(self, row):
+        if row["coach_id"] is None:
+            return None
+        photo = row["coach__photo"]
+        return {
+            "id": row["coach_id"],
+            "user": {c: row["coach__user__" + c] for c in USER_COLUMNS},
+            "bio": row["coach__bio"],
+            "photo": self.urls.photo(photo),
+            "photo_variants": self.urls.variants(photo),
+            "phone": row["coach__phone"],
+        }
+
+
+class LeanReadMixin:
+    """Answer ``list`` and ``retrieve`` from ``lean_rows_class`` instead of the serializer.
+
+    Filtering, ordering and queryset scoping are unchanged. Retrieve relies on
+    ``get_queryset()`` scoping rather than object-level permission checks, so only
+    use it where read access is fully expressed by the queryset. Turned off with
+    ``LEAN_READS = False``.
+    """
+
+    lean_rows_class = None
+
+    def lean_rows(self):
+        context = self.get_serializer_context()
+        return self.lean_rows_class(request=self.request, attendance_month=context.get("attendance_month"))
+
+    def use_lean_reads(self, request) -> bool:
+        if not getattr(settings, "LEAN_READS", True):
+            return False
+        # Streamed lists have their own row source (see stream_rows)
+        wants_stream = getattr(self, "wants_stream", None)
+        return not (wants_stream and wants_stream(request))
+
+    def list(self, request, *args, **kwargs):
+        if not self.use_lean_reads(request):
+            return super().list(request, *args, **kwargs)
+        queryset = self.filter_queryset(self.get_queryset())
+        with timer("serialize"):
+            data = self.lean_rows().fetch(queryset)
+        return Response(data)
+
+    def retrieve(self, request, *args, **kwargs):
+        if not self.use_lean_reads(request):
+            return super().retrieve(request, *args, **kwargs)
+        queryset = self.filter_queryset(self.get_queryset())
+        lookup_url_kwarg = self.lookup_url_kwarg or self.lookup_field
+        # Same 404s as get_object_or_404
+        try:
+            queryset = queryset.filter(**{self.lookup_field: kwargs[lookup_url_kwarg]})
+        except (TypeError, ValueError, ValidationError):
+            raise Http404
+        with timer("serialize"):
+            rows = self.lean_rows().fetch(queryset)
+        if not rows:
+            raise Http404(f"No {queryset.model._meta.object_name} matches the given query.")
+        return Response(rows[0])
+
+    def stream_rows(self, queryset, chunk_size):
+        if not getattr(settings, "LEAN_READS", True):
+            return super().stream_rows(queryset, chunk_size)
+        return self.lean_rows().iterate(queryset, chunk_size=chunk_size)
@@ -0,0 +1,37 @@
+from django.core.management.base import BaseCommand, CommandError
+
+from core.models import Season
+from core.seasons import archive_season, check_archivable, season_history
+
+
+class Command(BaseCommand):
+    help = "Move a closed season's attendance and sessions to archive tables and roll up its evaluation snapshots"
+
+    def add_arguments(self, parser):
+        parser.add_argument("season", help="Season name or id")
+        parser.add_argument("--batch-size", type=int, help="Rows moved (or players rolled up) per transaction")
+        parser.add_argument("--dry-run", action="store_true", help="Only count what would be archived")
+
+    def handle(self, *args, **options):
+        name = options["season"]
+        season = Season.objects.filter(name=name).first()
+        if season is None and name.isdigit():
+            season = Season.objects.filter(pk=int(name)).first()
+        if season is None:
+            raise CommandError(f"Season not found: {name}")
+        try:
+            check_archivable(season)
+        except ValueError as exc:
+            raise CommandError(str(exc))
+
+        if options["dry_run"]:
+            for table, queryset in season_history(season).items():
+                self.stdout.write(f"{table}: {queryset.count()} rows")
+            return
+        counts = archive_season(season, batch_size=options["batch_size"])
+        self.stdout.write(
+            self.style.SUCCESS(
+                f"Archived {season}: {counts['attendance']} attendance records, {counts['sessions']} sessions, "
+                f"{counts['snapshots']} evaluation snapshots rolled up into {counts['rollups']} rows"
+            )
+        )
@@ -0,0 +1,195 @@
+import logging
+import re
+import time
+import tracemalloc
+from io import StringIO
+
+from django.contrib.auth.models import User
+from django.core.management import call_command
+from django.core.management.base import BaseCommand
+from django.db import connection, transaction
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from rest_framework.test import APIClient
+
+from academy.urls import router
+from core.benchmarks import compare_results, percentile, write_results
+from core.models import Group, Player, PlayerEvaluation
+
+
+BENCH_PASSWORD = "bench-pass-123"
+
+
+class _Rollback(Exception):
+    pass
+
+
+def _router_get_cases(ids):
+    """GET requests for every list, detail and GET action registered on the API router."""
+    cases = []
+    for prefix, viewset, basename in router.registry:
+        pk = ids.get(basename)
+        cases.append(("GET", f"/api/{prefix}/", None))
+        if pk is None:
+            continue
+        cases.append(("GET", f"/api/{prefix}/{pk}/", None))
+        for action in viewset.get_extra_actions():
+            if "get" not in action.mapping:
+                continue
+            if action.detail:
+                cases.append(("GET", f"/api/{prefix}/{pk}/{action.url_path}/", None))
+            else:
+                cases.append(("GET", f"/api/{prefix}/{action.url_path}/", None))
+    return cases
+
+
+class Command(BaseCommand):
+    help = "Benchmark every API endpoint (p50/p95 latency, queries, response size, peak memory) on synthetic data"
+
+    def add_arguments(self, parser):
+        parser.add_argument("--sizes", type=int, nargs="+", default=[10, 100, 500], help="Players per group")
+        parser.add_argument("--groups", type=int, default=4, help="Groups per dataset")
+        parser.add_argument("--months", type=int, default=6, help="Months of attendance history per player")
+        parser.add_argument("--iterations", type=int, default=20, help="Timed requests per endpoint")
+        parser.add_argument("--roles", nargs="+", choices=["staff", "coach"], default=["staff", "coach"])
+        parser.add_argument("--include-writes", action="store_true", help="Also time write endpoints (each rolled back)")
+        parser.add_argument("--filter", help="Only endpoints whose path matches this regular expression")
+        parser.add_argument("--exclude", help="Skip endpoints whose path matches this regular expression")
+        parser.add_argument("--output", help="Write results as JSON to this file")
+        parser.add_argument("--compare", help="Compare against a previous --output file")
+
+    def handle(self, *args, **options):
+        # Expected 4xx responses (e.g. coaches on admin-only routes) would flood the log
+        request_logger = logging.getLogger("django.request")
+        previous_level = request_logger.level
+        request_logger.setLevel(logging.ERROR)
+        results = []
+        try:
+            for size in options["sizes"]:
+                try:
+                    with transaction.atomic():
+                        results.extend(self._run_size(size, options))
+                        raise _Rollback()
+                except _Rollback:
+                    pass
+        finally:
+            request_logger.setLevel(previous_level)
+
+        if options["output"]:
+            write_results(options["output"], results, command="benchmark_api")
+            self.stdout.write(self.style.SUCCESS(f"Wrote {len(results)} result(s) to {options['output']}"))
+        if options["compare"]:
+            for line in compare_results(options["compare"], results, metrics=("p50_ms", "p95_ms", "queries", "response_bytes")):
+                self.stdout.write(line)
+
+    def _run_size(self, size, options):
+        prefix = f"bench{size}"
+        call_command(
+            "seed_academy",
+            coaches=max(1, options["groups"] // 2),
+            groups=options["groups"],
+            players_per_group=size,
+            months=options["months"],
+            prefix=prefix,
+            stdout=StringIO(),
+        )
+        group = Group.objects.filter(name__startswith=f"{prefix} ").select_related("coach__user").order_by("id").first()
+        player = Player.objects.filter(group=group).order_by("id").first()
+        evaluation = PlayerEvaluation.objects.get(player=player)
+        staff = User.objects.create_user(username=f"{prefix}-staff", password=BENCH_PASSWORD, is_staff=True)
+        coach_user = group.coach.user
+        coach_user.set_password(BENCH_PASSWORD)
+        coach_user.save(update_fields=["password"])
+        users = {"staff": staff, "coach": coach_user}
+        ids = {"coach": group.coach_id, "group": group.id, "player": player.id, "evaluation": evaluation.id}
+        month = evaluation.player.attendance_records.values_list("month", flat=True).first()
+
+        cases = _router_get_cases(ids)
+        if month:
+            # Month-scoped variants exercise the attendance lookups
+            cases.append(("GET", f"/api/groups/{group.id}/?month={month:%Y-%m}", None))
+            cases.append(("GET", f"/api/evaluations/{evaluation.id}/attendance/?month={month:%Y-%m}", None))
+        cases.append(("GET", reverse("me"), None))
+        cases.append(("GET", f"{reverse('search')}?q={player.name.split()[0][:3]}", None))
+        if options["include_writes"]:
+            cases += [
+                ("POST", "/api/players/", {"group": group.id, "name": "Bench Player", "birth_date": "2014-03-01"}),
+                ("PATCH", f"/api/players/{player.id}/", {"phone": "555-0000"}),
+                ("PATCH", f"/api/evaluations/{evaluation.id}/", {"passing": 4}),
+                ("PUT", f"/api/evaluations/{evaluation.id}/attendance/?month=2026-01", {"days": 8}),
+                ("POST", f"/api/groups/{group.id}/reset-evaluations/", {}),
+                ("PATCH", reverse("me"), {"phone": "555-0001"}),
+                ("POST", reverse("change_password"), {"old_password": BENCH_PASSWORD, "new_password": BENCH_PASSWORD}),
+            ]
+
+        results = []
+        for role in options["roles"]:
+            client = APIClient(raise_request_exception=False)
+            client.force_authenticate(user=users[role])
+            for method, path, data in cases:
+                if options["filter"] and not re.search(options["filter"], path):
+                    continue
+                if options["exclude"] and re.search(options["exclude"], path):
+                    continue
+                results.append(self._measure(client, method, path, data, role, size, options["iterations"]))
+
+        # Auth endpoints run unauthenticated with real credentials (password hashing included)
+        anon = APIClient(raise_request_exception=False)
+        tokens = anon.post(reverse("token_obtain_pair"), {"username": staff.username, "password": BENCH_PASSWORD}, format="json").data
+        auth_cases = [
+            ("POST", reverse("token_obtain_pair"), {"username": staff.username, "password": BENCH_PASSWORD}),
+            ("POST", reverse("token_refresh"), {"refresh": tokens["refresh"]}),
+        ]
+        if options["include_writes"]:
+            auth_cases.append(("POST", reverse("signup"), {"username": f"{prefix}-signup", "password": BENCH_PASSWORD}))
+        for method, path, data in auth_cases:
+            if options["filter"] and not re.search(options["filter"], path):
+                continue
+            results.append(self._measure(anon, method, path, data, "anonymous", size, options["iterations"]))
+        return results
+
+    def _request(self, client, method, path, data):
+        # Writes run in a savepoint that is rolled back, so every iteration sees the same data
+        with transaction.atomic():
+            response = getattr(client, method.lower())(path, data, format="json") if data is not None else client.get(path)
+            if response.streaming:
+                size = sum(len(chunk) for chunk in response.streaming_content)
+            else:
+                size = len(response.content)
+            if method != "GET":
+                transaction.set_rollback(True)
+        return response, size
+
+    def _measure(self, client, method, path, data, role, size, iterations):
+        response, response_bytes = self._request(client, method, path, data)  # warm-up
+        timings, queries = [], []
+        for _ in range(max(1, iterations)):
+            with CaptureQueriesContext(connection) as captured:
+                started = time.perf_counter()
+                self._request(client, method, path, data)
+                timings.append((time.perf_counter() - started) * 1000)
+            queries.append(len(captured))
+        tracemalloc.start()
+        try:
+            self._request(client, method, path, data)
+            _, peak = tracemalloc.get_traced_memory()
+        finally:
+            tracemalloc.stop()
+
+        endpoint = f"{method} {path}"
+        result = {
+            "name": "api",
+            "params": {"endpoint": endpoint, "role": role, "players_per_group": size},
+            "status": response.status_code,
+            "p50_ms": round(percentile(timings, 50), 3),
+            "p95_ms": round(percentile(timings, 95), 3),
+            "queries": max(queries),
+            "response_bytes": response_bytes,
+            "peak_memory_bytes": peak,
+        }
+        self.stdout.write(
+            f"{role:<9} {size:>5}  {endpoint[:70]:<70} {response.status_code}  p50 {result['p50_ms']:8.1f} ms  "
+            f"p95 {result['p95_ms']:8.1f} ms  {result['queries']:4d} q  {response_bytes / 1024:8.1f} KiB  "
+            f"peak {peak / 1024 / 1024:6.1f} MiB"
+        )
+        return result
@@ -0,0 +1,102 @@
+import shutil
+import tempfile
+from pathlib import Path
+
+from django.core.management.base import BaseCommand
+from django.db import transaction
+from django.test import override_settings
+
+from core.benchmarks import arabic_shaping, compare_results, measure, synthetic_group, write_results
+from core.pdf import build_player_report, render_group_report_file
+
+
+class _Rollback(Exception):
+    pass
+
+
+def _on_off(value):
+    return {"on": [True], "off": [False], "both": [False, True]}[value]
+
+
+class Command(BaseCommand):
+    help = "Benchmark PDF report rendering (time, peak memory, size) on synthetic academies"
+
+    def add_arguments(self, parser):
+        parser.add_argument("--sizes", type=int, nargs="+", default=[50, 500, 2000], help="Players per group to benchmark")
+        parser.add_argument("--reports", nargs="+", choices=["group", "player"], default=["group", "player"])
+        parser.add_argument("--photos", choices=["on", "off", "both"], default="both", help="Give every player a photo")
+        parser.add_argument("--photo-size", type=int, nargs=2, default=[3024, 4032], metavar=("W", "H"))
+        parser.add_argument("--arabic", choices=["on", "off", "both"], default="both", help="Arabic label shaping")
+        parser.add_argument("--repeat", type=int, default=3, help="Timed runs per case (median is reported)")
+        parser.add_argument("--player-samples", type=int, default=10, help="Players rendered per player-report case")
+        parser.add_argument("--output", help="Write results as JSON to this file")
+        parser.add_argument("--compare", help="Compare against a previous --output file")
+
+    def handle(self, *args, **options):
+        media_root = Path(tempfile.mkdtemp(prefix="academy-bench-media-"))
+        results = []
+        try:
+            with override_settings(MEDIA_ROOT=str(media_root)):
+                for size in options["sizes"]:
+                    for photos in _on_off(options["photos"]):
+                        results.extend(self._run_size(size, photos, options, media_root))
+        finally:
+            shutil.rmtree(media_root, ignore_errors=True)
+
+        if options["output"]:
+            write_results(options["output"], results, command="benchmark_reports")
+            self.stdout.write(self.style.SUCCESS(f"Wrote {len(results)} result(s) to {options['output']}"))
+        if options["compare"]:
+            for line in compare_results(options["compare"], results):
+                self.stdout.write(line)
+
+    def _run_size(self, size, photos, options, media_root):
+        results = []
+        try:
+            with transaction.atomic():
+                group = synthetic_group(
+                    size,
+                    media_root=media_root,
+                    photo_size=options["photo_size"] if photos else None,
+                )
+                players = list(
+                    group.players.select_related("group__coach__user", "evaluation__coach__user")
+                    .order_by("id")[: options["player_samples"]]
+                )
+                for arabic in _on_off(options["arabic"]):
+                    with arabic_shaping(arabic):
+                        # Warm-up render fills the report thumbnail cache; measured runs are warm
+                        if "group" in options["reports"]:
+                            self._render_group(group)
+                            results.append(self._record("group_report", size, photos, arabic,
+                                                        measure(lambda: self._render_group(group), options["repeat"])))
+                        if "player" in options["reports"] and players:
+                            self._render_players(players)
+                            metrics = measure(lambda: self._render_players(players), options["repeat"])
+                            # Report per-document numbers
+                            metrics["seconds"] = round(metrics["seconds"] / len(players), 5)
+                            metrics["min_seconds"] = round(metrics["min_seconds"] / len(players), 5)
+                            metrics["output_bytes"] //= len(players)
+                            results.append(self._record("player_report", size, photos, arabic, metrics))
+                raise _Rollback()
+        except _Rollback:
+            pass
+        return results
+
+    def _record(self, name, size, photos, arabic, metrics):
+        self.stdout.write(
+            f"{name:<14} players={size:<6} photos={str(photos):<5} arabic={str(arabic):<5} "
+            f"{metrics['seconds'] * 1000:9.1f} ms  peak {metrics['peak_memory_bytes'] / 1024 / 1024:6.1f} MiB  "
+            f"{metrics['output_bytes'] / 1024:8.0f} KiB"
+        )
+        return {"name": name, "params": {"players": size, "photos": photos, "arabic": arabic}, **metrics}
+
+    @staticmethod
+    def _render_group(group) -> int:
+        with render_group_report_file(group) as pdf_file:
+            pdf_file.seek(0, 2)
+            return pdf_file.tell()
+
+    @staticmethod
+    def _render_players(players) -> int:
+        return sum(len(build_player_report(p)) for p in players)
@@ -0,0 +1,205 @@
+import logging
+import multiprocessing
+import random
+import time
+from io import StringIO
+
+from django.contrib.auth.models import User
+from django.core.management import call_command
+from django.core.management.base import BaseCommand, CommandError
+from django.db import OperationalError, connection, connections
+from django.test import override_settings
+from django.utils import timezone
+from rest_framework.test import APIClient
+
+from core.benchmarks import compare_results, percentile, write_results
+from core.models import Group, PlayerEvaluation
+
+
+PROFILES = {
+    # Django's defaults: rollback journal, BEGIN DEFERRED, sqlite3's 5 s timeout
+    "default": {"tuning": False, "journal_mode": "DELETE"},
+    "tuned": {"tuning": True, "journal_mode": "WAL"},
+}
+
+
+class Command(BaseCommand):
+    help = (
+        "Benchmark the SQLite profiles (SQLITE_TUNING) under concurrent mixed API traffic from several worker "
+        "processes: throughput, latency and 'database is locked' errors"
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--profiles", nargs="+", choices=list(PROFILES), default=list(PROFILES))
+        parser.add_argument("--workers", type=int, default=8, help="Client processes, like server workers (one coach and group each)")
+        parser.add_argument("--duration", type=float, default=10, help="Seconds of traffic per profile")
+        parser.add_argument("--write-ratio", type=float, default=0.3, help="Share of requests that write")
+        parser.add_argument("--pdf-ratio", type=float, default=0.1, help="Share of requests that download a group PDF report")
+        parser.add_argument("--players-per-group", type=int, default=40)
+        parser.add_argument("--prefix", default="sqlitebench", help="Prefix of the synthetic data (deleted afterwards)")
+        parser.add_argument("--output", help="Write results as JSON to this file")
+        parser.add_argument("--compare", help="Compare against a previous --output file")
+
+    def handle(self, *args, **options):
+        if connection.vendor != "sqlite":
+            raise CommandError("benchmark_sqlite needs a SQLite database")
+        if options["workers"] < 1 or options["duration"] <= 0:
+            raise CommandError("--workers must be >= 1 and --duration > 0")
+        # Requests run from other processes against the configured database, so the synthetic data is removed at the end
+        call_command(
+            "seed_academy",
+            coaches=options["workers"],
+            groups=options["workers"],
+            players_per_group=options["players_per_group"],
+            months=1,
+            prefix=options["prefix"],
+            stdout=StringIO(),
+        )
+        with connection.cursor() as cursor:
+            cursor.execute("PRAGMA journal_mode")
+            journal_mode = cursor.fetchone()[0]
+        # Lock errors and slow requests would flood the log
+        loggers = [logging.getLogger(name) for name in ("django.request", "core.perf")]
+        previous_levels = [logger.level for logger in loggers]
+        for logger in loggers:
+            logger.setLevel(logging.CRITICAL)
+        results = []
+        try:
+            for name in options["profiles"]:
+                results.append(self._run_profile(name, options))
+        finally:
+            for logger, level in zip(loggers, previous_levels):
+                logger.setLevel(level)
+            self._set_journal_mode(journal_mode)
+            Group.objects.filter(name__startswith=f"{options['prefix']} ").delete()
+            User.objects.filter(username__startswith=f"{options['prefix']}-coach-").delete()
+
+        if len(results) == 2 and results[0]["requests_per_second"]:
+            default, tuned = results
+            self.stdout.write(
+                f"tuned vs default: throughput {tuned['requests_per_second'] / default['requests_per_second']:.2f}x, "
+                f"lock errors {default['lock_errors']} -> {tuned['lock_errors']}"
+            )
+        if options["output"]:
+            write_results(options["output"], results, command="benchmark_sqlite")
+            self.stdout.write(self.style.SUCCESS(f"Wrote {len(results)} result(s) to {options['output']}"))
+        if options["compare"]:
+            for line in compare_results(options["compare"], results, metrics=("requests_per_second", "read_p95_ms", "write_p95_ms")):
+                self.stdout.write(line)
+
+    def _set_journal_mode(self, mode):
+        # Only takes effect with no other connection open
+        connections.close_all()
+        with connection.cursor() as cursor:
+            cursor.execute(f"PRAGMA journal_mode = {mode}")
+        connection.close()
+
+    def _run_profile(self, name, options):
+        profile = PROFILES[name]
+        groups = list(
+            Group.objects.filter(name__startswith=f"{options['prefix']} ")
+            .select_related("coach__user")
+            .order_by("pk")
+        )
+        players = {
+            group.pk: list(group.players.order_by("pk").values_list("pk", flat=True)) for group in groups
+        }
+        evaluations = {
+            group.pk: list(PlayerEvaluation.objects.filter(player__group=group).values_list("pk", flat=True))
+            for group in groups
+        }
+        stats = {"reads": [], "writes": [], "lock_errors": 0, "errors": 0}
+        # Forked, so the workers inherit the overridden settings; each opens its own connection
+        context = multiprocessing.get_context("fork")
+        queue = context.Queue()
+        with override_settings(SQLITE_TUNING=profile["tuning"]):
+            self._set_journal_mode(profile["journal_mode"])
+            deadline = time.monotonic() + options["duration"]
+            workers = [
+                context.Process(
+                    target=self._client,
+                    args=(group, players[group.pk], evaluations[group.pk], deadline, options, queue, index),
+                )
+                for index, group in enumerate(groups)
+            ]
+            started = time.monotonic()
+            for worker in workers:
+                worker.start()
+            for _ in workers:
+                for key, value in queue.get().items():
+                    stats[key] += value
+            for worker in workers:
+                worker.join()
+            elapsed = time.monotonic() - started
+
+        completed = len(stats["reads"]) + len(stats["writes"])
+        total = completed + stats["lock_errors"] + stats["errors"]
+        result = {
+            "name": "sqlite_concurrency",
+            "params": {
+                "profile": name,
+                "workers": options["workers"],
+                "write_ratio": options["write_ratio"],
+                "pdf_ratio": options["pdf_ratio"],
+                "players_per_group": options["players_per_group"],
+            },
+            "requests": total,
+            "requests_per_second": round(completed / elapsed, 2),
+            "read_p50_ms": round(percentile(stats["reads"], 50), 3) if stats["reads"] else None,
+            "read_p95_ms": round(percentile(stats["reads"], 95), 3) if stats["reads"] else None,
+            "write_p50_ms": round(percentile(stats["writes"], 50), 3) if stats["writes"] else None,
+            "write_p95_ms": round(percentile(stats["writes"], 95), 3) if stats["writes"] else None,
+            "lock_errors": stats["lock_errors"],
+            "lock_error_rate": round(stats["lock_errors"] / total, 4) if total else 0,
+            "other_errors": stats["errors"],
+        }
+        self.stdout.write(
+            f"{name:<8} {options['workers']:>3} workers  {result['requests_per_second']:8.1f} req/s  "
+            f"read p50 {result['read_p50_ms'] or 0:7.1f} p95 {result['read_p95_ms'] or 0:7.1f} ms  "
+            f"write p50 {result['write_p50_ms'] or 0:7.1f} p95 {result['write_p95_ms'] or 0:7.1f} ms  "
+            f"locked {stats['lock_errors']}/{total} ({result['lock_error_rate']:.1%})  other errors {stats['errors']}"
+        )
+        return result
+
+    def _client(self, group, players, evaluations, deadline, options, queue, index):
+        """One coach's traffic on their own group: player lists, PDF reports, attendance and evaluation saves."""
+        stats = {"reads": [], "writes": [], "lock_errors": 0, "errors": 0}
+        rng = random.Random(index)
+        client = APIClient()
+        client.force_authenticate(user=group.coach.user)
+        month = f"{timezone.localdate():%Y-%m}"
+        try:
+            while time.monotonic() < deadline:
+                draw = rng.random()
+                write = draw < options["write_ratio"]
+                started = time.perf_counter()
+                try:
+                    if write and rng.random() < 0.5 and players:
+                        # Read-then-write transaction (core.attendance.update_days)
+                        marked = rng.sample(players, min(5, len(players)))
+                        key = "present" if rng.random() < 0.5 else "absent"
+                        response = client.post(
+                            f"/api/groups/{group.pk}/attendance-days/",
+                            {"month": month, "days": [rng.randint(1, 28)], key: marked},
+                            format="json",
+                        )
+                    elif write and evaluations:
+                        response = client.patch(
+                            f"/api/evaluations/{rng.choice(evaluations)}/", {"passing": rng.randint(1, 5)}, format="json"
+                        )
+                    elif draw < options["write_ratio"] + options["pdf_ratio"]:
+                        response = client.get(f"/api/groups/{group.pk}/report-pdf/")
+                        b"".join(response.streaming_content)
+                    else:
+                        response = client.get("/api/players/", {"group": group.pk})
+                except OperationalError as exc:
+                    stats["lock_errors" if "locked" in str(exc) else "errors"] += 1
+                    continue
+                elapsed_ms = (time.perf_counter() - started) * 1000
+                if response.status_code >= 400:
+                    stats["errors"] += 1
+                else:
+                    stats["writes" if write else "reads"].append(elapsed_ms)
+        finally:
+            connection.close()
+            queue.put(stats)
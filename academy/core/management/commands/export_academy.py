@@ -0,0 +1,51 @@
+from django.core.management.base import BaseCommand, CommandError
+
+from core.export import EXPORT_FORMATS, parse_month, stream_export
+from core.models import Academy, Group, Player
+
+
+class Command(BaseCommand):
+    help = "Export players with their ratings, average and monthly attendance as CSV or NDJSON"
+
+    def add_arguments(self, parser):
+        parser.add_argument("--format", choices=list(EXPORT_FORMATS), default="csv", dest="fmt")
+        parser.add_argument("--academy", help="Only this academy (slug); group names are looked up within it")
+        parser.add_argument("--group", help="Only this group (id or exact name)")
+        parser.add_argument("--since", help="First attendance month to include (YYYY-MM)")
+        parser.add_argument("--until", help="Last attendance month to include (YYYY-MM)")
+        parser.add_argument("--chunk-size", type=int, help="Rows fetched per database round trip")
+        parser.add_argument("--output", "-o", help="Write to this file instead of standard output")
+
+    def handle(self, *args, **options):
+        players, groups = Player.objects.all(), Group.objects.all()
+        if options["academy"]:
+            academy = Academy.objects.filter(slug=options["academy"]).first()
+            if academy is None:
+                raise CommandError(f"Academy not found: {options['academy']}")
+            players, groups = players.filter(academy=academy), groups.filter(academy=academy)
+        if options["group"]:
+            value = options["group"]
+            group = groups.filter(pk=int(value)).first() if value.isdigit() else None
+            group = group or groups.filter(name=value).first()
+            if group is None:
+                raise CommandError(f"Group not found: {value}")
+            players = players.filter(group=group)
+
+        months = {}
+        for param in ("since", "until"):
+            if options[param]:
+                try:
+                    months[param] = parse_month(options[param])
+                except Exception:
+                    raise CommandError(f"Invalid --{param}; expected YYYY-MM")
+
+        chunks = stream_export(players, options["fmt"], chunk_size=options["chunk_size"], **months)
+        if options["output"]:
+            with open(options["output"], "wb") as out:
+                for chunk in chunks:
+                    out.write(chunk)
+            self.stderr.write(self.style.SUCCESS(f"Wrote {options['output']}"))
+        else:
+            # Chunks always end on a row boundary, so each one decodes on its own
+            for chunk in chunks:
+                self.stdout.write(chunk.decode(), ending="")
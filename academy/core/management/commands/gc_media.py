@@ -0,0 +1,71 @@
+import time
+from pathlib import Path
+
+from django.conf import settings
+from django.core.files.storage import default_storage
+from django.core.management.base import BaseCommand
+
+from core.images import VARIANTS_DIR, variant_names
+from core.models import Coach, Player
+from core.pdf import REPORT_THUMBNAIL_DIR
+
+
+class Command(BaseCommand):
+    help = "Delete photo files (and their derivatives) that no player or coach references any more"
+
+    def add_arguments(self, parser):
+        parser.add_argument("--dry-run", action="store_true", help="Only list what would be deleted")
+        parser.add_argument(
+            "--min-age",
+            type=int,
+            default=3600,
+            help="Keep files younger than this many seconds (uploads whose row is not committed yet)",
+        )
+        parser.add_argument(
+            "--report-thumbnails",
+            action="store_true",
+            help="Also clear the PDF report thumbnail cache (rebuilt on demand)",
+        )
+
+    def handle(self, *args, **options):
+        referenced = set()
+        for model in (Player, Coach):
+            names = model.objects.exclude(photo="").exclude(photo__isnull=True).values_list("photo", flat=True).distinct()
+            for name in names.iterator(chunk_size=2000):
+                referenced.add(name)
+                referenced.update(variant_names(name))
+
+        media_root = Path(settings.MEDIA_ROOT)
+        hashed_dirs = getattr(default_storage, "hashed_dirs", settings.MEDIA_HASHED_DIRS)
+        directories = [media_root / d for d in hashed_dirs] + [media_root / d / VARIANTS_DIR for d in hashed_dirs]
+        cutoff = time.time() - options["min_age"]
+
+        removed = freed = 0
+        for directory in directories:
+            if not directory.is_dir():
+                continue
+            for path in directory.iterdir():
+                if not path.is_file():
+                    continue
+                name = path.relative_to(media_root).as_posix()
+                stat = path.stat()
+                if name in referenced or stat.st_mtime > cutoff:
+                    continue
+                removed += 1
+                freed += stat.st_size
+                self.stdout.write(f"{'Would delete' if options['dry_run'] else 'Deleting'} {name}")
+                if not options["dry_run"]:
+                    path.unlink(missing_ok=True)
+
+        if options["report_thumbnails"]:
+            cache_dir = media_root / REPORT_THUMBNAIL_DIR
+            if cache_dir.is_dir():
+                for path in cache_dir.iterdir():
+                    if path.is_file() and path.stat().st_mtime <= cutoff:
+                        removed += 1
+                        freed += path.stat().st_size
+                        if not options["dry_run"]:
+                            path.unlink(missing_ok=True)
+
+        verb = "Would free" if options["dry_run"] else "Freed"
+        self.stdout.write(self.style.SUCCESS(f"{verb} {freed / 1024:.0f} KiB in {removed} file(s)"))
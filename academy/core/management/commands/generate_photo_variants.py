@@ -0,0 +1,48 @@
+from django.core.management.base import BaseCommand
+
+from core.images import generate_photo_variants, has_photo_variants, normalize_photo
+from core.models import Coach, Player
+
+
+class Command(BaseCommand):
+    help = "Backfill thumbnails and compressed variants for existing player and coach photos"
+
+    def add_arguments(self, parser):
+        parser.add_argument("--force", action="store_true", help="Regenerate variants even when they already exist")
+        parser.add_argument(
+            "--normalize-originals",
+            action="store_true",
+            help="Also rewrite originals: apply EXIF orientation, strip metadata and cap dimensions",
+        )
+
+    def handle(self, *args, **options):
+        for model in (Player, Coach):
+            done = skipped = failed = 0
+            qs = model.objects.exclude(photo="").exclude(photo__isnull=True).only("id", "photo").order_by("id")
+            for obj in qs.iterator(chunk_size=500):
+                if not options["force"] and not options["normalize_originals"] and has_photo_variants(obj.photo):
+                    skipped += 1
+                    continue
+                try:
+                    if options["normalize_originals"]:
+                        self._normalize_original(model, obj)
+                    generate_photo_variants(obj.photo)
+                    done += 1
+                except Exception as exc:
+                    failed += 1
+                    self.stderr.write(f"{model.__name__} {obj.pk}: {obj.photo.name}: {exc}")
+            self.stdout.write(self.style.SUCCESS(
+                f"{model.__name__}: {done} processed, {skipped} already up to date, {failed} failed"
+            ))
+
+    def _normalize_original(self, model, obj):
+        old_name = obj.photo.name
+        storage = obj.photo.storage
+        with storage.open(old_name, "rb") as fh:
+            cleaned = normalize_photo(fh)
+        cleaned.name = old_name.rsplit("/", 1)[-1].rsplit(".", 1)[0] + "." + cleaned.name.rsplit(".", 1)[-1]
+        obj.photo.save(cleaned.name, cleaned, save=False)
+        model.objects.filter(pk=obj.pk).update(photo=obj.photo.name)
+        # Deduplicated uploads share one file; it goes once nothing points at it (or later, with gc_media)
+        if obj.photo.name != old_name and not any(m.objects.filter(photo=old_name).exists() for m in (Player, Coach)):
+            storage.delete(old_name)
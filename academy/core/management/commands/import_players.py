@@ -0,0 +1,66 @@
+import sys
+
+from django.contrib.auth.models import User
+from django.core.management.base import BaseCommand, CommandError
+
+from core.importing import PlayerImporter, open_csv
+from core.models import Academy
+
+
+class Command(BaseCommand):
+    help = "Create or update players and their evaluations from a CSV file (the export_academy columns)"
+
+    def add_arguments(self, parser):
+        parser.add_argument("path", help="CSV file to import, or - for standard input")
+        parser.add_argument("--dry-run", action="store_true", help="Validate every row and report errors without writing")
+        parser.add_argument("--skip-invalid", action="store_true", help="Import the valid rows even if some are invalid")
+        parser.add_argument("--coach", help="Import as this coach's username (only their groups are allowed)")
+        parser.add_argument("--academy", help="Slug of the academy whose groups rows go into (default: the default academy)")
+        parser.add_argument("--batch-size", type=int, help="Rows written per bulk insert")
+
+    def handle(self, *args, **options):
+        academy = None
+        if options["academy"]:
+            academy = Academy.objects.filter(slug=options["academy"]).first()
+            if academy is None:
+                raise CommandError(f"Academy not found: {options['academy']}")
+        coach = None
+        if options["coach"]:
+            user = User.objects.filter(username=options["coach"]).select_related("coach_profile").first()
+            coach = getattr(user, "coach_profile", None)
+            if coach is None or (academy is not None and coach.academy_id != academy.id):
+                raise CommandError(f"Coach not found: {options['coach']}")
+
+        importer = PlayerImporter(
+            academy=academy,
+            coach=coach,
+            dry_run=options["dry_run"],
+            skip_invalid=options["skip_invalid"],
+            batch_size=options["batch_size"],
+        )
+        path = options["path"]
+        try:
+            if path == "-":
+                report = importer.run(open_csv(sys.stdin.buffer))
+            else:
+                with open(path, "rb") as source:
+                    report = importer.run(open_csv(source))
+        except (OSError, ValueError) as exc:
+            raise CommandError(str(exc))
+
+        for error in report.errors:
+            fields = "; ".join(f"{field}: {' '.join(messages)}" for field, messages in error["errors"].items())
+            self.stderr.write(f"line {error['line']}: {fields}")
+        if report.error_count > len(report.errors):
+            self.stderr.write(f"... and {report.error_count - len(report.errors)} more errors")
+
+        summary = (
+            f"{report.rows} rows: {report.created} created, {report.updated} updated, "
+            f"{report.evaluations} evaluations, {report.error_count} invalid"
+        )
+        if report.dry_run:
+            self.stdout.write(f"Dry run, nothing written. {summary}")
+        elif report.imported:
+            self.stdout.write(self.style.SUCCESS(f"Imported. {summary}"))
+        else:
+            raise CommandError(f"Nothing imported (use --skip-invalid to import the valid rows). {summary}")
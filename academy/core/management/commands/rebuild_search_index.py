@@ -0,0 +1,14 @@
+import time
+
+from django.core.management.base import BaseCommand
+
+from core.search import rebuild
+
+
+class Command(BaseCommand):
+    help = "Rewrite the search entries of every player, group and coach (after bulk changes made outside the app)"
+
+    def handle(self, *args, **options):
+        started = time.perf_counter()
+        written = rebuild()
+        self.stdout.write(self.style.SUCCESS(f"Indexed {written} names in {time.perf_counter() - started:.1f}s"))
@@ -0,0 +1,29 @@
+from datetime import date
+
+from django.core.management.base import BaseCommand, CommandError
+
+from core.ages import age_expression, refresh_ages
+from core.models import Player
+
+
+class Command(BaseCommand):
+    help = "Recompute the stored age of every player with a birth date, in one UPDATE (run daily)"
+
+    def add_arguments(self, parser):
+        parser.add_argument("--date", help="Compute ages on this date (YYYY-MM-DD) instead of today")
+        parser.add_argument("--dry-run", action="store_true", help="Only count the stale ages")
+
+    def handle(self, *args, **options):
+        on = None
+        if options["date"]:
+            try:
+                on = date.fromisoformat(options["date"])
+            except ValueError:
+                raise CommandError("Invalid --date; expected YYYY-MM-DD")
+
+        if options["dry_run"]:
+            stale = Player.objects.filter(birth_date__isnull=False).exclude(age=age_expression(on)).count()
+            self.stdout.write(f"{stale} stale ages")
+            return
+        updated = refresh_ages(Player.objects.all(), on)
+        self.stdout.write(self.style.SUCCESS(f"Updated {updated} ages"))
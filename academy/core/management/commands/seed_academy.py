@@ -1,17 +1,71 @@
-from django.core.management.base import BaseCommand
+import random
+import time
+from datetime import date
+
+from django.core.management.base import BaseCommand, CommandError
+from django.contrib.auth.hashers import make_password
 from django.contrib.auth.models import User
+from django.db import transaction
+
+from core import search
+from core.attendance import mask_from_days
+from core.history import snapshot_queryset
+from core.models import RATING_FIELDS, Academy, Coach, Group, Player, PlayerAttendance, PlayerEvaluation, Season, age_on
+
+
+FIRST_NAMES = [
+    "Adam", "Ahmed", "Ali", "Amir", "Ben", "Carlos", "Daniel", "David", "Elias", "Omar",
+    "Hassan", "Ibrahim", "Jack", "James", "Karim", "Leo", "Liam", "Lucas", "Mahmoud", "Mason",
+    "Mohamed", "Mostafa", "Noah", "Oliver", "Rami", "Samuel", "Theo", "Youssef", "Zain", "Ziad",
+]
+LAST_NAMES = [
+    "Abdallah", "Brown", "Clark", "Davis", "Farouk", "Garcia", "Hamdy", "Hassan", "Ibrahim", "Johnson",
+    "Khalil", "Lopez", "Mansour", "Martin", "Mostafa", "Nasser", "Osman", "Said", "Salem", "Smith",
+]
+SQUAD_NAMES = [
+    "Falcons", "Eagles", "Lions", "Tigers", "Hawks", "Sharks", "Wolves", "Panthers", "Cobras", "Stallions",
+]
+
+# Three sessions a week; a player attending n sessions in a month gets the first n
+SESSION_DAYS = (2, 5, 7, 9, 12, 14, 16, 19, 21, 23, 26, 28)
+
+# Synthetic coaches all share this password; hashing it once keeps seeding fast
+SYNTHETIC_PASSWORD = "coach123"
+
 
-from core.models import Coach, Group, Player, PlayerEvaluation
+def _shift_month(month: date, delta: int) -> date:
+    index = month.year * 12 + month.month - 1 + delta
+    return date(index // 12, index % 12 + 1, 1)
 
 
 class Command(BaseCommand):
-    help = "Seed sample data: admin, coach, group, players, evaluations"
+    help = (
+        "Seed sample data: admin, coach, group, players, evaluations. "
+        "With --players-per-group, generate a large deterministic synthetic academy instead."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--coaches", type=int, default=10, help="Synthetic coaches to create")
+        parser.add_argument("--groups", type=int, default=20, help="Synthetic groups (assigned to coaches round-robin)")
+        parser.add_argument("--players-per-group", type=int, help="Players per synthetic group; enables synthetic mode")
+        parser.add_argument("--months", type=int, default=12, help="Months of attendance history per player")
+        parser.add_argument("--seed", type=int, default=1, help="Random seed; the same seed yields the same academy")
+        parser.add_argument("--photos", action="store_true", help="Attach synthetic photos (a shared pool of images)")
+        parser.add_argument("--as-of", help="Reference date (YYYY-MM-DD) for ages and attendance months; default today")
+        parser.add_argument("--prefix", default="synthetic", help="Prefix for synthetic usernames and group names")
+        parser.add_argument("--batch-size", type=int, default=2000, help="Rows per insert batch")
+        parser.add_argument("--academy", help="Slug of the academy to seed synthetic data into (created if missing); default: the default academy")
 
     def handle(self, *args, **options):
+        self._seed_admin()
+        if options["players_per_group"] is not None:
+            self._seed_synthetic(options)
+        else:
+            self._seed_sample()
+
+    def _seed_admin(self):
         admin_username = "admin"
         admin_password = "admin123"
-        coach_username = "coach1"
-        coach_password = "coach123"
 
         # Admin user
         admin, created = User.objects.get_or_create(username=admin_username, defaults={
@@ -28,6 +82,10 @@ class Command(BaseCommand):
         else:
             self.stdout.write(self.style.WARNING(f"Admin user '{admin_username}' already exists"))
 
+    def _seed_sample(self):
+        coach_username = "coach1"
+        coach_password = "coach123"
+
         # Coach user and profile
         coach_user, created = User.objects.get_or_create(username=coach_username, defaults={
             "first_name": "Alex",
@@ -48,6 +106,7 @@ class Command(BaseCommand):
         # Group
         group, _ = Group.objects.get_or_create(
             name="U14 - Falcons",
+            academy_id=coach.academy_id,
             defaults={
                 "description": "Under-14 development squad",
                 "coach": coach,
@@ -161,4 +220,142 @@ class Command(BaseCommand):
         for p, r in zip(players, ratings):
             PlayerEvaluation.objects.get_or_create(player=p, defaults={**r, "coach": coach, "notes": "Weekly evaluation."})
 
-        self.stdout.write(self.style.SUCCESS("Seeding complete."))
\ No newline at end of file
+        self.stdout.write(self.style.SUCCESS("Seeding complete."))
+
+    def _seed_synthetic(self, options):
+        coaches_n, groups_n, per_group = options["coaches"], options["groups"], options["players_per_group"]
+        if coaches_n < 1 or groups_n < 1 or per_group < 0 or options["months"] < 0:
+            raise CommandError("--coaches and --groups must be >= 1; --players-per-group and --months >= 0")
+        try:
+            as_of = date.fromisoformat(options["as_of"]) if options["as_of"] else date.today()
+        except ValueError:
+            raise CommandError("--as-of must be YYYY-MM-DD")
+        prefix, seed, batch_size = options["prefix"], options["seed"], options["batch_size"]
+        if User.objects.filter(username__startswith=f"{prefix}-coach-").exists():
+            raise CommandError(f"Synthetic data with prefix '{prefix}' already exists; pick another --prefix")
+
+        started = time.perf_counter()
+        rng = random.Random(seed)
+        password = make_password(SYNTHETIC_PASSWORD, salt=f"seed{seed}")
+        photos = self._synthetic_photos(seed) if options["photos"] else []
+        # One transaction: an interrupted run leaves nothing behind
+        with transaction.atomic():
+            if options["academy"]:
+                academy, _ = Academy.objects.get_or_create(slug=options["academy"], defaults={"name": options["academy"]})
+            else:
+                academy = Academy.default()
+            users = User.objects.bulk_create(
+                [
+                    User(
+                        username=f"{prefix}-coach-{i + 1}",
+                        first_name=rng.choice(FIRST_NAMES),
+                        last_name=rng.choice(LAST_NAMES),
+                        email=f"{prefix}-coach-{i + 1}@example.com",
+                        password=password,
+                    )
+                    for i in range(coaches_n)
+                ],
+                batch_size=batch_size,
+            )
+            coaches = Coach.objects.bulk_create(
+                [Coach(user=u, bio="Synthetic coach.", phone=f"555-{rng.randrange(10000):04d}", academy=academy) for u in users],
+                batch_size=batch_size,
+            )
+            season = Season.active()
+            groups = []
+            for i in range(groups_n):
+                under = 8 + 2 * (i % 6)
+                groups.append(Group(
+                    name=f"{prefix} U{under} - {SQUAD_NAMES[i % len(SQUAD_NAMES)]} {i + 1}",
+                    description=f"Under-{under} synthetic squad",
+                    coach=coaches[i % coaches_n],
+                    season=season,
+                    academy=academy,
+                ))
+            groups = Group.objects.bulk_create(groups, batch_size=batch_size)
+            # Bulk writes send no signals, so the search entries are written here (players per chunk)
+            search.index(Coach.objects.filter(pk__in=[coach.pk for coach in coaches]))
+            search.index(Group.objects.filter(pk__in=[group.pk for group in groups]))
+
+            months = [_shift_month(date(as_of.year, as_of.month, 1), -m) for m in range(options["months"])]
+
+            # Groups are built in chunks of roughly batch_size players, so memory stays flat
+            chunk = max(1, batch_size // max(per_group, 1))
+            totals = {"players": 0, "evaluations": 0, "attendance": 0}
+            for start in range(0, groups_n, chunk):
+                for key, count in self._seed_group_chunk(groups[start:start + chunk], start, per_group, months, photos,
+                                                         as_of, seed, batch_size).items():
+                    totals[key] += count
+
+        elapsed = time.perf_counter() - started
+        self.stdout.write(self.style.SUCCESS(
+            f"Seeded {coaches_n} coaches, {groups_n} groups, {totals['players']} players, "
+            f"{totals['evaluations']} evaluations and {totals['attendance']} attendance records in {elapsed:.1f}s"
+        ))
+
+    def _seed_group_chunk(self, groups, first_index, per_group, months, photos, as_of, seed, batch_size):
+        # bulk_create skips Model.save(), so the season, academy and age it would set are given here
+        players, generated = [], []
+        for offset, group in enumerate(groups):
+            # One generator per group keeps the output independent of chunking
+            rng = random.Random(f"{seed}:{first_index + offset}")
+            under = int(group.name.split(" U", 1)[1].split(" ", 1)[0])
+            for _ in range(per_group):
+                birth_date = date(as_of.year - under + rng.randint(0, 1), rng.randint(1, 12), rng.randint(1, 28))
+                players.append(Player(
+                    group=group,
+                    season_id=group.season_id,
+                    academy_id=group.academy_id,
+                    name=f"{rng.choice(FIRST_NAMES)} {rng.choice(LAST_NAMES)}",
+                    photo=photos[rng.randrange(len(photos))] if photos else "",
+                    birth_date=birth_date,
+                    age=age_on(birth_date, as_of),
+                    phone=f"01{rng.randrange(10 ** 9):09d}",
+                    attendance_days=rng.randint(0, 40),
+                ))
+                # A per-player base level so ratings are correlated like real evaluations
+                base = 1.5 + 3 * rng.random()
+                ratings = [min(5, max(1, round(rng.gauss(base, 0.7)))) for _ in RATING_FIELDS]
+                # Sessions attended out of ~12 per month, around a per-player reliability
+                reliability = 6 + 6 * rng.random()
+                days = [min(12, max(0, round(rng.gauss(reliability, 1.5)))) for _ in months]
+                generated.append((group.coach_id, ratings, days))
+        players = Player.objects.bulk_create(players, batch_size=batch_size)
+
+        evaluations, attendance = [], []
+        for player, (coach_id, ratings, days) in zip(players, generated):
+            evaluations.append(PlayerEvaluation(
+                player=player, coach_id=coach_id, academy_id=player.academy_id, **dict(zip(RATING_FIELDS, ratings))
+            ))
+            attendance.extend(
+                PlayerAttendance(player=player, academy_id=player.academy_id, month=month, days=d, day_mask=mask_from_days(SESSION_DAYS[:d]))
+                for month, d in zip(months, days)
+            )
+        PlayerEvaluation.objects.bulk_create(evaluations, batch_size=batch_size)
+        PlayerAttendance.objects.bulk_create(attendance, batch_size=batch_size)
+        # Bulk writes send no signals: the first history point and the search entries are written here
+        snapshot_queryset(PlayerEvaluation.objects.filter(player__group__in=groups), "initial")
+        search.index(Player.objects.filter(group__in=groups), batch_size=batch_size)
+        return {"players": len(players), "evaluations": len(evaluations), "attendance": len(attendance)}
+
+    def _synthetic_photos(self, seed, count=24):
+        """Store a small pool of generated photos (with derivatives) shared by all players."""
+        from io import BytesIO
+
+        from django.core.files.base import ContentFile
+        from django.core.files.storage import default_storage
+        from PIL import Image
+
+        from core.images import generate_photo_variants
+
+        rng = random.Random(f"{seed}:photos")
+        names = []
+        for i in range(count):
+            img = Image.new("RGB", (480, 480), tuple(rng.randrange(256) for _ in range(3)))
+            img.paste(tuple(rng.randrange(256) for _ in range(3)), (120, 80, 360, 400))
+            out = BytesIO()
+            img.save(out, "JPEG", quality=85)
+            name = default_storage.save(f"player_photos/synthetic_{i}.jpg", ContentFile(out.getvalue()))
+            generate_photo_variants(Player(photo=name).photo)
+            names.append(name)
+        return names
@@ -0,0 +1,37 @@
+from datetime import date
+
+from django.core.management.base import BaseCommand, CommandError
+
+from core.models import Season
+from core.seasons import start_season
+
+
+class Command(BaseCommand):
+    help = "Start a new season and make it the active one, optionally moving the current groups and players into it"
+
+    def add_arguments(self, parser):
+        parser.add_argument("name", help="Season name, e.g. 2026/27")
+        parser.add_argument("--starts-on", required=True, help="First day (YYYY-MM-DD)")
+        parser.add_argument("--ends-on", required=True, help="Last day (YYYY-MM-DD)")
+        parser.add_argument(
+            "--carry-over",
+            action="store_true",
+            help="Move the current groups and players into the new season, leaving the previous one empty",
+        )
+
+    def handle(self, *args, **options):
+        try:
+            starts_on = date.fromisoformat(options["starts_on"])
+            ends_on = date.fromisoformat(options["ends_on"])
+        except ValueError:
+            raise CommandError("--starts-on and --ends-on must be YYYY-MM-DD")
+        if ends_on < starts_on:
+            raise CommandError("--ends-on must not be before --starts-on")
+        if Season.objects.filter(name=options["name"]).exists():
+            raise CommandError(f"Season {options['name']!r} already exists")
+
+        try:
+            season, groups, players = start_season(options["name"], starts_on, ends_on, carry_over=options["carry_over"])
+        except ValueError as exc:
+            raise CommandError(str(exc))
+        self.stdout.write(self.style.SUCCESS(f"{season} is now active; carried over {groups} groups and {players} players"))
@@ -0,0 +1,17 @@
+from django.core.management.base import BaseCommand
+
+from core.warmup import WARMUP_STEPS, warm_up
+
+
+class Command(BaseCommand):
+    help = "Pre-load the URL resolver, report fonts, styles and imaging libraries, and report how long each took"
+
+    def add_arguments(self, parser):
+        parser.add_argument("--steps", nargs="+", choices=list(WARMUP_STEPS), help="Only run these steps")
+
+    def handle(self, *args, **options):
+        total = 0.0
+        for name, seconds in warm_up(options["steps"]):
+            total += seconds
+            self.stdout.write(f"{name:<10} {seconds * 1000:8.1f} ms")
+        self.stdout.write(self.style.SUCCESS(f"Warm-up finished in {total * 1000:.1f} ms"))
@@ -0,0 +1,90 @@
+"""Prometheus metrics for the API, PDF rendering and caches.
+
+With ``PROMETHEUS_MULTIPROC_DIR`` set in the environment (before the process
+starts), every worker writes its samples to memory-mapped files in that
+directory and ``/metrics`` aggregates them, so any worker can answer a scrape.
+"""
+import os
+
+from prometheus_client import CONTENT_TYPE_LATEST, REGISTRY, CollectorRegistry, Counter, Histogram, generate_latest, multiprocess
+from prometheus_client.core import GaugeMetricFamily
+
+
+REQUEST_LATENCY = Histogram(
+    "academy_http_request_duration_seconds",
+    "Time spent handling a request, by route (URL name) and method.",
+    ["route", "method"],
+    buckets=(0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30),
+)
+REQUESTS = Counter(
+    "academy_http_requests_total",
+    "Requests handled, by route (URL name), method and status code.",
+    ["route", "method", "status"],
+)
+REQUEST_QUERIES = Histogram(
+    "academy_http_request_db_queries",
+    "SQL statements executed per request, by route (URL name).",
+    ["route"],
+    buckets=(0, 1, 2, 5, 10, 20, 50, 100, 200, 500, 1000),
+)
+PDF_RENDER_SECONDS = Histogram(
+    "academy_pdf_render_duration_seconds",
+    "Time spent rendering a PDF report, by report type.",
+    ["report"],
+    buckets=(0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30, 60, 120),
+)
+PDF_SIZE_BYTES = Histogram(
+    "academy_pdf_size_bytes",
+    "Size of rendered PDF reports, by report type.",
+    ["report"],
+    buckets=(10e3, 50e3, 100e3, 250e3, 500e3, 1e6, 5e6, 10e6, 50e6, 100e6),
+)
+CACHE_REQUESTS = Counter(
+    "academy_cache_requests_total",
+    "Cache lookups by cache and result (hit or miss); hit ratio = hit / (hit + miss).",
+    ["cache", "result"],
+)
+
+
+def observe_request(route: str, method: str, status: int, seconds: float, queries: int | None = None):
+    REQUEST_LATENCY.labels(route, method).observe(seconds)
+    REQUESTS.labels(route, method, str(status)).inc()
+    if queries is not None:
+        REQUEST_QUERIES.labels(route).observe(queries)
+
+
+def observe_pdf(report: str, seconds: float, size: int):
+    PDF_RENDER_SECONDS.labels(report).observe(seconds)
+    PDF_SIZE_BYTES.labels(report).observe(size)
+
+
+def cache_lookup(cache: str, hit: bool):
+    CACHE_REQUESTS.labels(cache, "hit" if hit else "miss").inc()
+
+
+class DomainCollector:
+    """Current number of groups, players and evaluations, counted at scrape time."""
+
+    def collect(self):
+        from .models import Group, Player, PlayerEvaluation
+
+        for name, model in (("groups", Group), ("players", Player), ("evaluations", PlayerEvaluation)):
+            yield GaugeMetricFamily(f"academy_{name}", f"Number of {name}.", value=model.objects.count())
+
+
+class _ProcessCollector:
+    """This process's own samples (the default registry) when not in multiprocess mode."""
+
+    def collect(self):
+        return REGISTRY.collect()
+
+
+def render_metrics() -> tuple[bytes, str]:
+    """Return the Prometheus text exposition of every metric and its content type."""
+    registry = CollectorRegistry()
+    if os.environ.get("PROMETHEUS_MULTIPROC_DIR"):
+        multiprocess.MultiProcessCollector(registry)
+    else:
+        registry.register(_ProcessCollector())
+    registry.register(DomainCollector())
+    return generate_latest(registry), CONTENT_TYPE_LATEST
@@ -0,0 +1,141 @@
+import json
+import logging
+import time
+from contextlib import ExitStack
+
+from django.conf import settings
+from django.core.exceptions import MiddlewareNotUsed
+from django.db import connections
+
+from . import replicas
+from .metrics import observe_request
+from .perf import QueryRecorder, RequestMetrics, activate, current_metrics, deactivate
+
+
+logger = logging.getLogger("core.perf")
+slow_logger = logging.getLogger("core.perf.slow")
+
+
+class PerformanceMiddleware:
+    """Break every request down into SQL, serialization, rendering, PDF and auth time.
+
+    The breakdown is logged as one JSON line to ``core.perf`` (INFO) and returned
+    in a ``Server-Timing`` header to staff users, or to everyone with
+    ``PERF_SERVER_TIMING`` (default: ``DEBUG``). Requests slower than ``PERF_SLOW_REQUEST_MS`` are
+    logged to ``core.perf.slow`` (WARNING) with their slowest SQL statements.
+    Phases can overlap: SQL issued while serializing counts towards both.
+    """
+
+    def __init__(self, get_response):
+        if not getattr(settings, "PERF_INSTRUMENTATION", True):
+            raise MiddlewareNotUsed()
+        self.get_response = get_response
+        self.slow_ms = getattr(settings, "PERF_SLOW_REQUEST_MS", 500)
+        self.top_queries = getattr(settings, "PERF_SLOW_TOP_QUERIES", 5)
+
+    def __call__(self, request):
+        metrics = RequestMetrics(keep_queries=self.top_queries)
+        token = activate(metrics)
+        try:
+            with ExitStack() as stack:
+                recorder = QueryRecorder(metrics)
+                for connection in connections.all():
+                    stack.enter_context(connection.execute_wrapper(recorder))
+                response = self.get_response(request)
+        finally:
+            deactivate(token)
+
+        total_ms = metrics.elapsed_ms
+        # Timings reveal query counts and costs, so other clients do not see them
+        user = getattr(request, "user", None)
+        if getattr(settings, "PERF_SERVER_TIMING", settings.DEBUG) or getattr(user, "is_staff", False):
+            response["Server-Timing"] = self.server_timing(metrics, total_ms)
+        if logger.isEnabledFor(logging.INFO):
+            logger.info(json.dumps(self.summary(request, response, metrics, total_ms)))
+        if total_ms >= self.slow_ms:
+            summary = self.summary(request, response, metrics, total_ms)
+            summary["top_queries"] = [{"ms": round(ms, 2), "sql": sql[:1000]} for ms, sql in metrics.top_queries()]
+            slow_logger.warning(json.dumps(summary))
+        return response
+
+    def process_template_response(self, request, response):
+        # Called right before DRF/template responses are rendered
+        metrics = current_metrics()
+        if metrics is not None:
+            started = time.perf_counter()
+            response.add_post_render_callback(lambda _: metrics.add("render", (time.perf_counter() - started) * 1000))
+        return response
+
+    @staticmethod
+    def server_timing(metrics, total_ms) -> str:
+        parts = [f'db;dur={metrics.db_ms:.1f};desc="{metrics.db_count} queries"']
+        parts += [f"{name};dur={ms:.1f}" for name, ms in metrics.timings.items()]
+        parts.append(f"total;dur={total_ms:.1f}")
+        return ", ".join(parts)
+
+    @staticmethod
+    def summary(request, response, metrics, total_ms) -> dict:
+        return {
+            "method": request.method,
+            "path": request.path,
+            "status": response.status_code,
+            "total_ms": round(total_ms, 2),
+            "db_queries": metrics.db_count,
+            "db_ms": round(metrics.db_ms, 2),
+            **{f"{name}_ms": round(ms, 2) for name, ms in metrics.timings.items()},
+        }
+
+
+class MetricsMiddleware:
+    """Record Prometheus request latency, status and SQL query count per route.
+
+    Routes are labelled by URL name (e.g. ``group-detail``) to keep cardinality
+    bounded. Query counts come from ``PerformanceMiddleware`` when it is enabled.
+    """
+
+    def __init__(self, get_response):
+        if not getattr(settings, "METRICS_ENABLED", False):
+            raise MiddlewareNotUsed()
+        self.get_response = get_response
+
+    def __call__(self, request):
+        started = time.perf_counter()
+        response = self.get_response(request)
+        match = getattr(request, "resolver_match", None)
+        route = (match.view_name or match.url_name or "unnamed") if match else "unmatched"
+        perf = current_metrics()
+        observe_request(
+            route,
+            request.method,
+            response.status_code,
+            time.perf_counter() - started,
+            perf.db_count if perf is not None else None,
+        )
+        return response
+
+
+class ReplicaReadMiddleware:
+    """Send safe-method API reads to a read replica (core/replicas.py), unless the client has just written.
+
+    Not installed unless ``DATABASE_REPLICAS`` lists replicas.
+    """
+
+    def __init__(self, get_response):
+        if not replicas.replicas():
+            raise MiddlewareNotUsed()
+        self.get_response = get_response
+
+    def __call__(self, request):
+        key = replicas.client_key(request)
+        alias = replicas.read_alias_for(request, key)
+        token = replicas.use_replica(alias)
+        try:
+            response = self.get_response(request)
+        finally:
+            replicas.reset(token)
+        if response.streaming and alias is not None:
+            # Streamed bodies query while they are sent, after this returns
+            response.streaming_content = replicas.iterate_on(alias, response.streaming_content)
+        if request.method not in replicas.SAFE_METHODS and key is not None:
+            replicas.pin_to_primary(key)
+        return response
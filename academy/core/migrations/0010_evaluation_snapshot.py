@@ -0,0 +1,89 @@
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+RATING_FIELDS = [
+    "ball_control", "passing", "dribbling", "shooting", "using_both_feet",
+    "speed", "agility", "endurance", "strength",
+    "positioning", "decision_making", "game_awareness", "teamwork",
+    "respect", "sportsmanship", "confidence", "leadership",
+    "attendance_and_punctuality",
+]
+
+
+def backfill_snapshots(apps, schema_editor):
+    """Start every existing evaluation's history with its current ratings."""
+    PlayerEvaluation = apps.get_model("core", "PlayerEvaluation")
+    EvaluationSnapshot = apps.get_model("core", "EvaluationSnapshot")
+    rows = PlayerEvaluation.objects.values("player_id", "player__group_id", "coach_id", "updated_at", *RATING_FIELDS)
+    batch = []
+    for row in rows.iterator(chunk_size=2000):
+        skills = [row[f] for f in RATING_FIELDS[:-1] if row[f] is not None]
+        batch.append(
+            EvaluationSnapshot(
+                player_id=row["player_id"],
+                group_id=row["player__group_id"],
+                coach_id=row["coach_id"],
+                reason="initial",
+                created_at=row["updated_at"],
+                average_rating=round(sum(skills) / len(skills), 2) if skills else None,
+                **{f: row[f] for f in RATING_FIELDS},
+            )
+        )
+        if len(batch) >= 2000:
+            EvaluationSnapshot.objects.bulk_create(batch)
+            batch = []
+    EvaluationSnapshot.objects.bulk_create(batch)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("core", "0009_change_group_coach_to_foreignkey"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="EvaluationSnapshot",
+            fields=[
+                ("id", models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name="ID")),
+                ("reason", models.CharField(choices=[("initial", "Initial"), ("save", "Save"), ("reset", "Reset"), ("import", "Import")], max_length=10)),
+                ("created_at", models.DateTimeField()),
+                *((field, models.PositiveSmallIntegerField(blank=True, null=True)) for field in RATING_FIELDS),
+                ("average_rating", models.FloatField(blank=True, null=True)),
+                (
+                    "coach",
+                    models.ForeignKey(
+                        blank=True,
+                        null=True,
+                        on_delete=django.db.models.deletion.SET_NULL,
+                        related_name="evaluation_snapshots",
+                        to="core.coach",
+                    ),
+                ),
+                (
+                    "group",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="evaluation_snapshots",
+                        to="core.group",
+                    ),
+                ),
+                (
+                    "player",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="evaluation_snapshots",
+                        to="core.player",
+                    ),
+                ),
+            ],
+            options={
+                "indexes": [
+                    models.Index(fields=["player", "created_at"], name="snapshot_player_time"),
+                    models.Index(fields=["group", "created_at"], name="snapshot_group_time"),
+                ],
+            },
+        ),
+        migrations.RunPython(backfill_snapshots, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,16 @@
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("core", "0010_evaluation_snapshot"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="playerattendance",
+            name="day_mask",
+            field=models.PositiveIntegerField(default=0),
+        ),
+    ]
@@ -0,0 +1,46 @@
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("core", "0011_playerattendance_day_mask"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="TrainingSchedule",
+            fields=[
+                ("id", models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name="ID")),
+                ("weekday", models.PositiveSmallIntegerField(choices=[(0, "Monday"), (1, "Tuesday"), (2, "Wednesday"), (3, "Thursday"), (4, "Friday"), (5, "Saturday"), (6, "Sunday")])),
+                ("start_time", models.TimeField()),
+                ("duration_minutes", models.PositiveSmallIntegerField(default=90)),
+                ("location", models.CharField(blank=True, max_length=120)),
+                ("starts_on", models.DateField()),
+                ("ends_on", models.DateField(blank=True, null=True)),
+                ("expanded_until", models.DateField(blank=True, editable=False, null=True)),
+                ("group", models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name="schedules", to="core.group")),
+            ],
+        ),
+        migrations.CreateModel(
+            name="TrainingSession",
+            fields=[
+                ("id", models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name="ID")),
+                ("date", models.DateField()),
+                ("start_time", models.TimeField()),
+                ("duration_minutes", models.PositiveSmallIntegerField(default=90)),
+                ("location", models.CharField(blank=True, max_length=120)),
+                ("cancelled", models.BooleanField(default=False)),
+                ("notes", models.TextField(blank=True)),
+                ("detached", models.BooleanField(default=False, editable=False)),
+                ("group", models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name="sessions", to="core.group")),
+                ("schedule", models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name="sessions", to="core.trainingschedule")),
+            ],
+            options={
+                "ordering": ["date", "start_time"],
+                "indexes": [models.Index(fields=["group", "date"], name="session_group_date")],
+                "constraints": [models.UniqueConstraint(fields=("schedule", "date"), name="unique_schedule_occurrence")],
+            },
+        ),
+    ]
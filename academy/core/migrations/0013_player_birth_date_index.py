@@ -0,0 +1,16 @@
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("core", "0012_training_sessions"),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name="player",
+            name="birth_date",
+            field=models.DateField(blank=True, db_index=True, null=True),
+        ),
+    ]
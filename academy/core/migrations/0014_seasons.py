@@ -0,0 +1,177 @@
+from datetime import date, timedelta
+
+from django.conf import settings
+from django.db import migrations, models
+from django.utils import timezone
+import django.db.models.deletion
+
+# Only for the season fields' default, which a migration can refer to by import path alone
+import core.models
+
+
+def initial_season_dates(today):
+    """Season.default_dates() as of this migration: the year from the latest SEASON_AGE_CUTOFF, and its name."""
+    month, day = (int(part) for part in getattr(settings, "SEASON_AGE_CUTOFF", "01-01").split("-"))
+    starts_on = date(today.year, month, day)
+    if starts_on > today:
+        starts_on = starts_on.replace(year=today.year - 1)
+    try:
+        next_start = starts_on.replace(year=starts_on.year + 1)
+    except ValueError:
+        next_start = starts_on.replace(year=starts_on.year + 1, day=28)
+    ends_on = next_start - timedelta(days=1)
+    name = str(starts_on.year) if ends_on.year == starts_on.year else f"{starts_on.year}/{ends_on.year % 100:02d}"
+    return name, starts_on, ends_on
+
+
+def assign_initial_season(apps, schema_editor):
+    """Put every existing group and player in one active season with the default dates."""
+    Season = apps.get_model("core", "Season")
+    Group = apps.get_model("core", "Group")
+    Player = apps.get_model("core", "Player")
+    name, starts_on, ends_on = initial_season_dates(timezone.localdate())
+    season = Season.objects.create(name=name, starts_on=starts_on, ends_on=ends_on, is_active=True)
+    Group.objects.update(season=season)
+    Player.objects.update(season=season)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("core", "0013_player_birth_date_index"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="Season",
+            fields=[
+                ("id", models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name="ID")),
+                ("name", models.CharField(max_length=50, unique=True)),
+                ("starts_on", models.DateField()),
+                ("ends_on", models.DateField()),
+                ("is_active", models.BooleanField(default=False, editable=False)),
+                ("archived_at", models.DateTimeField(blank=True, editable=False, null=True)),
+            ],
+            options={
+                "ordering": ["-starts_on"],
+                "constraints": [
+                    models.UniqueConstraint(condition=models.Q(("is_active", True)), fields=("is_active",), name="one_active_season")
+                ],
+            },
+        ),
+        migrations.AddField(
+            model_name="group",
+            name="season",
+            field=models.ForeignKey(
+                editable=False,
+                null=True,
+                on_delete=django.db.models.deletion.PROTECT,
+                related_name="groups",
+                to="core.season",
+            ),
+        ),
+        migrations.AddField(
+            model_name="player",
+            name="season",
+            field=models.ForeignKey(
+                db_index=False,
+                editable=False,
+                null=True,
+                on_delete=django.db.models.deletion.PROTECT,
+                related_name="players",
+                to="core.season",
+            ),
+        ),
+        migrations.RunPython(assign_initial_season, migrations.RunPython.noop),
+        migrations.AlterField(
+            model_name="group",
+            name="season",
+            field=models.ForeignKey(
+                default=core.models.active_season_id,
+                editable=False,
+                on_delete=django.db.models.deletion.PROTECT,
+                related_name="groups",
+                to="core.season",
+            ),
+        ),
+        migrations.AlterField(
+            model_name="player",
+            name="season",
+            field=models.ForeignKey(
+                db_index=False,
+                editable=False,
+                on_delete=django.db.models.deletion.PROTECT,
+                related_name="players",
+                to="core.season",
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="player",
+            index=models.Index(fields=["season", "group"], name="player_season_group"),
+        ),
+        migrations.CreateModel(
+            name="AttendanceArchive",
+            fields=[
+                ("id", models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name="ID")),
+                ("player_id", models.BigIntegerField()),
+                ("month", models.DateField()),
+                ("days", models.PositiveIntegerField(default=0)),
+                ("day_mask", models.PositiveIntegerField(default=0)),
+                (
+                    "season",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE, related_name="attendance_archive", to="core.season"
+                    ),
+                ),
+            ],
+            options={
+                "indexes": [models.Index(fields=["player_id", "month"], name="attendance_archive_player")],
+            },
+        ),
+        migrations.CreateModel(
+            name="TrainingSessionArchive",
+            fields=[
+                ("id", models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name="ID")),
+                ("group_id", models.BigIntegerField()),
+                ("schedule_id", models.BigIntegerField(blank=True, null=True)),
+                ("date", models.DateField()),
+                ("start_time", models.TimeField()),
+                ("duration_minutes", models.PositiveSmallIntegerField(default=90)),
+                ("location", models.CharField(blank=True, max_length=120)),
+                ("cancelled", models.BooleanField(default=False)),
+                ("notes", models.TextField(blank=True)),
+                (
+                    "season",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE, related_name="session_archive", to="core.season"
+                    ),
+                ),
+            ],
+            options={
+                "indexes": [models.Index(fields=["group_id", "date"], name="session_archive_group_date")],
+            },
+        ),
+        migrations.CreateModel(
+            name="EvaluationRollup",
+            fields=[
+                ("id", models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name="ID")),
+                ("player_id", models.BigIntegerField()),
+                ("group_id", models.BigIntegerField()),
+                ("snapshots", models.PositiveIntegerField()),
+                ("first_at", models.DateTimeField()),
+                ("last_at", models.DateTimeField()),
+                ("average_rating", models.FloatField(blank=True, null=True)),
+                ("final_average_rating", models.FloatField(blank=True, null=True)),
+                ("final_ratings", models.JSONField(default=dict)),
+                (
+                    "season",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE, related_name="evaluation_rollups", to="core.season"
+                    ),
+                ),
+            ],
+            options={
+                "constraints": [models.UniqueConstraint(fields=("season", "player_id"), name="unique_season_rollup")],
+            },
+        ),
+    ]
@@ -0,0 +1,109 @@
+from django.db import migrations, models
+import django.db.models.deletion
+
+import core.models
+
+
+def assign_default_academy(apps, schema_editor):
+    """Put every existing coach, group, player, evaluation and attendance record in the default academy."""
+    Academy = apps.get_model("core", "Academy")
+    academy = Academy.objects.create(name="Main", slug="main", is_default=True)
+    for model in ("Coach", "Group", "Player", "PlayerEvaluation", "PlayerAttendance"):
+        apps.get_model("core", model).objects.update(academy=academy)
+
+
+def tenant_field(related_name, **kwargs):
+    return models.ForeignKey(
+        on_delete=django.db.models.deletion.PROTECT, related_name=related_name, to="core.academy", **kwargs
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("core", "0014_seasons"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="Academy",
+            fields=[
+                ("id", models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name="ID")),
+                ("name", models.CharField(max_length=100, unique=True)),
+                ("slug", models.SlugField(unique=True)),
+                ("domain", models.CharField(blank=True, db_index=True, max_length=255)),
+                ("is_default", models.BooleanField(default=False)),
+            ],
+            options={
+                "verbose_name_plural": "academies",
+                "constraints": [
+                    models.UniqueConstraint(condition=models.Q(("is_default", True)), fields=("is_default",), name="one_default_academy")
+                ],
+            },
+        ),
+        migrations.AddField(model_name="coach", name="academy", field=tenant_field("coaches", null=True)),
+        migrations.AddField(model_name="group", name="academy", field=tenant_field("groups", null=True, editable=False, db_index=False)),
+        migrations.AddField(model_name="player", name="academy", field=tenant_field("players", null=True, editable=False, db_index=False)),
+        migrations.AddField(
+            model_name="playerevaluation",
+            name="academy",
+            field=tenant_field("evaluations", null=True, editable=False, db_index=False),
+        ),
+        migrations.AddField(
+            model_name="playerattendance",
+            name="academy",
+            field=tenant_field("attendance_records", null=True, editable=False, db_index=False),
+        ),
+        migrations.RunPython(assign_default_academy, migrations.RunPython.noop),
+        migrations.AlterField(
+            model_name="coach",
+            name="academy",
+            field=tenant_field("coaches", default=core.models.default_academy_id),
+        ),
+        migrations.AlterField(
+            model_name="group",
+            name="academy",
+            field=tenant_field("groups", default=core.models.default_academy_id, editable=False, db_index=False),
+        ),
+        migrations.AlterField(model_name="player", name="academy", field=tenant_field("players", editable=False, db_index=False)),
+        migrations.AlterField(
+            model_name="playerevaluation",
+            name="academy",
+            field=tenant_field("evaluations", editable=False, db_index=False),
+        ),
+        migrations.AlterField(
+            model_name="playerattendance",
+            name="academy",
+            field=tenant_field("attendance_records", editable=False, db_index=False),
+        ),
+        # Group names are unique per academy; (academy, …) indexes lead every list
+        migrations.AlterField(
+            model_name="group",
+            name="name",
+            field=models.CharField(max_length=100),
+        ),
+        migrations.AddConstraint(
+            model_name="group",
+            constraint=models.UniqueConstraint(fields=("academy", "name"), name="unique_group_name_per_academy"),
+        ),
+        migrations.AddIndex(
+            model_name="group",
+            index=models.Index(fields=["academy", "season"], name="group_academy_season"),
+        ),
+        migrations.RemoveIndex(
+            model_name="player",
+            name="player_season_group",
+        ),
+        migrations.AddIndex(
+            model_name="player",
+            index=models.Index(fields=["academy", "season", "group"], name="player_academy_season_group"),
+        ),
+        migrations.AddIndex(
+            model_name="playerevaluation",
+            index=models.Index(fields=["academy", "player"], name="evaluation_academy_player"),
+        ),
+        migrations.AddIndex(
+            model_name="playerattendance",
+            index=models.Index(fields=["academy", "month"], name="attendance_academy_month"),
+        ),
+    ]
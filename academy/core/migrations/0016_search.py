@@ -0,0 +1,169 @@
+import re
+import unicodedata
+
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+# Copied from core/search.py as of this migration, so later changes there do not alter it
+FTS_TABLE = "core_search_fts"
+_ARABIC_FOLDS = str.maketrans({"ٱ": "ا", "ى": "ي", "ة": "ه"})
+_TATWEEL = "ـ"
+_WORD = re.compile(r"[^\W_]+")
+
+
+def normalize(text):
+    decomposed = unicodedata.normalize("NFKD", text.replace(_TATWEEL, ""))
+    stripped = "".join(ch for ch in decomposed if not unicodedata.combining(ch))
+    return " ".join(_WORD.findall(stripped.translate(_ARABIC_FOLDS).casefold()))
+
+
+# Entries mirrored into a contentless FTS5 table; the triggers pass the old
+# values back for deletes, which is all a contentless table needs.
+SQLITE_INDEX = [
+    f"""CREATE VIRTUAL TABLE {FTS_TABLE} USING fts5(
+        text, content='', prefix='1 2 3', tokenize='unicode61 remove_diacritics 2'
+    )""",
+    f"""CREATE TRIGGER core_searchentry_ai AFTER INSERT ON core_searchentry BEGIN
+        INSERT INTO {FTS_TABLE}(rowid, text) VALUES (new.id, new.text);
+    END""",
+    f"""CREATE TRIGGER core_searchentry_ad AFTER DELETE ON core_searchentry BEGIN
+        INSERT INTO {FTS_TABLE}({FTS_TABLE}, rowid, text) VALUES ('delete', old.id, old.text);
+    END""",
+    f"""CREATE TRIGGER core_searchentry_au AFTER UPDATE OF text ON core_searchentry WHEN old.text IS NOT new.text BEGIN
+        INSERT INTO {FTS_TABLE}({FTS_TABLE}, rowid, text) VALUES ('delete', old.id, old.text);
+        INSERT INTO {FTS_TABLE}(rowid, text) VALUES (new.id, new.text);
+    END""",
+]
+SQLITE_DROP = [
+    "DROP TRIGGER IF EXISTS core_searchentry_au",
+    "DROP TRIGGER IF EXISTS core_searchentry_ad",
+    "DROP TRIGGER IF EXISTS core_searchentry_ai",
+    f"DROP TABLE IF EXISTS {FTS_TABLE}",
+]
+POSTGRES_INDEX = ["CREATE INDEX search_entry_text_fts ON core_searchentry USING gin (to_tsvector('simple', text))"]
+POSTGRES_DROP = ["DROP INDEX IF EXISTS search_entry_text_fts"]
+
+
+def _sqlite_has_fts5(connection):
+    with connection.cursor() as cursor:
+        cursor.execute("PRAGMA compile_options")
+        return "ENABLE_FTS5" in {row[0] for row in cursor.fetchall()}
+
+
+def _run(schema_editor, statements):
+    for sql in statements:
+        schema_editor.execute(sql)
+
+
+def create_text_index(apps, schema_editor):
+    """The full-text index of the database in use (none elsewhere; search then falls back to LIKE)."""
+    connection = schema_editor.connection
+    if connection.vendor == "sqlite" and _sqlite_has_fts5(connection):
+        _run(schema_editor, SQLITE_INDEX)
+    elif connection.vendor == "postgresql":
+        _run(schema_editor, POSTGRES_INDEX)
+
+
+def drop_text_index(apps, schema_editor):
+    connection = schema_editor.connection
+    if connection.vendor == "sqlite":
+        _run(schema_editor, SQLITE_DROP)
+    elif connection.vendor == "postgresql":
+        _run(schema_editor, POSTGRES_DROP)
+
+
+def index_existing_rows(apps, schema_editor):
+    SearchEntry = apps.get_model("core", "SearchEntry")
+    Player = apps.get_model("core", "Player")
+    Group = apps.get_model("core", "Group")
+    Coach = apps.get_model("core", "Coach")
+    sources = [
+        (
+            "player",
+            Player.objects.values("id", "name", "academy_id", "season_id", "group_id", "group__coach_id"),
+            lambda row: (row["name"], normalize(row["name"]), row["season_id"], row["group__coach_id"], row["group_id"]),
+        ),
+        (
+            "group",
+            Group.objects.values("id", "name", "academy_id", "season_id", "coach_id"),
+            lambda row: (row["name"], normalize(row["name"]), row["season_id"], row["coach_id"], None),
+        ),
+        (
+            "coach",
+            Coach.objects.values("id", "academy_id", "user__username", "user__first_name", "user__last_name"),
+            lambda row: (
+                f"{row['user__first_name']} {row['user__last_name']}".strip() or row["user__username"],
+                normalize(f"{row['user__first_name']} {row['user__last_name']} {row['user__username']}"),
+                None,
+                row["id"],
+                None,
+            ),
+        ),
+    ]
+    for kind, rows, build in sources:
+        batch = []
+        for row in rows.order_by("id").iterator(chunk_size=2000):
+            name, text, season_id, coach_id, group_id = build(row)
+            batch.append(
+                SearchEntry(
+                    kind=kind,
+                    object_id=row["id"],
+                    academy_id=row["academy_id"],
+                    season_id=season_id,
+                    coach_id=coach_id,
+                    group_id=group_id,
+                    name=name,
+                    text=text,
+                )
+            )
+            if len(batch) >= 2000:
+                SearchEntry.objects.bulk_create(batch)
+                batch = []
+        SearchEntry.objects.bulk_create(batch)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("core", "0015_academies"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="SearchEntry",
+            fields=[
+                ("id", models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name="ID")),
+                (
+                    "kind",
+                    models.CharField(choices=[("player", "Player"), ("group", "Group"), ("coach", "Coach")], max_length=10),
+                ),
+                ("object_id", models.BigIntegerField()),
+                ("coach_id", models.BigIntegerField(null=True)),
+                ("group_id", models.BigIntegerField(null=True)),
+                ("name", models.CharField(max_length=255)),
+                ("text", models.TextField()),
+                (
+                    "academy",
+                    models.ForeignKey(
+                        db_index=False, on_delete=django.db.models.deletion.CASCADE, related_name="+", to="core.academy"
+                    ),
+                ),
+                (
+                    "season",
+                    models.ForeignKey(
+                        db_index=False,
+                        null=True,
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="+",
+                        to="core.season",
+                    ),
+                ),
+            ],
+            options={
+                "constraints": [models.UniqueConstraint(fields=("object_id", "kind"), name="unique_search_entry")],
+            },
+        ),
+        migrations.RunPython(create_text_index, drop_text_index),
+        migrations.RunPython(index_existing_rows, migrations.RunPython.noop),
+    ]
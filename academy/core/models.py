@@ -1,12 +1,61 @@
 from django.conf import settings
-from datetime import date
+from datetime import date, timedelta
 from django.contrib.auth.models import User
 from django.core.validators import MinValueValidator, MaxValueValidator
-from django.db import models
+from django.db import IntegrityError, models, transaction
+
+from .ages import season_cutoff, years_before
+
+
+def age_on(birth_date: date, today: date) -> int:
+    """Whole years between ``birth_date`` and ``today``."""
+    return today.year - birth_date.year - ((today.month, today.day) < (birth_date.month, birth_date.day))
+
+
+class Academy(models.Model):
+    """A branch of the academy; one deployment serves many (core/tenants.py).
+
+    Requests pick one with the ``X-Academy`` header (its slug) or their host
+    (``domain``); otherwise they get the default academy.
+    """
+
+    name = models.CharField(max_length=100, unique=True)
+    slug = models.SlugField(max_length=50, unique=True)
+    # Requests for this host name work in this academy
+    domain = models.CharField(max_length=255, blank=True, db_index=True)
+    is_default = models.BooleanField(default=False)
+
+    class Meta:
+        verbose_name_plural = "academies"
+        constraints = [
+            models.UniqueConstraint(fields=["is_default"], condition=models.Q(is_default=True), name="one_default_academy"),
+        ]
+
+    def __str__(self):
+        return self.name
+
+    @classmethod
+    def default(cls):
+        """The default academy, created when there is none."""
+        academy = cls.objects.filter(is_default=True).first()
+        if academy is None:
+            try:
+                with transaction.atomic():
+                    academy = cls.objects.create(name="Main", slug="main", is_default=True)
+            except IntegrityError:
+                # Created concurrently
+                academy = cls.objects.get(is_default=True)
+        return academy
+
+
+def default_academy_id():
+    return Academy.default().pk
 
 
 class Coach(models.Model):
     user = models.OneToOneField(User, on_delete=models.CASCADE, related_name="coach_profile")
+    # Coaches only ever see and work in their own academy
+    academy = models.ForeignKey(Academy, on_delete=models.PROTECT, related_name="coaches", default=default_academy_id)
     bio = models.TextField(blank=True)
     photo = models.ImageField(upload_to="coach_photos/", blank=True, null=True)
     phone = models.CharField(max_length=20, blank=True)
@@ -15,23 +64,93 @@ class Coach(models.Model):
         return self.user.get_full_name() or self.user.username
 
 
+class Season(models.Model):
+    """A season of training; groups and players belong to one, the active one by default (core/seasons.py)."""
+
+    name = models.CharField(max_length=50, unique=True)
+    starts_on = models.DateField()
+    ends_on = models.DateField()
+    # Changed by the start_season command, which also carries groups and players over
+    is_active = models.BooleanField(default=False, editable=False)
+    # Set once archive_season has moved the season's history out of the hot tables
+    archived_at = models.DateTimeField(null=True, blank=True, editable=False)
+
+    class Meta:
+        ordering = ["-starts_on"]
+        constraints = [
+            models.UniqueConstraint(fields=["is_active"], condition=models.Q(is_active=True), name="one_active_season"),
+        ]
+
+    def __str__(self):
+        return self.name
+
+    @classmethod
+    def default_dates(cls, today=None):
+        """The year starting at the latest ``SEASON_AGE_CUTOFF`` on or before ``today``, and its name."""
+        starts_on = season_cutoff(today)
+        ends_on = years_before(starts_on, -1) - timedelta(days=1)
+        name = str(starts_on.year) if ends_on.year == starts_on.year else f"{starts_on.year}/{ends_on.year % 100:02d}"
+        return name, starts_on, ends_on
+
+    @classmethod
+    def active(cls):
+        """The active season, created with the default dates when there is none."""
+        season = cls.objects.filter(is_active=True).first()
+        if season is None:
+            name, starts_on, ends_on = cls.default_dates()
+            try:
+                with transaction.atomic():
+                    season = cls.objects.create(name=name, starts_on=starts_on, ends_on=ends_on, is_active=True)
+            except IntegrityError:
+                # Created concurrently
+                season = cls.objects.get(is_active=True)
+        return season
+
+
+def active_season_id():
+    return Season.active().pk
+
+
 class Group(models.Model):
-    name = models.CharField(max_length=100, unique=True)
+    name = models.CharField(max_length=100)
     description = models.TextField(blank=True)
     coach = models.ForeignKey(Coach, on_delete=models.PROTECT, related_name="groups", null=True, blank=True)
+    # Moved to a new season (with its players) by start_season only
+    season = models.ForeignKey(Season, on_delete=models.PROTECT, related_name="groups", default=active_season_id, editable=False)
+    # The coach's academy, set when the group is created (the (academy, …) indexes lead every list)
+    academy = models.ForeignKey(
+        Academy, on_delete=models.PROTECT, related_name="groups", default=default_academy_id, editable=False, db_index=False
+    )
+
+    class Meta:
+        indexes = [models.Index(fields=["academy", "season"], name="group_academy_season")]
+        constraints = [models.UniqueConstraint(fields=["academy", "name"], name="unique_group_name_per_academy")]
 
     def __str__(self):
         return self.name
 
+    def save(self, *args, **kwargs):
+        if self._state.adding and self.coach_id is not None:
+            self.academy_id = self.coach.academy_id
+        super().save(*args, **kwargs)
+
 
 class Player(models.Model):
     group = models.ForeignKey(Group, on_delete=models.CASCADE, related_name="players")
     name = models.CharField(max_length=120)
     photo = models.ImageField(upload_to="player_photos/", blank=True, null=True)
-    birth_date = models.DateField(null=True, blank=True)
+    # Indexed: age filters are birth_date ranges (core/ages.py)
+    birth_date = models.DateField(null=True, blank=True, db_index=True)
     age = models.PositiveIntegerField()
     phone = models.CharField(max_length=20, blank=True)
     attendance_days = models.PositiveIntegerField(default=0)
+    # Always the group's season; copied here so active-season reads use the (season, group) index
+    season = models.ForeignKey(Season, on_delete=models.PROTECT, related_name="players", editable=False, db_index=False)
+    # Likewise the group's academy
+    academy = models.ForeignKey(Academy, on_delete=models.PROTECT, related_name="players", editable=False, db_index=False)
+
+    class Meta:
+        indexes = [models.Index(fields=["academy", "season", "group"], name="player_academy_season_group")]
 
     def __str__(self):
         return self.name
@@ -39,16 +158,48 @@ class Player(models.Model):
     def save(self, *args, **kwargs):
         # Auto-calculate age from birth_date if provided
         if self.birth_date:
-            today = date.today()
-            self.age = today.year - self.birth_date.year - (
-                (today.month, today.day) < (self.birth_date.month, self.birth_date.day)
-            )
+            self.age = age_on(self.birth_date, date.today())
+        # Follow the group's season and academy (without a query unless the group is not loaded and they are not set)
+        if self.season_id is None or self.academy_id is None or Player.group.is_cached(self):
+            self.season_id = self.group.season_id
+            self.academy_id = self.group.academy_id
         super().save(*args, **kwargs)
 
 
+# Ratings that make up the overall skill average (attendance is reported separately)
+SKILL_RATING_FIELDS = [
+    # Technical Skills
+    "ball_control",
+    "passing",
+    "dribbling",
+    "shooting",
+    "using_both_feet",
+    # Physical Abilities
+    "speed",
+    "agility",
+    "endurance",
+    "strength",
+    # Technical Understanding
+    "positioning",
+    "decision_making",
+    "game_awareness",
+    "teamwork",
+    # Psychological and Social
+    "respect",
+    "sportsmanship",
+    "confidence",
+    "leadership",
+]
+
+# Every 1–5 rating stored on an evaluation
+RATING_FIELDS = SKILL_RATING_FIELDS + ["attendance_and_punctuality"]
+
+
 class PlayerEvaluation(models.Model):
     player = models.OneToOneField(Player, on_delete=models.CASCADE, related_name="evaluation")
     coach = models.ForeignKey(Coach, on_delete=models.PROTECT, related_name="evaluations")
+    # Always the player's academy
+    academy = models.ForeignKey(Academy, on_delete=models.PROTECT, related_name="evaluations", editable=False, db_index=False)
 
     # Technical Skills
     ball_control = models.IntegerField(null=True, blank=True, validators=[MinValueValidator(1), MaxValueValidator(5)])
@@ -81,6 +232,14 @@ class PlayerEvaluation(models.Model):
     notes = models.TextField(blank=True)
     updated_at = models.DateTimeField(auto_now=True)
 
+    class Meta:
+        indexes = [models.Index(fields=["academy", "player"], name="evaluation_academy_player")]
+
+    def save(self, *args, **kwargs):
+        if self.academy_id is None or PlayerEvaluation.player.is_cached(self):
+            self.academy_id = self.player.academy_id
+        super().save(*args, **kwargs)
+
     def clean(self):
         # Ensure evaluation coach matches player's group coach
         if self.player and self.coach and self.player.group.coach_id != self.coach_id:
@@ -125,12 +284,230 @@ class PlayerAttendance(models.Model):
     # Month stored as date with day=1
     month = models.DateField()
     days = models.PositiveIntegerField(default=0)
+    # Bit n-1 set = attended on day n; when non-zero, days is its popcount (see core/attendance.py)
+    day_mask = models.PositiveIntegerField(default=0)
     updated_at = models.DateTimeField(auto_now=True)
+    # Always the player's academy
+    academy = models.ForeignKey(Academy, on_delete=models.PROTECT, related_name="attendance_records", editable=False, db_index=False)
 
     class Meta:
         unique_together = ("player", "month")
         ordering = ["-month"]
+        indexes = [models.Index(fields=["academy", "month"], name="attendance_academy_month")]
+
+    def save(self, *args, **kwargs):
+        if self.academy_id is None or PlayerAttendance.player.is_cached(self):
+            self.academy_id = self.player.academy_id
+        super().save(*args, **kwargs)
 
     def __str__(self):
         month_str = self.month.strftime("%Y-%m") if self.month else str(self.month)
-        return f"{self.player.name} - {month_str}"
\ No newline at end of file
+        return f"{self.player.name} - {month_str}"
+
+class EvaluationSnapshot(models.Model):
+    """Append-only copy of an evaluation, written whenever it is saved or reset.
+
+    ``group`` is the player's group at the time, so group trends are range
+    scans on ``(group, created_at)`` without joining players.
+    """
+
+    REASON_CHOICES = [
+        ("initial", "Initial"),
+        ("save", "Save"),
+        ("reset", "Reset"),
+        ("import", "Import"),
+    ]
+
+    player = models.ForeignKey(Player, on_delete=models.CASCADE, related_name="evaluation_snapshots")
+    group = models.ForeignKey(Group, on_delete=models.CASCADE, related_name="evaluation_snapshots")
+    coach = models.ForeignKey(Coach, on_delete=models.SET_NULL, related_name="evaluation_snapshots", null=True, blank=True)
+    reason = models.CharField(max_length=10, choices=REASON_CHOICES)
+    created_at = models.DateTimeField()
+
+    # Technical Skills
+    ball_control = models.PositiveSmallIntegerField(null=True, blank=True)
+    passing = models.PositiveSmallIntegerField(null=True, blank=True)
+    dribbling = models.PositiveSmallIntegerField(null=True, blank=True)
+    shooting = models.PositiveSmallIntegerField(null=True, blank=True)
+    using_both_feet = models.PositiveSmallIntegerField(null=True, blank=True)
+
+    # Physical Abilities
+    speed = models.PositiveSmallIntegerField(null=True, blank=True)
+    agility = models.PositiveSmallIntegerField(null=True, blank=True)
+    endurance = models.PositiveSmallIntegerField(null=True, blank=True)
+    strength = models.PositiveSmallIntegerField(null=True, blank=True)
+
+    # Technical Understanding
+    positioning = models.PositiveSmallIntegerField(null=True, blank=True)
+    decision_making = models.PositiveSmallIntegerField(null=True, blank=True)
+    game_awareness = models.PositiveSmallIntegerField(null=True, blank=True)
+    teamwork = models.PositiveSmallIntegerField(null=True, blank=True)
+
+    # Psychological and Social
+    respect = models.PositiveSmallIntegerField(null=True, blank=True)
+    sportsmanship = models.PositiveSmallIntegerField(null=True, blank=True)
+    confidence = models.PositiveSmallIntegerField(null=True, blank=True)
+    leadership = models.PositiveSmallIntegerField(null=True, blank=True)
+
+    # Overall evaluation
+    attendance_and_punctuality = models.PositiveSmallIntegerField(null=True, blank=True)
+
+    # Skill average at the time (null when nothing was rated), so trends need no recomputation
+    average_rating = models.FloatField(null=True, blank=True)
+
+    class Meta:
+        indexes = [
+            models.Index(fields=["player", "created_at"], name="snapshot_player_time"),
+            models.Index(fields=["group", "created_at"], name="snapshot_group_time"),
+        ]
+
+    def save(self, *args, **kwargs):
+        if not self._state.adding:
+            raise ValueError("Evaluation snapshots are append-only.")
+        super().save(*args, **kwargs)
+
+    def __str__(self):
+        return f"{self.player.name} @ {self.created_at:%Y-%m-%d %H:%M} ({self.reason})"
+
+
+class TrainingSchedule(models.Model):
+    """A weekly recurring training slot; occurrences become ``TrainingSession`` rows on demand (core/schedule.py)."""
+
+    WEEKDAY_CHOICES = [
+        (0, "Monday"),
+        (1, "Tuesday"),
+        (2, "Wednesday"),
+        (3, "Thursday"),
+        (4, "Friday"),
+        (5, "Saturday"),
+        (6, "Sunday"),
+    ]
+
+    group = models.ForeignKey(Group, on_delete=models.CASCADE, related_name="schedules")
+    weekday = models.PositiveSmallIntegerField(choices=WEEKDAY_CHOICES)
+    start_time = models.TimeField()
+    duration_minutes = models.PositiveSmallIntegerField(default=90)
+    location = models.CharField(max_length=120, blank=True)
+    starts_on = models.DateField()
+    ends_on = models.DateField(null=True, blank=True)
+    # Occurrences up to this date already exist as sessions
+    expanded_until = models.DateField(null=True, blank=True, editable=False)
+
+    def __str__(self):
+        return f"{self.group.name} - {self.get_weekday_display()} {self.start_time:%H:%M}"
+
+
+class TrainingSession(models.Model):
+    group = models.ForeignKey(Group, on_delete=models.CASCADE, related_name="sessions")
+    # Set for occurrences of a schedule; one-off sessions have none
+    schedule = models.ForeignKey(TrainingSchedule, on_delete=models.SET_NULL, related_name="sessions", null=True, blank=True)
+    date = models.DateField()
+    start_time = models.TimeField()
+    duration_minutes = models.PositiveSmallIntegerField(default=90)
+    location = models.CharField(max_length=120, blank=True)
+    cancelled = models.BooleanField(default=False)
+    notes = models.TextField(blank=True)
+    # Edited individually, so schedule changes leave it alone
+    detached = models.BooleanField(default=False, editable=False)
+
+    class Meta:
+        indexes = [models.Index(fields=["group", "date"], name="session_group_date")]
+        constraints = [models.UniqueConstraint(fields=["schedule", "date"], name="unique_schedule_occurrence")]
+        ordering = ["date", "start_time"]
+
+    def __str__(self):
+        return f"{self.group.name} - {self.date} {self.start_time:%H:%M}"
+
+
+class AttendanceArchive(models.Model):
+    """``PlayerAttendance`` rows of an archived season, moved out of the hot table by ``archive_season``.
+
+    Ids are plain columns rather than foreign keys, so archives never
+    constrain or slow down writes to the hot tables.
+    """
+
+    season = models.ForeignKey(Season, on_delete=models.CASCADE, related_name="attendance_archive")
+    player_id = models.BigIntegerField()
+    month = models.DateField()
+    days = models.PositiveIntegerField(default=0)
+    day_mask = models.PositiveIntegerField(default=0)
+
+    class Meta:
+        indexes = [models.Index(fields=["player_id", "month"], name="attendance_archive_player")]
+
+    def __str__(self):
+        return f"Player {self.player_id} - {self.month:%Y-%m} ({self.season})"
+
+
+class TrainingSessionArchive(models.Model):
+    """``TrainingSession`` rows of an archived season (see ``AttendanceArchive``)."""
+
+    season = models.ForeignKey(Season, on_delete=models.CASCADE, related_name="session_archive")
+    group_id = models.BigIntegerField()
+    schedule_id = models.BigIntegerField(null=True, blank=True)
+    date = models.DateField()
+    start_time = models.TimeField()
+    duration_minutes = models.PositiveSmallIntegerField(default=90)
+    location = models.CharField(max_length=120, blank=True)
+    cancelled = models.BooleanField(default=False)
+    notes = models.TextField(blank=True)
+
+    class Meta:
+        indexes = [models.Index(fields=["group_id", "date"], name="session_archive_group_date")]
+
+    def __str__(self):
+        return f"Group {self.group_id} - {self.date} ({self.season})"
+
+
+class EvaluationRollup(models.Model):
+    """One player's evaluation snapshots of an archived season, compacted into a single row."""
+
+    season = models.ForeignKey(Season, on_delete=models.CASCADE, related_name="evaluation_rollups")
+    player_id = models.BigIntegerField()
+    # Group of the last snapshot
+    group_id = models.BigIntegerField()
+    snapshots = models.PositiveIntegerField()
+    first_at = models.DateTimeField()
+    last_at = models.DateTimeField()
+    # Mean of the snapshots' skill averages, and the last one
+    average_rating = models.FloatField(null=True, blank=True)
+    final_average_rating = models.FloatField(null=True, blank=True)
+    # Every rating of the last snapshot, {field: value}
+    final_ratings = models.JSONField(default=dict)
+
+    class Meta:
+        constraints = [models.UniqueConstraint(fields=["season", "player_id"], name="unique_season_rollup")]
+
+    def __str__(self):
+        return f"Player {self.player_id} ({self.season})"
+
+
+class SearchEntry(models.Model):
+    """A player, group or coach name prepared for ``/api/search/`` (core/search.py).
+
+    Written by signals and by the bulk paths; ``object_id`` and the ids used
+    for scoping are plain columns, so entries never constrain the rows they index.
+    """
+
+    KIND_CHOICES = [("player", "Player"), ("group", "Group"), ("coach", "Coach")]
+
+    kind = models.CharField(max_length=10, choices=KIND_CHOICES)
+    object_id = models.BigIntegerField()
+    academy = models.ForeignKey(Academy, on_delete=models.CASCADE, related_name="+", db_index=False)
+    # Players' and groups' season; null for coaches, who belong to every season
+    season = models.ForeignKey(Season, on_delete=models.CASCADE, related_name="+", null=True, db_index=False)
+    # The coach who may see the row: the group's coach, or the coach themselves
+    coach_id = models.BigIntegerField(null=True)
+    # Players' group
+    group_id = models.BigIntegerField(null=True)
+    name = models.CharField(max_length=255)
+    # Normalised words of the name (core.search.normalize), mirrored into the full-text index
+    text = models.TextField()
+
+    class Meta:
+        # Led by object_id: an index led by kind (or academy) would tempt the planner into scanning
+        # every entry of a kind instead of starting from the full-text matches
+        constraints = [models.UniqueConstraint(fields=["object_id", "kind"], name="unique_search_entry")]
+
+    def __str__(self):
+        return f"{self.kind} {self.object_id}: {self.name}"
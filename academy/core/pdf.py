@@ -1,8 +1,18 @@
+import functools
+import hashlib
+import itertools
+import multiprocessing
+import os
+import tempfile
+import threading
+import time
+import zipfile
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
 from io import BytesIO
 from reportlab.lib.pagesizes import A4
 from reportlab.lib import colors
 from reportlab.lib.styles import getSampleStyleSheet
-from reportlab.platypus import SimpleDocTemplate, Paragraph, Spacer, Image, Table, TableStyle
+from reportlab.platypus import SimpleDocTemplate, Paragraph, Spacer, Image, Table, LongTable, TableStyle
 from reportlab.pdfbase import pdfmetrics
 from reportlab.pdfbase.ttfonts import TTFont
 from reportlab.lib.enums import TA_RIGHT
@@ -10,6 +20,9 @@ from reportlab.lib.enums import TA_RIGHT
 from django.conf import settings
 from pathlib import Path
 
+from .images import PHOTO_VARIANTS, variant_name
+from .metrics import cache_lookup, observe_pdf
+
 
 def _safe_image(path, width=100, height=100):
     try:
@@ -18,6 +31,71 @@ def _safe_image(path, width=100, height=100):
         return None
 
 
+# Downscaled copies of uploaded photos, so reports never decode or embed originals
+REPORT_THUMBNAIL_DIR = "report_thumbnails"
+# Thumbnails are rendered at this multiple of their size in points (print quality)
+REPORT_THUMBNAIL_SCALE = 2
+
+
+def _report_thumbnail(name: str, size: int) -> str | None:
+    """Return the path of a cached JPEG thumbnail (at most ``size`` px) of a media file.
+
+    The cache key includes the file's mtime, so replaced uploads are re-rendered.
+    """
+    source = Path(settings.MEDIA_ROOT) / name
+    # Upload-time derivatives are far cheaper to decode than the original
+    for variant, variant_size in sorted(PHOTO_VARIANTS.items(), key=lambda item: item[1]):
+        candidate = Path(settings.MEDIA_ROOT) / variant_name(name, variant, "jpeg")
+        if variant_size >= size and candidate.exists():
+            source = candidate
+            break
+    try:
+        mtime = source.stat().st_mtime_ns
+    except OSError:
+        return None
+    key = hashlib.sha1(f"{name}:{mtime}:{size}".encode()).hexdigest()
+    target = Path(settings.MEDIA_ROOT) / REPORT_THUMBNAIL_DIR / f"{key}.jpg"
+    if target.exists():
+        cache_lookup("report_thumbnail", True)
+        return str(target)
+    cache_lookup("report_thumbnail", False)
+    try:
+        from PIL import Image as PILImage, ImageOps
+
+        with PILImage.open(source) as im:
+            # Let the JPEG decoder downscale while decoding instead of loading full size
+            im.draft("RGB", (size, size))
+            im = ImageOps.exif_transpose(im).convert("RGB")
+            im.thumbnail((size, size))
+            target.parent.mkdir(parents=True, exist_ok=True)
+            tmp = target.with_name(f".{key}.{os.getpid()}.tmp")
+            im.save(tmp, "JPEG", quality=80, optimize=True)
+            os.replace(tmp, target)
+    except Exception:
+        return None
+    return str(target)
+
+
+class _ReportImageCache:
+    """Hand out one shared ``Image`` flowable per photo for a single report."""
+
+    def __init__(self, width, height):
+        self.width = width
+        self.height = height
+        self._images = {}
+
+    def get(self, photo):
+        name = getattr(photo, "name", None)
+        if not name:
+            return None
+        cache_lookup("report_image", name in self._images)
+        if name not in self._images:
+            size = max(self.width, self.height) * REPORT_THUMBNAIL_SCALE
+            path = _report_thumbnail(name, size)
+            self._images[name] = _safe_image(path, width=self.width, height=self.height) if path else None
+        return self._images[name]
+
+
 # Rating label helpers (1–5)
 RATING_LABELS = {
     1: "Bad",
@@ -81,11 +159,19 @@ def with_translation(label: str) -> str:
     return f"{label} ({tr})" if tr else label
 
 
+@functools.cache
+def _stylesheet():
+    """ReportLab's sample stylesheet, built once per process (styles are cloned, never modified)."""
+    return getSampleStyleSheet()
+
+
 # Arabic font registration and shaping
+@functools.cache
 def _register_arabic_font() -> str:
     """Register a font that supports Arabic and return its name.
 
     Tries common Windows fonts and a local fonts directory; falls back to Helvetica.
+    Parsing the TTF is expensive, so this runs once per process.
     """
     candidates = [
         ("ArabicFont", r"C:\\Windows\\Fonts\\arial.ttf"),
@@ -145,10 +231,39 @@ def with_section_title_text(title: str) -> str:
     return title
 
 
-def build_group_report(group) -> bytes:
-    buffer = BytesIO()
-    doc = SimpleDocTemplate(buffer, pagesize=A4)
-    styles = getSampleStyleSheet()
+# Only the columns the group report needs; evaluations come along in the same query
+GROUP_REPORT_FIELDS = [
+    "id",
+    "group",
+    "name",
+    "phone",
+    "photo",
+    "evaluation__id",
+    "evaluation__ball_control",
+    "evaluation__passing",
+    "evaluation__dribbling",
+    "evaluation__shooting",
+    "evaluation__using_both_feet",
+    "evaluation__speed",
+    "evaluation__agility",
+    "evaluation__endurance",
+    "evaluation__strength",
+    "evaluation__positioning",
+    "evaluation__decision_making",
+    "evaluation__game_awareness",
+    "evaluation__teamwork",
+    "evaluation__respect",
+    "evaluation__sportsmanship",
+    "evaluation__confidence",
+    "evaluation__leadership",
+]
+
+
+def write_group_report(group, out) -> None:
+    """Render the group report PDF into a writable file object."""
+    started = time.perf_counter()
+    doc = SimpleDocTemplate(out, pagesize=A4)
+    styles = _stylesheet()
     story = []
 
     title = f"Group Report: {group.name}"
@@ -158,12 +273,11 @@ def build_group_report(group) -> bytes:
     story.append(Spacer(1, 12))
 
     # Summary table with phone and average rating
+    images = _ReportImageCache(width=50, height=50)
     data = [["Photo", "Player", "Phone", "Avg"]]
-    for p in group.players.select_related("evaluation").all():
-        img = None
-        if p.photo:
-            img_path = Path(settings.MEDIA_ROOT) / p.photo.name
-            img = _safe_image(str(img_path), width=50, height=50)
+    players = group.players.select_related("evaluation").only(*GROUP_REPORT_FIELDS)
+    for p in players.iterator(chunk_size=500):
+        img = images.get(p.photo)
         row = [img if img else "", p.name, getattr(p, "phone", "")]
         ev = getattr(p, "evaluation", None)
         if ev:
@@ -172,7 +286,8 @@ def build_group_report(group) -> bytes:
             row.append("-")
         data.append(row)
 
-    table = Table(data, repeatRows=1)
+    # LongTable splits across pages in linear time for large groups
+    table = LongTable(data, repeatRows=1)
     table.setStyle(TableStyle([
         ("BACKGROUND", (0, 0), (-1, 0), colors.lightgrey),
         ("GRID", (0, 0), (-1, -1), 0.5, colors.grey),
@@ -181,15 +296,39 @@ def build_group_report(group) -> bytes:
     story.append(table)
 
     doc.build(story)
+    observe_pdf("group", time.perf_counter() - started, out.tell())
+
+
+def render_group_report_file(group):
+    """Render the group report into a spooled temporary file rewound to the start.
+
+    Small reports stay in memory; larger ones roll over to disk once they exceed
+    ``REPORT_SPOOL_MAX_MEMORY`` bytes. The caller owns (and closes) the file.
+    """
+    max_size = getattr(settings, "REPORT_SPOOL_MAX_MEMORY", 5 * 1024 * 1024)
+    out = tempfile.SpooledTemporaryFile(max_size=max_size)
+    try:
+        write_group_report(group, out)
+    except Exception:
+        out.close()
+        raise
+    out.seek(0)
+    return out
+
+
+def build_group_report(group) -> bytes:
+    buffer = BytesIO()
+    write_group_report(group, buffer)
     pdf = buffer.getvalue()
     buffer.close()
     return pdf
 
 
 def build_player_report(player) -> bytes:
+    started = time.perf_counter()
     buffer = BytesIO()
     doc = SimpleDocTemplate(buffer, pagesize=A4, leftMargin=24, rightMargin=24, topMargin=24, bottomMargin=24)
-    styles = getSampleStyleSheet()
+    styles = _stylesheet()
     story = []
 
     # Compact styles to fit on a single page
@@ -226,10 +365,7 @@ def build_player_report(player) -> bytes:
         details_lines.append(f"Phone: {player.phone}")
     details_para = Paragraph("<br/>".join(details_lines), normal_small)
 
-    img = None
-    if player.photo:
-        img_path = Path(settings.MEDIA_ROOT) / player.photo.name
-        img = _safe_image(str(img_path), width=100, height=100)
+    img = _ReportImageCache(width=100, height=100).get(player.photo)
 
     header_table = Table(
         [[title_para, img if img else ""], [details_para, ""]],
@@ -359,4 +495,127 @@ def build_player_report(player) -> bytes:
     doc.build(story)
     pdf = buffer.getvalue()
     buffer.close()
-    return pdf
\ No newline at end of file
+    observe_pdf("player", time.perf_counter() - started, len(pdf))
+    return pdf
+
+
+def warm_up() -> None:
+    """Load fonts, styles, Arabic shaping and Pillow's common decoders ahead of the first report."""
+    from PIL import Image as PILImage
+
+    _stylesheet()
+    _register_arabic_font()
+    _shape_arabic(SKILL_TRANSLATIONS_AR["Passing"])
+    PILImage.preinit()
+
+
+# Bulk rendering of player reports
+def _init_report_worker():
+    """Configure Django in report worker processes (started with spawn)."""
+    import django
+    from django.apps import apps
+
+    if not apps.ready:
+        django.setup()
+
+
+def _render_player_report(player):
+    return player.pk, build_player_report(player)
+
+
+# Process-wide rendering pools by size, started on first use
+_report_pools = {}
+_report_pools_lock = threading.Lock()
+
+
+def report_pool(max_workers):
+    """The process-wide report rendering pool of ``max_workers`` processes.
+
+    Its processes are spawned rather than forked, so a threaded or gevent
+    web worker is never copied mid-request.
+    """
+    with _report_pools_lock:
+        if max_workers not in _report_pools:
+            _report_pools[max_workers] = ProcessPoolExecutor(
+                max_workers=max_workers,
+                mp_context=multiprocessing.get_context("spawn"),
+                initializer=_init_report_worker,
+            )
+        return _report_pools[max_workers]
+
+
+def iter_player_reports(players, max_workers=None):
+    """Yield ``(player, pdf_bytes)`` pairs as reports finish rendering.
+
+    Reports go to the shared pool of ``report_pool`` with ``max_workers``
+    processes (default ``REPORT_RENDER_WORKERS``, one per CPU); with a
+    single worker or a single player they render in the calling process.
+    Players must already carry their group, evaluation and
+    coach relations (select_related) so worker processes never touch the
+    database. Only ``2 * max_workers`` reports are in flight at once to keep
+    memory bounded.
+    """
+    players = list(players)
+    if max_workers is None:
+        max_workers = getattr(settings, "REPORT_RENDER_WORKERS", os.cpu_count() or 1)
+    if max_workers <= 1 or len(players) <= 1:
+        for player in players:
+            yield player, build_player_report(player)
+        return
+
+    by_id = {p.pk: p for p in players}
+    pending = iter(players)
+    executor = report_pool(max_workers)
+    in_flight = set()
+    try:
+        in_flight = {executor.submit(_render_player_report, p) for p in itertools.islice(pending, max_workers * 2)}
+        while in_flight:
+            done, in_flight = wait(in_flight, return_when=FIRST_COMPLETED)
+            for future in done:
+                pk, pdf = future.result()
+                nxt = next(pending, None)
+                if nxt is not None:
+                    in_flight.add(executor.submit(_render_player_report, nxt))
+                yield by_id[pk], pdf
+    finally:
+        # The client went away: drop what has not started; the pool stays up for the next request
+        for future in in_flight:
+            future.cancel()
+
+
+class _ZipChunkBuffer:
+    """Write-only, non-seekable sink that hands written bytes back to a generator."""
+
+    def __init__(self):
+        self._chunks = []
+        self._offset = 0
+
+    def write(self, data) -> int:
+        self._chunks.append(bytes(data))
+        self._offset += len(data)
+        return len(data)
+
+    def tell(self) -> int:
+        return self._offset
+
+    def flush(self):
+        pass
+
+    def drain(self) -> bytes:
+        data = b"".join(self._chunks)
+        self._chunks.clear()
+        return data
+
+
+def stream_player_reports_zip(players, max_workers=None):
+    """Generate a ZIP archive of player reports chunk by chunk.
+
+    Each PDF is written to the archive (and released) as soon as it is rendered.
+    PDFs are compressed already, so they are stored rather than deflated again.
+    """
+    buffer = _ZipChunkBuffer()
+    with zipfile.ZipFile(buffer, mode="w", compression=zipfile.ZIP_STORED) as archive:
+        for player, pdf in iter_player_reports(players, max_workers=max_workers):
+            archive.writestr(f"player_{player.id}_report.pdf", pdf)
+            yield buffer.drain()
+    yield buffer.drain()
@@ -0,0 +1,91 @@
+import heapq
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+
+
+# Metrics of the request being handled in the current thread/task (None outside requests)
+_current: ContextVar["RequestMetrics | None"] = ContextVar("core_perf_request_metrics", default=None)
+
+
+class RequestMetrics:
+    """Per-request counters filled in by the performance middleware and timers."""
+
+    __slots__ = ("started", "db_count", "db_ms", "timings", "slow_queries", "keep_queries", "_depth")
+
+    def __init__(self, keep_queries: int = 0):
+        self.started = time.perf_counter()
+        self.db_count = 0
+        self.db_ms = 0.0
+        # Phase name -> accumulated milliseconds (serialize, render, pdf, auth, ...)
+        self.timings = {}
+        # Min-heap of the slowest (ms, sql) statements, bounded by keep_queries
+        self.slow_queries = []
+        self.keep_queries = keep_queries
+        self._depth = {}
+
+    def add(self, name: str, ms: float):
+        self.timings[name] = self.timings.get(name, 0.0) + ms
+
+    def record_query(self, sql: str, ms: float):
+        self.db_count += 1
+        self.db_ms += ms
+        if self.keep_queries:
+            entry = (ms, sql)
+            if len(self.slow_queries) < self.keep_queries:
+                heapq.heappush(self.slow_queries, entry)
+            elif ms > self.slow_queries[0][0]:
+                heapq.heapreplace(self.slow_queries, entry)
+
+    def top_queries(self):
+        return sorted(self.slow_queries, reverse=True)
+
+    @property
+    def elapsed_ms(self) -> float:
+        return (time.perf_counter() - self.started) * 1000
+
+
+def current_metrics() -> "RequestMetrics | None":
+    return _current.get()
+
+
+def activate(metrics: RequestMetrics):
+    return _current.set(metrics)
+
+
+def deactivate(token):
+    _current.reset(token)
+
+
+@contextmanager
+def timer(name: str):
+    """Add the wall time of the block to phase ``name`` of the current request.
+
+    Re-entrant blocks of the same phase (e.g. nested serializers) are only counted
+    once, at the outermost level. Outside a request this is a no-op.
+    """
+    metrics = _current.get()
+    if metrics is None or metrics._depth.get(name):
+        yield
+        return
+    metrics._depth[name] = 1
+    started = time.perf_counter()
+    try:
+        yield
+    finally:
+        metrics._depth[name] = 0
+        metrics.add(name, (time.perf_counter() - started) * 1000)
+
+
+class QueryRecorder:
+    """``connection.execute_wrapper`` hook that times every SQL statement."""
+
+    def __init__(self, metrics: RequestMetrics):
+        self.metrics = metrics
+
+    def __call__(self, execute, sql, params, many, context):
+        started = time.perf_counter()
+        try:
+            return execute(sql, params, many, context)
+        finally:
+            self.metrics.record_query(sql, (time.perf_counter() - started) * 1000)
@@ -1,6 +1,8 @@
+from rest_framework.exceptions import NotFound
 from rest_framework.permissions import BasePermission, SAFE_METHODS
 
-from .models import Coach, Group, Player, PlayerEvaluation
+from .models import Academy, Coach, Group, Player, PlayerEvaluation, TrainingSchedule, TrainingSession
+from .tenants import ACADEMY_HEADER
 
 
 class IsAdmin(BasePermission):
@@ -60,4 +62,29 @@ class IsAdminOrCoachWriteOwnGroup(BasePermission):
             return obj.group.coach_id == coach.id
         if isinstance(obj, PlayerEvaluation):
             return obj.player.group.coach_id == coach.id
-        return False
\ No newline at end of file
+        if isinstance(obj, (TrainingSchedule, TrainingSession)):
+            return obj.group.coach_id == coach.id
+        return False
+
+
+class InAcademy(BasePermission):
+    """Resolve the ``X-Academy`` header; coaches may only name their own academy.
+
+    An unknown slug is a 404. Without the header nothing is checked here:
+    coaches get their own academy and everyone else the host's or the default.
+    """
+
+    def has_permission(self, request, view):
+        slug = request.headers.get(ACADEMY_HEADER)
+        if not slug:
+            return True
+        academy = Academy.objects.filter(slug=slug).first()
+        if academy is None:
+            raise NotFound(f"Unknown academy: {slug}")
+        user = request.user
+        if not user.is_staff:
+            coach = getattr(user, "coach_profile", None)
+            if coach is not None and coach.academy_id != academy.id:
+                return False
+        request.academy = academy
+        return True
@@ -0,0 +1,114 @@
+"""Read replicas: safe-method API reads go to a replica, everything else to the primary.
+
+``DATABASE_REPLICAS`` (built from ``DB_REPLICAS`` in settings) lists the
+replica aliases. ``ReplicaReadMiddleware`` picks one at random for a GET,
+HEAD or OPTIONS request under ``/api/`` and ``ReplicaRouter`` sends that
+request's reads to it; writes, reads inside a transaction and every other
+request use the primary (``default``). A safe request that writes (schedules
+expanded or a default season created on first read) reads from the primary
+from then on, so it sees what it wrote.
+
+Replicas lag behind the primary, so a client that has just written reads
+its own writes: after any unsafe request its reads stay on the primary for
+``REPLICA_STICKY_SECONDS``. Clients are told apart without a query (the
+user id of a valid bearer token, or of the session) and the pin is kept in
+the default cache, which must be shared (Redis, Memcached) for the pin to
+hold across worker processes.
+"""
+import random
+from contextvars import ContextVar
+
+from django.conf import settings
+from django.contrib.auth import SESSION_KEY
+from django.core.cache import cache
+from django.db import DEFAULT_DB_ALIAS, connections
+from rest_framework_simplejwt.exceptions import TokenError
+from rest_framework_simplejwt.settings import api_settings as jwt_settings
+from rest_framework_simplejwt.tokens import AccessToken
+
+
+READ_PATH_PREFIX = "/api/"
+SAFE_METHODS = ("GET", "HEAD", "OPTIONS")
+_STICKY_KEY = "db-primary:{}"
+
+# The replica serving the current request's reads, if any
+_read_alias = ContextVar("replica_read_alias", default=None)
+
+
+def replicas() -> list[str]:
+    return list(getattr(settings, "DATABASE_REPLICAS", []))
+
+
+def client_key(request):
+    """The user id behind the request, from a valid bearer token or the session (no query); None if anonymous."""
+    header = request.META.get("HTTP_AUTHORIZATION", "").split()
+    if len(header) == 2 and header[0] in jwt_settings.AUTH_HEADER_TYPES:
+        try:
+            return str(AccessToken(header[1])[jwt_settings.USER_ID_CLAIM])
+        except (TokenError, KeyError):
+            return None
+    session = getattr(request, "session", None)
+    return session.get(SESSION_KEY) if session is not None else None
+
+
+def pin_to_primary(key):
+    """Keep the client's reads on the primary until the replicas have caught up with its write."""
+    cache.set(_STICKY_KEY.format(key), True, getattr(settings, "REPLICA_STICKY_SECONDS", 10))
+
+
+def read_alias_for(request, key):
+    """The replica to read from for this request, or None for the primary."""
+    aliases = replicas()
+    if not aliases or request.method not in SAFE_METHODS or not request.path.startswith(READ_PATH_PREFIX):
+        return None
+    if key is not None and cache.get(_STICKY_KEY.format(key)):
+        return None
+    return random.choice(aliases)
+
+
+def use_replica(alias):
+    """Route reads to ``alias`` (None: the primary) until the returned token is passed to ``reset``."""
+    return _read_alias.set(alias)
+
+
+def reset(token):
+    _read_alias.reset(token)
+
+
+def iterate_on(alias, content):
+    """Iterate a streaming response body with its reads still routed to ``alias``."""
+    previous = _read_alias.get()
+    _read_alias.set(alias)
+    try:
+        yield from content
+    finally:
+        _read_alias.set(previous)
+
+
+class ReplicaRouter:
+    """Reads of replica-routed requests go to their replica; everything else to the primary."""
+
+    def db_for_read(self, model, **hints):
+        alias = _read_alias.get()
+        # Reads inside a transaction must see its writes
+        if alias is None or connections[DEFAULT_DB_ALIAS].in_atomic_block:
+            return None
+        return alias
+
+    def db_for_write(self, model, **hints):
+        # The rest of the request reads its own writes
+        if _read_alias.get() is not None:
+            _read_alias.set(None)
+        # Explicit, so rows read from a replica are still saved to the primary
+        return DEFAULT_DB_ALIAS
+
+    def allow_relation(self, obj1, obj2, **hints):
+        # Replicas hold the same data as the primary
+        databases = {DEFAULT_DB_ALIAS, *replicas()}
+        if obj1._state.db in databases and obj2._state.db in databases:
+            return True
+        return None
+
+    def allow_migrate(self, db, app_label, model_name=None, **hints):
+        # Replicas get their schema from the primary
+        return False if db in replicas() else None
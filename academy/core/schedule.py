@@ -0,0 +1,170 @@
+"""Training schedules, their sessions, and attendance measured against them.
+
+A ``TrainingSchedule`` is a weekly slot. Its occurrences are written as
+``TrainingSession`` rows lazily: a calendar read first expands the schedules of
+the groups it covers up to the end of the window (``expanded_until`` records
+how far each one has gone), then reads sessions with a range scan on the
+``(group, date)`` index. In the steady state that expansion check is one
+query that returns nothing. Sessions are never written past ``horizon()``
+(``SCHEDULE_HORIZON_WEEKS`` from today), and calendar windows may not end
+after it, so a read cannot fill the table with far-future rows.
+
+Attendance rates join sessions with the day bitmaps of ``PlayerAttendance``
+(core/attendance.py) and aggregate in SQL, one query per group and window.
+"""
+from datetime import date, timedelta
+
+from django.conf import settings
+from django.db import transaction
+from django.db.models import Count, F, FilteredRelation, Q, Sum
+from django.db.models.functions import Coalesce, ExtractDay, TruncMonth
+from django.utils import timezone
+
+from .models import TrainingSchedule, TrainingSession
+
+
+# Longest calendar window a single request may ask for
+MAX_WINDOW_DAYS = 366
+
+
+def horizon():
+    """The last day sessions are stored for: ``SCHEDULE_HORIZON_WEEKS`` from today."""
+    return timezone.localdate() + timedelta(weeks=getattr(settings, "SCHEDULE_HORIZON_WEEKS", 12))
+
+
+def month_window(day=None):
+    """First day of the month containing ``day`` (default: today) and ``day`` itself."""
+    day = day or timezone.localdate()
+    return day.replace(day=1), day
+
+
+def week_window(day=None):
+    """Monday and Sunday of the week containing ``day`` (default: today)."""
+    day = day or timezone.localdate()
+    monday = day - timedelta(days=day.weekday())
+    return monday, monday + timedelta(days=6)
+
+
+def occurrences(schedule, start, end):
+    """Dates of the schedule's weekday between ``start`` and ``end``, both inclusive."""
+    day = start + timedelta(days=(schedule.weekday - start.weekday()) % 7)
+    while day <= end:
+        yield day
+        day += timedelta(days=7)
+
+
+def expand_schedules(schedules, until) -> int:
+    """Create every session of these schedules up to ``until`` (at most ``horizon()``) that was not created yet."""
+    until = min(until, horizon())
+    sessions, expanded = [], []
+    for schedule in schedules:
+        if schedule.expanded_until and schedule.expanded_until >= until:
+            continue
+        start = schedule.expanded_until + timedelta(days=1) if schedule.expanded_until else schedule.starts_on
+        end = min(until, schedule.ends_on) if schedule.ends_on else until
+        for day in occurrences(schedule, start, end):
+            sessions.append(
+                TrainingSession(
+                    group_id=schedule.group_id,
+                    schedule=schedule,
+                    date=day,
+                    start_time=schedule.start_time,
+                    duration_minutes=schedule.duration_minutes,
+                    location=schedule.location,
+                )
+            )
+        schedule.expanded_until = until
+        expanded.append(schedule)
+    if expanded:
+        with transaction.atomic():
+            # Concurrent expansions of the same window collide on (schedule, date) and are skipped
+            TrainingSession.objects.bulk_create(sessions, ignore_conflicts=True)
+            TrainingSchedule.objects.bulk_update(expanded, ["expanded_until"])
+    return len(sessions)
+
+
+def ensure_sessions(groups, until) -> int:
+    """Expand the schedules of ``groups`` (a queryset or ids) that have not reached ``until`` (or ``horizon()``) yet."""
+    until = min(until, horizon())
+    pending = TrainingSchedule.objects.filter(group__in=groups, starts_on__lte=until).filter(
+        Q(expanded_until__isnull=True) | Q(expanded_until__lt=until)
+    )
+    return expand_schedules(pending, until)
+
+
+def calendar(groups, start, end):
+    """Sessions of ``groups`` (a queryset or ids) from ``start`` to ``end``, schedules expanded first."""
+    ensure_sessions(groups, end)
+    return TrainingSession.objects.filter(group__in=groups, date__gte=start, date__lte=end)
+
+
+def parse_window(params, default):
+    """``since``/``until`` (``YYYY-MM-DD``, inclusive) with ``default`` bounds; raises ``ValueError``."""
+    bounds = list(default)
+    for i, param in enumerate(("since", "until")):
+        value = params.get(param)
+        if value:
+            try:
+                bounds[i] = date.fromisoformat(value)
+            except ValueError:
+                raise ValueError(f"Invalid {param} format; expected YYYY-MM-DD")
+    start, end = bounds
+    if end < start:
+        raise ValueError("until must not be before since")
+    if (end - start).days >= MAX_WINDOW_DAYS:
+        raise ValueError(f"The window may span at most {MAX_WINDOW_DAYS} days")
+    if end > horizon():
+        raise ValueError(f"until may not be after {horizon():%Y-%m-%d}")
+    return start, end
+
+
+def reschedule(schedule):
+    """After a schedule changes, drop its future sessions that were not edited so they are expanded again."""
+    today = timezone.localdate()
+    schedule.sessions.filter(date__gte=today, detached=False).delete()
+    if schedule.expanded_until and schedule.expanded_until >= today:
+        schedule.expanded_until = today - timedelta(days=1)
+        schedule.save(update_fields=["expanded_until"])
+
+
+def attendance_rates(group, start, end) -> list[dict]:
+    """Per player of the group: scheduled sessions in the window, how many were attended, and the rate.
+
+    Cancelled sessions do not count. A session is attended when its day is
+    set in the player's bitmap for that month; months with only a count
+    (no bitmap) count as not attended.
+    """
+    sessions = calendar([group.id], start, end).filter(cancelled=False)
+    rows = (
+        sessions.annotate(
+            record=FilteredRelation(
+                "group__players__attendance_records",
+                condition=Q(group__players__attendance_records__month=TruncMonth("date")),
+            )
+        )
+        .values(player=F("group__players"))
+        .annotate(
+            sessions=Count("id"),
+            attended=Coalesce(Sum(F("record__day_mask").bitrightshift(ExtractDay("date") - 1).bitand(1)), 0),
+        )
+        .filter(player__isnull=False)
+        .order_by("player")
+    )
+    return [
+        {**row, "missed": row["sessions"] - row["attended"], "rate": round(row["attended"] / row["sessions"], 4)}
+        for row in rows
+    ]
+
+
+def session_masks(group, since=None, until=None):
+    """``{month: day bitmap}`` of the group's scheduled, not cancelled sessions (for ``attendance_stats``)."""
+    sessions = TrainingSession.objects.filter(group=group, cancelled=False)
+    if since:
+        sessions = sessions.filter(date__gte=since)
+    if until:
+        sessions = sessions.filter(date__lte=until)
+    masks = {}
+    for day in sessions.order_by().values_list("date", flat=True):
+        month = day.replace(day=1)
+        masks[month] = masks.get(month, 0) | 1 << (day.day - 1)
+    return masks
@@ -0,0 +1,206 @@
+"""Name search over players, groups and coaches (``/api/search/?q=``).
+
+Every player, group and coach has one ``SearchEntry`` row holding its name
+normalised for matching: lower-cased, Latin accents and Arabic diacritics
+(tashkeel, tatweel) stripped, and the alef/hamza, alef maqsura and ta
+marbuta variants folded together, so "Ahmed", "أحمد" and "احمد" all match
+how they are typed. Each query word matches the start of a name word, in
+any order ("has ali" finds "Ali Hassan").
+
+Matching is an index lookup, never a scan of the names:
+
+* SQLite: the entries are mirrored into the FTS5 table ``core_search_fts``
+  by triggers (see migration 0016), with prefix indexes for short queries.
+* PostgreSQL: a GIN full-text index over the entries (``'simple'`` config,
+  ``word:*`` prefix queries).
+* Other databases fall back to ``LIKE`` over the normalised names.
+
+Signals keep the entries up to date as players, groups, coaches and users
+are saved or deleted. Bulk writes that bypass signals (the CSV importer,
+seed_academy, start_season) update them explicitly; ``manage.py
+rebuild_search_index`` rewrites them all.
+"""
+import re
+import unicodedata
+from django.contrib.auth.models import User
+from django.db import connections
+from django.db.models import BooleanField, F, Func, Q, Value
+from django.db.models.expressions import RawSQL
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+
+from .models import Coach, Group, Player, SearchEntry
+
+
+FTS_TABLE = "core_search_fts"
+# Query words beyond this are ignored
+MAX_TERMS = 8
+SEARCH_KINDS = ("player", "group", "coach")
+SEARCH_LIMIT = 20
+MAX_SEARCH_LIMIT = 100
+
+# Arabic letters that NFKD leaves alone: alef wasla, alef maqsura, ta marbuta
+_ARABIC_FOLDS = str.maketrans({"ٱ": "ا", "ى": "ي", "ة": "ه"})
+_TATWEEL = "ـ"
+_WORD = re.compile(r"[^\W_]+")
+
+
+def normalize(text: str) -> str:
+    """The searchable form of a name: words of letters and digits, folded as described above."""
+    # NFKD splits accents and hamza/madda off their letters (أ إ آ -> ا, ؤ -> و, ئ -> ي)
+    decomposed = unicodedata.normalize("NFKD", text.replace(_TATWEEL, ""))
+    stripped = "".join(ch for ch in decomposed if not unicodedata.combining(ch))
+    return " ".join(_WORD.findall(stripped.translate(_ARABIC_FOLDS).casefold()))
+
+
+def terms(query: str) -> list[str]:
+    """The normalised words of a search query."""
+    return normalize(query).split()[:MAX_TERMS]
+
+
+# Databases known to have the FTS table; a missing one is checked again, as it may be migrated later
+_fts_databases = set()
+
+
+def _has_fts_table(conn) -> bool:
+    if conn.alias not in _fts_databases:
+        if FTS_TABLE not in conn.introspection.table_names():
+            return False
+        _fts_databases.add(conn.alias)
+    return True
+
+
+def matching(query: str, entries=None):
+    """Entries whose name words start with every word of ``query`` (none for an empty query)."""
+    entries = SearchEntry.objects.all() if entries is None else entries
+    words = terms(query)
+    if not words:
+        return entries.none()
+    # The database the query will run on, which may be a replica
+    conn = connections[entries.db]
+    if conn.vendor == "postgresql":
+        # Spelled like the index expression, so the planner uses it
+        vector = Func(F("text"), template="to_tsvector('simple', %(expressions)s)")
+        tsquery = Func(Value(" & ".join(f"{word}:*" for word in words)), template="to_tsquery('simple', %(expressions)s)")
+        return entries.filter(Func(vector, tsquery, template="%(expressions)s", arg_joiner=" @@ ", output_field=BooleanField()))
+    if conn.vendor == "sqlite" and _has_fts_table(conn):
+        # Quoted, so query words are never read as FTS operators
+        expression = " ".join(f'"{word}"*' for word in words)
+        return entries.filter(id__in=RawSQL(f"SELECT rowid FROM {FTS_TABLE} WHERE {FTS_TABLE} MATCH %s", [expression]))
+    for word in words:
+        entries = entries.filter(Q(text__startswith=word) | Q(text__contains=f" {word}"))
+    return entries
+
+
+def _player_entry(row):
+    return {
+        "academy_id": row["academy_id"],
+        "season_id": row["season_id"],
+        "coach_id": row["group__coach_id"],
+        "group_id": row["group_id"],
+        "name": row["name"],
+        "text": normalize(row["name"]),
+    }
+
+
+def _group_entry(row):
+    return {
+        "academy_id": row["academy_id"],
+        "season_id": row["season_id"],
+        "coach_id": row["coach_id"],
+        "group_id": None,
+        "name": row["name"],
+        "text": normalize(row["name"]),
+    }
+
+
+def _coach_entry(row):
+    full_name = f"{row['user__first_name']} {row['user__last_name']}".strip()
+    return {
+        "academy_id": row["academy_id"],
+        "season_id": None,
+        # Coaches find themselves
+        "coach_id": row["id"],
+        "group_id": None,
+        "name": full_name or row["user__username"],
+        "text": normalize(f"{full_name} {row['user__username']}"),
+    }
+
+
+# Source model -> (entry kind, values() fields, entry builder)
+SOURCES = {
+    "player": ("player", ["id", "name", "academy_id", "season_id", "group_id", "group__coach_id"], _player_entry),
+    "group": ("group", ["id", "name", "academy_id", "season_id", "coach_id"], _group_entry),
+    "coach": ("coach", ["id", "academy_id", "user__username", "user__first_name", "user__last_name"], _coach_entry),
+}
+UPDATE_FIELDS = ["academy", "season", "coach_id", "group_id", "name", "text"]
+
+
+def index(queryset, batch_size=2000) -> int:
+    """Write (insert or update) the entries of a Player, Group or Coach queryset; returns how many."""
+    kind, fields, build = SOURCES[queryset.model._meta.model_name]
+    written, last_id = 0, 0
+    while True:
+        rows = list(queryset.filter(pk__gt=last_id).order_by("pk").values(*fields)[:batch_size])
+        if not rows:
+            return written
+        SearchEntry.objects.bulk_create(
+            [SearchEntry(kind=kind, object_id=row["id"], **build(row)) for row in rows],
+            update_conflicts=True,
+            unique_fields=["object_id", "kind"],
+            update_fields=UPDATE_FIELDS,
+        )
+        written += len(rows)
+        if len(rows) < batch_size:
+            return written
+        last_id = rows[-1]["id"]
+
+
+def rebuild() -> int:
+    """Rewrite every entry and drop those whose source row is gone; returns the number written."""
+    written = 0
+    for model in (Player, Group, Coach):
+        kind = SOURCES[model._meta.model_name][0]
+        SearchEntry.objects.filter(kind=kind).exclude(object_id__in=model.objects.values("id")).delete()
+        written += index(model.objects.all())
+    return written
+
+
+@receiver(post_save, sender=Player, dispatch_uid="search_player_saved")
+def _player_saved(sender, instance, raw=False, **kwargs):
+    if not raw:
+        index(Player.objects.filter(pk=instance.pk))
+
+
+@receiver(post_save, sender=Group, dispatch_uid="search_group_saved")
+def _group_saved(sender, instance, created=False, raw=False, **kwargs):
+    if raw:
+        return
+    index(Group.objects.filter(pk=instance.pk))
+    if not created:
+        # Player entries carry the group's coach and season
+        index(Player.objects.filter(group=instance))
+
+
+@receiver(post_save, sender=Coach, dispatch_uid="search_coach_saved")
+def _coach_saved(sender, instance, raw=False, **kwargs):
+    if not raw:
+        index(Coach.objects.filter(pk=instance.pk))
+
+
+# Coach entries show and match the user's names
+_USER_NAME_FIELDS = {"username", "first_name", "last_name"}
+
+
+@receiver(post_save, sender=User, dispatch_uid="search_user_saved")
+def _user_saved(sender, instance, raw=False, update_fields=None, **kwargs):
+    if raw or (update_fields is not None and not _USER_NAME_FIELDS & set(update_fields)):
+        return
+    index(Coach.objects.filter(user=instance))
+
+
+@receiver(post_delete, sender=Player, dispatch_uid="search_player_deleted")
+@receiver(post_delete, sender=Group, dispatch_uid="search_group_deleted")
+@receiver(post_delete, sender=Coach, dispatch_uid="search_coach_deleted")
+def _deleted(sender, instance, **kwargs):
+    SearchEntry.objects.filter(kind=SOURCES[sender._meta.model_name][0], object_id=instance.pk).delete()
@@ -0,0 +1,211 @@
+"""Seasons: active-season scoping, rollover and archival of closed seasons.
+
+Groups and players carry a ``season`` (players a copy of their group's, for
+the ``(season, group)`` index). API querysets default to the active season,
+so reads touch only its rows however many seasons accumulate.
+
+Attendance months, training sessions and evaluation snapshots belong to the
+season whose dates contain them (a month by its first day). Once a season
+has ended, ``archive_season`` moves its attendance and sessions into archive
+tables and compacts its snapshots into one ``EvaluationRollup`` per player,
+in batches that each commit on their own, so the hot tables only hold
+recent history. An interrupted run picks up where it stopped.
+"""
+from datetime import datetime, time, timedelta
+
+from django.conf import settings
+from django.db import transaction
+from django.db.models import Avg, Count, Exists, Max, Min, OuterRef, Q
+from django.utils import timezone
+from rest_framework.exceptions import ValidationError
+
+from .models import (
+    RATING_FIELDS,
+    AttendanceArchive,
+    EvaluationRollup,
+    EvaluationSnapshot,
+    Group,
+    Player,
+    PlayerAttendance,
+    SearchEntry,
+    Season,
+    TrainingSession,
+    TrainingSessionArchive,
+)
+
+
+def season_q(request=None, path="season") -> Q:
+    """Filter for the season asked for with ``?season=<id>`` (``all``: every season), by default the active one.
+
+    ``path`` leads from the queried model to its season, e.g. ``player__season``.
+    """
+    value = request.query_params.get("season") if request is not None else None
+    if value == "all":
+        return Q()
+    if value:
+        try:
+            return Q(**{f"{path}_id": int(value)})
+        except ValueError:
+            raise ValidationError({"season": "Expected a season id or all"})
+    # A subquery rather than a join, so the season index drives the scan
+    return Q(**{f"{path}__in": Season.objects.filter(is_active=True).values("id")})
+
+
+def start_season(name, starts_on, ends_on, carry_over=False) -> tuple[Season, int, int]:
+    """Create a season and make it the active one.
+
+    History belongs to seasons by date, so season ranges never overlap: the
+    previous active season is cut short to end the day before, and a range
+    overlapping any other season raises ``ValueError``. The previous season
+    keeps its groups and players unless ``carry_over`` moves them (with their
+    players) to the new one, which leaves it empty. Returns the season and the
+    numbers moved.
+    """
+    with transaction.atomic():
+        previous = Season.objects.select_for_update().filter(is_active=True).first()
+        if previous is not None and previous.starts_on >= starts_on:
+            raise ValueError(f"{previous} starts on {previous.starts_on:%Y-%m-%d}; the new season must start after it.")
+        clash = (
+            Season.objects.filter(starts_on__lte=ends_on, ends_on__gte=starts_on)
+            .exclude(pk=getattr(previous, "pk", None))
+            .first()
+        )
+        if clash is not None:
+            raise ValueError(f"The dates overlap {clash} ({clash.starts_on:%Y-%m-%d} to {clash.ends_on:%Y-%m-%d}).")
+        if previous is not None and previous.ends_on >= starts_on:
+            previous.ends_on = starts_on - timedelta(days=1)
+            previous.save(update_fields=["ends_on"])
+        Season.objects.filter(is_active=True).update(is_active=False)
+        season = Season.objects.create(name=name, starts_on=starts_on, ends_on=ends_on, is_active=True)
+        groups = players = 0
+        if previous is not None and carry_over:
+            groups = Group.objects.filter(season=previous).update(season=season)
+            players = Player.objects.filter(season=previous).update(season=season)
+            # Bulk updates send no signals; the search entries follow here
+            SearchEntry.objects.filter(season=previous).update(season=season)
+    return season, groups, players
+
+
+def _bounds(season):
+    start = timezone.make_aware(datetime.combine(season.starts_on, time.min))
+    end = timezone.make_aware(datetime.combine(season.ends_on + timedelta(days=1), time.min))
+    return start, end
+
+
+def season_history(season) -> dict:
+    """Hot-table querysets holding the season's history (never any of the active season's dates)."""
+    start, end = _bounds(season)
+    history = {
+        "attendance": PlayerAttendance.objects.filter(month__gte=season.starts_on, month__lte=season.ends_on),
+        "sessions": TrainingSession.objects.filter(date__gte=season.starts_on, date__lte=season.ends_on),
+        "snapshots": EvaluationSnapshot.objects.filter(created_at__gte=start, created_at__lt=end),
+    }
+    # Seasons created before overlaps were refused may still share dates with the active one
+    active = Season.objects.filter(is_active=True).exclude(pk=season.pk).first()
+    if active is not None:
+        active_start, active_end = _bounds(active)
+        history["attendance"] = history["attendance"].exclude(month__gte=active.starts_on, month__lte=active.ends_on)
+        history["sessions"] = history["sessions"].exclude(date__gte=active.starts_on, date__lte=active.ends_on)
+        history["snapshots"] = history["snapshots"].exclude(created_at__gte=active_start, created_at__lt=active_end)
+    return history
+
+
+def check_archivable(season, today=None):
+    """Raise ``ValueError`` unless the season is over, inactive and not archived yet."""
+    today = today or timezone.localdate()
+    if season.is_active:
+        raise ValueError(f"{season} is the active season.")
+    if season.ends_on >= today:
+        raise ValueError(f"{season} has not ended yet.")
+    if season.archived_at is not None:
+        raise ValueError(f"{season} was archived on {season.archived_at:%Y-%m-%d}.")
+
+
+def _move(queryset, build, archive_model, batch_size) -> int:
+    """Copy rows to the archive with ``build(row)`` and delete them, one transaction per batch."""
+    moved = 0
+    while True:
+        with transaction.atomic():
+            rows = list(queryset.order_by("pk").values()[:batch_size])
+            if not rows:
+                return moved
+            archive_model.objects.bulk_create([build(row) for row in rows])
+            queryset.model.objects.filter(pk__in=[row["id"] for row in rows]).delete()
+        moved += len(rows)
+
+
+def _roll_up(season, snapshots, batch_size) -> tuple[int, int]:
+    """One ``EvaluationRollup`` per player, ``batch_size`` players per transaction; returns (snapshots, rollups)."""
+    removed = rolled = 0
+    while True:
+        with transaction.atomic():
+            player_ids = list(snapshots.order_by("player_id").values_list("player_id", flat=True).distinct()[:batch_size])
+            if not player_ids:
+                return removed, rolled
+            batch = snapshots.filter(player_id__in=player_ids)
+            stats = batch.values("player_id").annotate(
+                count=Count("id"), first_at=Min("created_at"), last_at=Max("created_at"), average=Avg("average_rating")
+            )
+            # The last snapshot of each player: none later, or as late with a higher id
+            later = batch.filter(player_id=OuterRef("player_id")).filter(
+                Q(created_at__gt=OuterRef("created_at")) | Q(created_at=OuterRef("created_at"), id__gt=OuterRef("id"))
+            )
+            last = {
+                row["player_id"]: row
+                for row in batch.filter(~Exists(later)).values("player_id", "group_id", "average_rating", *RATING_FIELDS)
+            }
+            EvaluationRollup.objects.bulk_create(
+                [
+                    EvaluationRollup(
+                        season=season,
+                        player_id=row["player_id"],
+                        group_id=last[row["player_id"]]["group_id"],
+                        snapshots=row["count"],
+                        first_at=row["first_at"],
+                        last_at=row["last_at"],
+                        average_rating=round(row["average"], 2) if row["average"] is not None else None,
+                        final_average_rating=last[row["player_id"]]["average_rating"],
+                        final_ratings={f: last[row["player_id"]][f] for f in RATING_FIELDS},
+                    )
+                    for row in stats
+                ]
+            )
+            removed += batch.delete()[0]
+            rolled += len(player_ids)
+
+
+def archive_season(season, batch_size=None) -> dict:
+    """Move a closed season's history out of the hot tables; returns what was moved per table."""
+    check_archivable(season)
+    batch_size = batch_size or getattr(settings, "ARCHIVE_BATCH_SIZE", 1000)
+    history = season_history(season)
+    counts = {
+        "attendance": _move(
+            history["attendance"],
+            lambda row: AttendanceArchive(
+                season=season, player_id=row["player_id"], month=row["month"], days=row["days"], day_mask=row["day_mask"]
+            ),
+            AttendanceArchive,
+            batch_size,
+        ),
+        "sessions": _move(
+            history["sessions"],
+            lambda row: TrainingSessionArchive(
+                season=season,
+                group_id=row["group_id"],
+                schedule_id=row["schedule_id"],
+                date=row["date"],
+                start_time=row["start_time"],
+                duration_minutes=row["duration_minutes"],
+                location=row["location"],
+                cancelled=row["cancelled"],
+                notes=row["notes"],
+            ),
+            TrainingSessionArchive,
+            batch_size,
+        ),
+    }
+    counts["snapshots"], counts["rollups"] = _roll_up(season, history["snapshots"], batch_size)
+    season.archived_at = timezone.now()
+    season.save(update_fields=["archived_at"])
+    return counts
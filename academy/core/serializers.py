@@ -1,30 +1,86 @@
 from django.contrib.auth.models import User
 from rest_framework import serializers
 
-from .models import Coach, Group, Player, PlayerEvaluation, PlayerAttendance
+from .images import ensure_photo_variants, normalize_photo, photo_variant_urls
+from .models import (
+    RATING_FIELDS,
+    Coach,
+    EvaluationSnapshot,
+    Group,
+    Player,
+    PlayerAttendance,
+    PlayerEvaluation,
+    TrainingSchedule,
+    TrainingSession,
+)
+from .perf import timer
+from .tenants import academy_q
 
 
-class UserSerializer(serializers.ModelSerializer):
+class TimedSerializerMixin:
+    """Count ``to_representation`` towards the request's "serialize" phase (outermost call only)."""
+
+    def to_representation(self, instance):
+        with timer("serialize"):
+            return super().to_representation(instance)
+
+
+class AcademyScopedMixin:
+    """Limit related-object choices to the request's academy.
+
+    ``academy_fields`` maps field names to their model, e.g. ``{"group": Group}``.
+    """
+
+    academy_fields = {}
+
+    def get_fields(self):
+        fields = super().get_fields()
+        request = self.context.get("request")
+        if request is not None:
+            for name, model in self.academy_fields.items():
+                if name in fields and not fields[name].read_only:
+                    fields[name].queryset = model.objects.filter(academy_q(request))
+        return fields
+
+
+def photo_variants_representation(serializer, photo):
+    """Variant URLs for a photo, absolute when the serializer has a request (like ImageField)."""
+    urls = photo_variant_urls(photo)
+    request = serializer.context.get("request")
+    if urls and request is not None:
+        urls = {variant: {fmt: request.build_absolute_uri(url) for fmt, url in fmts.items()} for variant, fmts in urls.items()}
+    return urls
+
+
+class UserSerializer(TimedSerializerMixin, serializers.ModelSerializer):
     class Meta:
         model = User
         fields = ["id", "username", "first_name", "last_name", "email", "is_staff"]
 
 
-class CoachSerializer(serializers.ModelSerializer):
+class CoachSerializer(TimedSerializerMixin, serializers.ModelSerializer):
     user = UserSerializer(read_only=True)
+    photo_variants = serializers.SerializerMethodField()
 
     class Meta:
         model = Coach
-        fields = ["id", "user", "bio", "photo", "phone"]
+        fields = ["id", "user", "bio", "photo", "photo_variants", "phone"]
 
+    def get_photo_variants(self, obj):
+        return photo_variants_representation(self, obj.photo)
 
-class CoachDetailSerializer(serializers.ModelSerializer):
+
+class CoachDetailSerializer(TimedSerializerMixin, serializers.ModelSerializer):
     user = UserSerializer(read_only=True)
     groups = serializers.SerializerMethodField()
+    photo_variants = serializers.SerializerMethodField()
 
     class Meta:
         model = Coach
-        fields = ["id", "user", "bio", "photo", "phone", "groups"]
+        fields = ["id", "user", "bio", "photo", "photo_variants", "phone", "groups"]
+
+    def get_photo_variants(self, obj):
+        return photo_variants_representation(self, obj.photo)
 
     def get_groups(self, obj):
         qs = getattr(obj, "groups", None)
@@ -48,9 +104,10 @@ class SignupSerializer(serializers.Serializer):
         return value
 
 
-class PlayerEvaluationSerializer(serializers.ModelSerializer):
+class PlayerEvaluationSerializer(TimedSerializerMixin, AcademyScopedMixin, serializers.ModelSerializer):
     average_rating = serializers.FloatField(read_only=True)
     coach = serializers.PrimaryKeyRelatedField(read_only=True)
+    academy_fields = {"player": Player}
 
     class Meta:
         model = PlayerEvaluation
@@ -96,9 +153,18 @@ class PlayerEvaluationSerializer(serializers.ModelSerializer):
         return attrs
 
 
-class PlayerSerializer(serializers.ModelSerializer):
+class EvaluationSnapshotSerializer(TimedSerializerMixin, serializers.ModelSerializer):
+    class Meta:
+        model = EvaluationSnapshot
+        fields = ["id", "created_at", "reason", "player", "group", "coach", *RATING_FIELDS, "average_rating"]
+        read_only_fields = fields
+
+
+class PlayerSerializer(TimedSerializerMixin, AcademyScopedMixin, serializers.ModelSerializer):
     evaluation = PlayerEvaluationSerializer(read_only=True)
+    academy_fields = {"group": Group}
     attendance_days = serializers.SerializerMethodField()
+    photo_variants = serializers.SerializerMethodField()
 
     class Meta:
         model = Player
@@ -107,6 +173,7 @@ class PlayerSerializer(serializers.ModelSerializer):
             "group",
             "name",
             "photo",
+            "photo_variants",
             "birth_date",
             "age",
             "phone",
@@ -129,14 +196,73 @@ class PlayerSerializer(serializers.ModelSerializer):
                 pass
         return obj.attendance_days
 
+    def get_photo_variants(self, obj):
+        return photo_variants_representation(self, obj.photo)
+
+    def validate_photo(self, value):
+        # Fix orientation, strip metadata and cap dimensions before storing
+        if not value:
+            return value
+        try:
+            return normalize_photo(value)
+        except Exception:
+            raise serializers.ValidationError("Upload a valid image.")
 
-class GroupSerializer(serializers.ModelSerializer):
+    def create(self, validated_data):
+        instance = super().create(validated_data)
+        if validated_data.get("photo"):
+            ensure_photo_variants(instance.photo)
+        return instance
+
+    def update(self, instance, validated_data):
+        instance = super().update(instance, validated_data)
+        if validated_data.get("photo"):
+            ensure_photo_variants(instance.photo)
+        return instance
+
+
+class GroupSerializer(TimedSerializerMixin, AcademyScopedMixin, serializers.ModelSerializer):
     coach = CoachSerializer(read_only=True)
     coach_id = serializers.PrimaryKeyRelatedField(
         queryset=Coach.objects.all(), source="coach", write_only=True, required=False, allow_null=True
     )
     players = PlayerSerializer(many=True, read_only=True)
+    academy_fields = {"coach_id": Coach}
 
     class Meta:
         model = Group
-        fields = ["id", "name", "description", "coach", "coach_id", "players"]
\ No newline at end of file
+        fields = ["id", "name", "description", "coach", "coach_id", "players"]
+
+    def validate_name(self, value):
+        # Names are unique per academy (the constraint's academy is not a serializer field)
+        request = self.context.get("request")
+        groups = Group.objects.filter(academy_q(request)) if request is not None else Group.objects.all()
+        if self.instance is not None:
+            groups = groups.exclude(pk=self.instance.pk)
+        if groups.filter(name=value).exists():
+            raise serializers.ValidationError("group with this name already exists.")
+        return value
+
+
+class TrainingScheduleSerializer(TimedSerializerMixin, AcademyScopedMixin, serializers.ModelSerializer):
+    academy_fields = {"group": Group}
+
+    class Meta:
+        model = TrainingSchedule
+        fields = ["id", "group", "weekday", "start_time", "duration_minutes", "location", "starts_on", "ends_on"]
+
+    def validate(self, attrs):
+        starts_on = attrs.get("starts_on", getattr(self.instance, "starts_on", None))
+        ends_on = attrs.get("ends_on", getattr(self.instance, "ends_on", None))
+        if starts_on and ends_on and ends_on < starts_on:
+            raise serializers.ValidationError("ends_on must not be before starts_on.")
+        return attrs
+
+
+class TrainingSessionSerializer(TimedSerializerMixin, AcademyScopedMixin, serializers.ModelSerializer):
+    academy_fields = {"group": Group}
+
+    class Meta:
+        model = TrainingSession
+        fields = ["id", "group", "schedule", "date", "start_time", "duration_minutes", "location", "cancelled", "notes"]
+        read_only_fields = ["schedule"]
@@ -0,0 +1,48 @@
+"""Opt-in SQLite profile for branches that serve concurrent users from ``db.sqlite3``.
+
+With ``SQLITE_TUNING`` on, every new SQLite connection gets (``connection_created``):
+
+* ``journal_mode=WAL``: readers no longer block writers, so a long report
+  download does not stall coaches saving attendance. The mode is stored in
+  the database file and stays on after the profile is turned off.
+* ``busy_timeout``: how long a writer waits for another writer's lock
+  before failing with "database is locked".
+* ``synchronous=NORMAL``: WAL commits skip the fsync; a power loss can drop
+  the last transactions but never corrupts the file.
+* ``mmap_size`` and ``cache_size``: reads served from memory-mapped pages and
+  a larger page cache.
+* ``BEGIN IMMEDIATE`` transactions (unless ``OPTIONS["transaction_mode"]`` is
+  set): a transaction that reads and then writes takes the write lock up
+  front. Under the default ``BEGIN DEFERRED`` its upgrade fails at once with
+  "database is locked" when another writer got in first, whatever the
+  timeout.
+
+``manage.py benchmark_sqlite`` measures the profile under mixed API traffic.
+"""
+from django.conf import settings
+from django.db.backends.signals import connection_created
+from django.dispatch import receiver
+
+
+def pragmas() -> dict:
+    """The PRAGMA values applied to each connection, from settings."""
+    return {
+        # First, so the statements below wait for locks too
+        "busy_timeout": getattr(settings, "SQLITE_BUSY_TIMEOUT_MS", 5000),
+        "journal_mode": "WAL",
+        "synchronous": "NORMAL",
+        "mmap_size": getattr(settings, "SQLITE_MMAP_SIZE", 256 * 1024 * 1024),
+        # Negative: a size in KiB rather than in pages
+        "cache_size": -getattr(settings, "SQLITE_CACHE_SIZE_KB", 64 * 1024),
+    }
+
+
+@receiver(connection_created, dispatch_uid="sqlite_tuning")
+def tune(sender, connection, **kwargs):
+    if connection.vendor != "sqlite" or not getattr(settings, "SQLITE_TUNING", False):
+        return
+    for name, value in pragmas().items():
+        # On the raw connection, so the statements are not logged or counted as queries
+        connection.connection.execute(f"PRAGMA {name} = {value}")
+    if connection.transaction_mode is None:
+        connection.transaction_mode = "IMMEDIATE"
@@ -0,0 +1,64 @@
+import hashlib
+from pathlib import PurePosixPath
+
+from django.conf import settings
+from django.core.files import File
+from django.core.files.storage import FileSystemStorage
+
+from .images import VARIANTS_DIR
+from .metrics import cache_lookup
+
+
+# Upload directories whose files are named by content hash
+DEFAULT_HASHED_DIRS = ("player_photos", "coach_photos")
+
+
+class ContentHashedStorage(FileSystemStorage):
+    """File system storage that names uploaded photos after the SHA-256 of their bytes.
+
+    Identical uploads map to the same name and are stored once. Because a name can
+    never point at different content, those files (and the derivatives named after
+    them) are safe to cache forever. Files outside ``hashed_dirs`` keep their names.
+    """
+
+    hash_length = 32
+
+    def __init__(self, hashed_dirs=None, **kwargs):
+        super().__init__(**kwargs)
+        if hashed_dirs is None:
+            hashed_dirs = getattr(settings, "MEDIA_HASHED_DIRS", DEFAULT_HASHED_DIRS)
+        self.hashed_dirs = tuple(hashed_dirs)
+
+    def is_hashed_name(self, name: str) -> bool:
+        return PurePosixPath(name).parent.as_posix() in self.hashed_dirs
+
+    def is_immutable_name(self, name: str) -> bool:
+        """True for content-addressed uploads and the derivatives generated from them."""
+        parent = PurePosixPath(name).parent
+        if parent.name == VARIANTS_DIR:
+            parent = parent.parent
+        return parent.as_posix() in self.hashed_dirs
+
+    def hashed_name(self, name: str, content) -> str:
+        digest = hashlib.sha256()
+        for chunk in content.chunks():
+            digest.update(chunk)
+        path = PurePosixPath(name)
+        return str(path.parent / f"{digest.hexdigest()[:self.hash_length]}{path.suffix.lower()}")
+
+    def save(self, name, content, max_length=None):
+        if name is None:
+            name = content.name
+        if not hasattr(content, "chunks"):
+            content = File(content, name)
+        if not self.is_hashed_name(name):
+            return super().save(name, content, max_length=max_length)
+
+        name = self.hashed_name(name, content)
+        exists = self.exists(name)
+        cache_lookup("media_dedup", exists)
+        if exists:
+            # Same bytes are already stored under this name
+            return name
+        content.seek(0)
+        return super().save(name, content, max_length=max_length)
@@ -0,0 +1,199 @@
+"""Balanced training teams from evaluation ratings.
+
+Each player is a vector: their strength (the skill average, like
+``PlayerEvaluation.average_rating``) and their 17 skill ratings, optionally
+plus ``attendance_and_punctuality``. Missing ratings are filled with the
+player's own average, or the pool's average for that skill when the player
+has none. The cost of a split is the sum over vector components of the
+squared deviations of the team totals, so it penalises both unequal
+strength and unequal skill profiles.
+
+Splits start from a greedy seed (strongest first, each to the weakest team
+with room) and improve by local search: swaps between teams, and moves from
+a larger team to a smaller one, while any lowers the cost. Swap deltas are
+O(1) from a precomputed Gram matrix and each team's dot products with every
+player, so a pass over all pairs of 200 players takes milliseconds.
+Several seeded restarts (fewer for large pools) are run and the cheapest
+split is kept; the same seed always gives the same teams.
+"""
+import random
+from operator import mul
+
+from .models import SKILL_RATING_FIELDS
+
+
+MIN_TEAMS = 2
+MAX_TEAMS = 4
+# Improvements smaller than this are float noise
+EPSILON = 1e-9
+# Restarts by default: as many as fit in about this many pair evaluations (2 to 8)
+RESTART_BUDGET = 200_000
+
+
+def rating_vectors(rows, fields) -> list[list[float]]:
+    """Ratings of ``rows`` (dicts keyed by ``fields``), missing ones filled in as described above."""
+    pool = {}
+    for field in fields:
+        rated = [row[field] for row in rows if row[field] is not None]
+        pool[field] = sum(rated) / len(rated) if rated else 3.0
+    vectors = []
+    for row in rows:
+        rated = [row[field] for field in fields if row[field] is not None]
+        own = sum(rated) / len(rated) if rated else None
+        vectors.append(
+            [float(row[field]) if row[field] is not None else own if own is not None else pool[field] for field in fields]
+        )
+    return vectors
+
+
+def team_sizes(count, k) -> list[int]:
+    return [count // k + (t < count % k) for t in range(k)]
+
+
+class TeamBalancer:
+    """Split players into ``k`` teams; ``strengths[i]`` and ``profiles[i]`` describe player ``i``.
+
+    ``profile_weight`` sets how much the skill profile counts against strength (0 ignores it).
+    """
+
+    def __init__(self, strengths, profiles, k, seed=0, profile_weight=1.0, restarts=None, max_passes=50):
+        self.n = len(strengths)
+        self.k = k
+        self.strengths = strengths
+        self.rng = random.Random(seed)
+        if restarts is None:
+            restarts = min(8, max(2, RESTART_BUDGET // max(1, self.n * self.n)))
+        self.restarts = max(1, restarts)
+        self.max_passes = max_passes
+        dims = len(profiles[0]) if profiles else 0
+        scale = (profile_weight / dims) ** 0.5 if dims else 0.0
+        self.vectors = [[s] + [scale * x for x in p] for s, p in zip(strengths, profiles)]
+        self.gram = [[sum(map(mul, a, b)) for b in self.vectors] for a in self.vectors]
+
+    def solve(self) -> list[list[int]]:
+        """Indices of the players in each team, cheapest of the restarts."""
+        best, best_cost = None, None
+        for restart in range(self.restarts):
+            assignment = self.local_search(self.greedy(noise=0.0 if restart == 0 else 0.5))
+            cost = self.cost(assignment)
+            if best_cost is None or cost < best_cost - EPSILON:
+                best, best_cost = assignment, cost
+        teams = [[] for _ in range(self.k)]
+        for i, team in enumerate(best):
+            teams[team].append(i)
+        # Strongest team first, so the output does not depend on team numbering
+        return sorted(teams, key=lambda members: (-sum(self.strengths[i] for i in members), members))
+
+    def greedy(self, noise) -> list[int]:
+        """Strongest first (ties and ``noise`` shuffled by the seed), each to the weakest team with room."""
+        order = sorted(range(self.n), key=lambda i: (-self.strengths[i] + self.rng.uniform(-noise, noise), self.rng.random()))
+        room = team_sizes(self.n, self.k)
+        totals = [0.0] * self.k
+        assignment = [0] * self.n
+        for i in order:
+            team = min((t for t in range(self.k) if room[t]), key=lambda t: (totals[t], t))
+            assignment[i] = team
+            totals[team] += self.strengths[i]
+            room[team] -= 1
+        return assignment
+
+    def local_search(self, assignment) -> list[int]:
+        """Apply improving swaps and moves until none is left (or ``max_passes`` passes)."""
+        n, k, gram = self.n, self.k, self.gram
+        sizes = [0] * k
+        for team in assignment:
+            sizes[team] += 1
+        # dots[i][t]: player i's vector dotted with the total vector of team t
+        dots = [[0.0] * k for _ in range(n)]
+        for i in range(n):
+            row = gram[i]
+            for j in range(n):
+                dots[i][assignment[j]] += row[j]
+
+        def shift(x, into, out_of):
+            # Player x's vector added to team ``into`` and removed from team ``out_of``
+            row = gram[x]
+            for p in range(n):
+                dots[p][into] += row[p]
+                dots[p][out_of] -= row[p]
+
+        order = list(range(n))
+        for _ in range(self.max_passes):
+            self.rng.shuffle(order)
+            improved = False
+            for i in order:
+                a = assignment[i]
+                di, gi = dots[i], gram[i]
+                best, best_delta = None, -EPSILON
+                for j in range(n):
+                    b = assignment[j]
+                    if b == a:
+                        continue
+                    dj = dots[j]
+                    # Change in cost when i and j trade places (see the module docstring)
+                    delta = dj[a] - dj[b] - di[a] + di[b] + gi[i] + gram[j][j] - 2 * gi[j]
+                    if delta < best_delta:
+                        best, best_delta = j, delta
+                for b in range(k):
+                    if sizes[a] > sizes[b]:
+                        # Change in cost when i moves to the smaller team b
+                        delta = di[b] - di[a] + gi[i]
+                        if delta < best_delta:
+                            best, best_delta = ~b, delta
+                if best is None:
+                    continue
+                improved = True
+                if best >= 0:
+                    b = assignment[best]
+                    shift(i, b, a)
+                    shift(best, a, b)
+                    assignment[i], assignment[best] = b, a
+                else:
+                    b = ~best
+                    shift(i, b, a)
+                    assignment[i] = b
+                    sizes[a] -= 1
+                    sizes[b] += 1
+            if not improved:
+                break
+        return assignment
+
+    def cost(self, assignment) -> float:
+        totals = [[0.0] * len(self.vectors[0]) for _ in range(self.k)] if self.vectors else []
+        for i, team in enumerate(assignment):
+            for d, x in enumerate(self.vectors[i]):
+                totals[team][d] += x
+        cost = 0.0
+        for column in zip(*totals):
+            mean = sum(column) / self.k
+            cost += sum((x - mean) ** 2 for x in column)
+        return cost
+
+
+def balanced_teams(rows, k, seed=0, with_attendance=False, profile_weight=1.0) -> dict:
+    """Split ``rows`` (``id``, ``name`` and the rating fields) into ``k`` balanced teams."""
+    fields = SKILL_RATING_FIELDS + (["attendance_and_punctuality"] if with_attendance else [])
+    rows = sorted(rows, key=lambda row: row["id"])
+    profiles = rating_vectors(rows, fields)
+    strengths = [sum(p) / len(p) for p in profiles]
+    teams = TeamBalancer(strengths, profiles, k, seed=seed, profile_weight=profile_weight).solve()
+
+    out = []
+    for members in teams:
+        strength = sum(strengths[i] for i in members)
+        out.append(
+            {
+                "players": [{"id": rows[i]["id"], "name": rows[i]["name"], "strength": round(strengths[i], 2)} for i in members],
+                "strength": round(strength, 2),
+                "average": round(strength / len(members), 2),
+                "profile": {f: round(sum(profiles[i][d] for i in members) / len(members), 2) for d, f in enumerate(fields)},
+            }
+        )
+    averages = [team["average"] for team in out]
+    strengths_total = [team["strength"] for team in out]
+    return {
+        "seed": seed,
+        "teams": out,
+        "strength_spread": round(max(strengths_total) - min(strengths_total), 2),
+        "average_spread": round(max(averages) - min(averages), 2),
+    }
@@ -0,0 +1,57 @@
+"""Academies (branches): one deployment serves many, each request works in one.
+
+The request's academy is the one named by the ``X-Academy`` header (its
+slug), else the one whose ``domain`` is the request host, else the default
+academy. Coaches always work in their own academy (``permissions.InAcademy``
+refuses a header naming another one); staff may pick any.
+
+Coaches, groups, players, evaluations and attendance records carry their
+academy (players, evaluations and attendance a copy of their parent's), and
+``academy_q`` scopes every viewset queryset. Unless the academy is already
+known it is resolved inside the query as a subquery, so scoping costs no
+extra round trip and the ``(academy, …)`` indexes drive every list.
+"""
+from django.db.models import Q, Subquery
+from django.http.request import split_domain_port
+
+from .models import Academy
+
+
+ACADEMY_HEADER = "X-Academy"
+
+
+def _known_academy_id(request):
+    """The academy id when it needs no lookup: named by the header (see ``InAcademy``) or the coach's own."""
+    academy = getattr(request, "academy", None)
+    if academy is not None:
+        return academy.id
+    user = getattr(request, "user", None)
+    coach = None if user is None or user.is_staff else getattr(user, "coach_profile", None)
+    return coach.academy_id if coach is not None else None
+
+
+def _host_or_default(request):
+    """Academy id queryset: the academy of the request host, or the default one."""
+    domain, _ = split_domain_port(request.get_host())
+    # False sorts first, so a domain match wins over the default
+    return Academy.objects.filter(Q(domain=domain) | Q(is_default=True)).order_by("is_default").values("id")[:1]
+
+
+def academy_q(request, path="academy") -> Q:
+    """Filter for the request's academy; ``path`` leads from the queried model to it, e.g. ``group__academy``."""
+    academy_id = _known_academy_id(request)
+    if academy_id is not None:
+        return Q(**{f"{path}_id": academy_id})
+    return Q(**{f"{path}_id": Subquery(_host_or_default(request))})
+
+
+def request_academy(request) -> Academy:
+    """The request's academy as an instance, for writes that assign it."""
+    academy = getattr(request, "academy", None)
+    if academy is not None:
+        return academy
+    academy_id = _known_academy_id(request)
+    if academy_id is not None:
+        return Academy.objects.get(pk=academy_id)
+    return Academy.objects.filter(pk__in=_host_or_default(request)).first() or Academy.default()
+
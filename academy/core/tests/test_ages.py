@@ -0,0 +1,92 @@
+import datetime
+from io import StringIO
+from unittest import mock
+
+from django.contrib.auth.models import User
+from django.core.management import call_command
+from django.db import connection
+from django.test import TestCase, override_settings
+from rest_framework.test import APIClient
+
+from core.ages import age_q, parse_band, refresh_ages, season_cutoff
+from core.models import Coach, Group, Player, age_on
+
+
+TODAY = datetime.date(2026, 10, 19)
+
+
+@mock.patch("django.utils.timezone.localdate", lambda *args: TODAY)
+class AgeFilterTestCase(TestCase):
+    def setUp(self):
+        self.coach = Coach.objects.create(user=User.objects.create_user(username="coach1", password="coach123"))
+        self.group = Group.objects.create(name="Group A", coach=self.coach)
+        self.players = {}
+        for name, birth_date in (
+            ("nine", datetime.date(2017, 1, 5)),
+            ("ten", datetime.date(2016, 10, 19)),  # tenth birthday today
+            ("eleven", datetime.date(2014, 10, 20)),  # twelve tomorrow
+            ("twelve", datetime.date(2014, 10, 19)),
+            ("leap", datetime.date(2012, 2, 29)),
+        ):
+            self.players[name] = Player.objects.create(group=self.group, name=name, birth_date=birth_date, age=0)
+        # No birth date: the entered age is used
+        self.players["entered"] = Player.objects.create(group=self.group, name="entered", age=11)
+        self.client = APIClient()
+        self.client.force_authenticate(user=self.coach.user)
+
+    def names(self, query=""):
+        res = self.client.get(f"/api/players/?ordering=id{query}")
+        self.assertEqual(res.status_code, 200)
+        return [p["name"] for p in res.json()]
+
+    def test_age_filters_follow_birth_dates(self):
+        # Stored ages go stale without a save; the filters do not care
+        Player.objects.filter(name="eleven").update(age=3)
+        self.assertEqual(self.names("&age=11"), ["eleven", "entered"])
+        self.assertEqual(self.names("&age_min=10&age_max=12"), ["ten", "eleven", "twelve", "entered"])
+        self.assertEqual(self.names("&band=U12"), ["ten", "eleven", "entered"])
+        self.assertEqual(self.names("&band=u10"), ["nine"])
+        self.assertEqual(self.names("&age=14&group=%d" % self.group.id), ["leap"])
+        self.assertEqual(self.client.get("/api/players/?band=twelve").status_code, 400)
+
+    def test_reference_date(self):
+        self.assertEqual(self.names("&age=12&age_on=2026-10-21"), ["eleven", "twelve"])
+        with override_settings(SEASON_AGE_CUTOFF="09-01"):
+            self.assertEqual(season_cutoff(), datetime.date(2026, 9, 1))
+            self.assertEqual(self.names("&band=U12&age_on=season"), ["eleven", "twelve", "entered"])
+        self.assertEqual(season_cutoff(datetime.date(2026, 3, 1)), datetime.date(2026, 1, 1))
+        self.assertEqual(self.client.get("/api/players/?age=10&age_on=soon").status_code, 400)
+        for query in ("age=10000", "age_max=5000", "age_min=-1", "age_on=0001-01-01&age=3", "age_on=0001-01-01&band=U12"):
+            self.assertEqual(self.client.get(f"/api/players/?{query}").status_code, 400, query)
+
+    def test_bounds_match_age_on(self):
+        days = [datetime.date(2024, 2, 28) + datetime.timedelta(days=n) for n in range(4)]
+        days += [datetime.date(2025, 2, 28), datetime.date(2025, 3, 1), TODAY]
+        for on in days:
+            for age in range(9, 15):
+                expected = sorted(p.id for p in Player.objects.filter(birth_date__isnull=False) if age_on(p.birth_date, on) == age)
+                found = sorted(Player.objects.filter(age_q(age, age, on), birth_date__isnull=False).values_list("id", flat=True))
+                self.assertEqual(found, expected, (on, age))
+        self.assertEqual(parse_band("U14"), (12, 13))
+        with override_settings(AGE_BAND_YEARS=1):
+            self.assertEqual(parse_band("U14"), (13, 13))
+
+    def test_refresh_ages_is_one_update(self):
+        Player.objects.filter(birth_date__isnull=False).update(age=0)
+        with self.assertNumQueries(1):
+            self.assertEqual(refresh_ages(Player.objects.all()), 5)
+        ages = dict(Player.objects.values_list("name", "age"))
+        self.assertEqual(ages, {"nine": 9, "ten": 10, "eleven": 11, "twelve": 12, "leap": 14, "entered": 11})
+        self.assertEqual(refresh_ages(Player.objects.all()), 0)
+
+        out = StringIO()
+        call_command("refresh_ages", "--date", "2026-10-20", "--dry-run", stdout=out)
+        self.assertEqual(out.getvalue().strip(), "1 stale ages")
+        call_command("refresh_ages", "--date", "2026-10-20", stdout=out)
+        self.assertEqual(Player.objects.get(name="eleven").age, 12)
+
+    def test_age_filter_uses_the_birth_date_index(self):
+        if connection.vendor != "sqlite":
+            self.skipTest("Query plans are checked on SQLite only")
+        plan = Player.objects.filter(age_q(10, 11)).explain()
+        self.assertIn("INDEX core_player_birth_date", plan)
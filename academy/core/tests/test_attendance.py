@@ -0,0 +1,30 @@
+from django.contrib.auth.models import User
+from django.test import TestCase
+from rest_framework.test import APIClient
+
+from core.models import Coach, Group, Player, PlayerAttendance, PlayerEvaluation
+
+
+class EvaluationAttendanceTestCase(TestCase):
+    def setUp(self):
+        self.coach_user = User.objects.create_user(username="coach1", password="coach123")
+        self.coach = Coach.objects.create(user=self.coach_user, bio="Coach")
+        self.group = Group.objects.create(name="Group A", description="A", coach=self.coach)
+        self.player = Player.objects.create(group=self.group, name="Alice", age=13)
+        self.evaluation = PlayerEvaluation.objects.create(player=self.player, coach=self.coach)
+        self.client = APIClient()
+        self.client.force_authenticate(user=self.coach_user)
+
+    def test_set_and_get_monthly_attendance(self):
+        url = f"/api/evaluations/{self.evaluation.id}/attendance/?month=2026-03"
+        res = self.client.put(url, {"days": 9}, format="json")
+        self.assertEqual(res.status_code, 200)
+        self.assertEqual(res.data, {"player": self.player.id, "month": "2026-03", "days": 9})
+        self.assertEqual(PlayerAttendance.objects.get(player=self.player).days, 9)
+
+        res = self.client.get(url)
+        self.assertEqual(res.data["days"], 9)
+
+    def test_month_is_required(self):
+        res = self.client.get(f"/api/evaluations/{self.evaluation.id}/attendance/")
+        self.assertEqual(res.status_code, 400)
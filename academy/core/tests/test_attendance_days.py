@@ -0,0 +1,87 @@
+import datetime
+
+from django.contrib.auth.models import User
+from django.test import TestCase
+from rest_framework.test import APIClient
+
+from core.attendance import attendance_stats, days_from_mask, mask_from_days, update_days
+from core.models import Coach, Group, Player, PlayerAttendance, PlayerEvaluation
+
+
+MARCH = datetime.date(2026, 3, 1)
+APRIL = datetime.date(2026, 4, 1)
+
+
+class AttendanceBitmapTestCase(TestCase):
+    def setUp(self):
+        self.coach = Coach.objects.create(user=User.objects.create_user(username="coach1", password="coach123"))
+        self.group = Group.objects.create(name="Group A", coach=self.coach)
+        self.players = [Player.objects.create(group=self.group, name=f"P{i}", age=10) for i in range(3)]
+        self.ids = [p.id for p in self.players]
+        self.client = APIClient()
+        self.client.force_authenticate(user=self.coach.user)
+
+    def test_masks(self):
+        self.assertEqual(mask_from_days([1, 3, 31]), 0b1 | 0b100 | 1 << 30)
+        self.assertEqual(days_from_mask(mask_from_days([31, 2, 9])), [2, 9, 31])
+
+    def test_update_days_in_bulk(self):
+        PlayerAttendance.objects.create(player=self.players[0], month=MARCH, days=12)
+        with self.assertNumQueries(5):  # savepoint, insert missing, lock + read, update, release
+            update_days(self.ids, MARCH, mark=[2, 4, 6])
+        update_days(self.ids[:1], MARCH, mark=[8], unmark=[4])
+        records = {r.player_id: r for r in PlayerAttendance.objects.filter(month=MARCH)}
+        # The count-only row switched to day tracking
+        self.assertEqual((days_from_mask(records[self.ids[0]].day_mask), records[self.ids[0]].days), ([2, 6, 8], 3))
+        self.assertEqual((days_from_mask(records[self.ids[1]].day_mask), records[self.ids[1]].days), ([2, 4, 6], 3))
+
+    def test_stats_from_bitmaps(self):
+        update_days(self.ids[:2], MARCH, mark=[2, 4, 6])
+        update_days(self.ids[1:2], MARCH, unmark=[4])
+        update_days(self.ids[:1], APRIL, mark=[1])
+        update_days(self.ids[1:2], APRIL, mark=[3, 5])
+        records = PlayerAttendance.objects.values_list("player_id", "month", "day_mask")
+        stats = attendance_stats(self.ids, records)
+        # Sessions: March 2, 4, 6 and April 1, 3, 5
+        first, second, third = (stats[i] for i in self.ids)
+        self.assertEqual((first["sessions"], first["attended"], first["rate"]), (6, 4, 0.6667))
+        self.assertEqual((first["longest_streak"], first["current_streak"], first["current_absence"]), (4, 0, 2))
+        self.assertEqual((second["attended"], second["longest_absence"], second["current_streak"]), (4, 1, 2))
+        self.assertEqual((third["attended"], third["longest_absence"], third["rate"]), (0, 6, 0.0))
+        self.assertEqual(attendance_stats(self.ids, [])[self.ids[0]]["rate"], None)
+
+    def test_player_endpoint(self):
+        url = f"/api/players/{self.ids[0]}/attendance-days/"
+        res = self.client.post(url, {"month": "2026-02", "mark": [1, 28, 3]}, format="json")
+        self.assertEqual(res.json(), {"player": self.ids[0], "month": "2026-02", "days": [1, 3, 28], "count": 3})
+        self.assertEqual(self.client.get(url + "?month=2026-02").json()["days"], [1, 3, 28])
+        self.assertEqual(self.client.post(url, {"month": "2026-02", "mark": [29]}, format="json").status_code, 400)
+        self.assertEqual(self.client.get(url + "?month=bad").status_code, 400)
+        # The monthly count stays in sync for existing readers
+        res = self.client.get(f"/api/players/{self.ids[0]}/?month=2026-02")
+        self.assertEqual(PlayerAttendance.objects.get(player=self.players[0]).days, 3)
+
+    def test_group_endpoints(self):
+        url = f"/api/groups/{self.group.id}/attendance-days/"
+        res = self.client.post(url, {"month": "2026-03", "days": [2, 4], "present": self.ids[:2], "absent": self.ids[2:]}, format="json")
+        self.assertEqual(res.status_code, 200)
+        self.assertEqual([r["days"] for r in res.json()], [[2, 4], [2, 4], []])
+        self.client.post(url, {"month": "2026-03", "days": [4], "absent": self.ids[1:2]}, format="json")
+
+        res = self.client.get(f"/api/groups/{self.group.id}/attendance-stats/?since=2026-03")
+        self.assertEqual([(s["attended"], s["sessions"]) for s in res.json()], [(2, 2), (1, 2), (0, 2)])
+
+        outsider = Player.objects.create(group=Group.objects.create(name="Group B", coach=self.coach), name="X", age=9)
+        res = self.client.post(url, {"month": "2026-03", "days": [2], "present": [outsider.id]}, format="json")
+        self.assertEqual(res.status_code, 400)
+        for ids in ([{"id": self.ids[0]}], [True], [str(self.ids[0])], [[self.ids[0]]]):
+            res = self.client.post(url, {"month": "2026-03", "days": [2], "present": ids}, format="json")
+            self.assertEqual(res.status_code, 400)
+            self.assertEqual(res.json()["detail"], "present and absent must be lists of player ids")
+
+    def test_monthly_count_update_clears_a_mismatched_mask(self):
+        update_days(self.ids[:1], MARCH, mark=[2, 4])
+        evaluation = PlayerEvaluation.objects.create(player=self.players[0], coach=self.coach)
+        self.client.put(f"/api/evaluations/{evaluation.id}/attendance/?month=2026-03", {"days": 5}, format="json")
+        record = PlayerAttendance.objects.get(player=self.players[0], month=MARCH)
+        self.assertEqual((record.days, record.day_mask), (5, 0))
@@ -0,0 +1,42 @@
+import json
+import tempfile
+from io import StringIO
+from pathlib import Path
+
+from django.core.management import call_command
+from django.test import TestCase
+
+from core.benchmarks import percentile
+from core.models import Player
+
+
+class BenchmarkHarnessTestCase(TestCase):
+    def test_percentile_nearest_rank(self):
+        values = list(range(1, 11))
+        self.assertEqual(percentile(values, 50), 5)
+        self.assertEqual(percentile(values, 95), 10)
+        self.assertEqual(percentile([7], 95), 7)
+
+    def test_api_benchmark_writes_results_and_rolls_back(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            output = Path(tmp) / "api.json"
+            call_command(
+                "benchmark_api",
+                sizes=[3],
+                groups=2,
+                months=1,
+                iterations=2,
+                filter=r"^/api/(players|groups)/",
+                exclude="report",
+                output=str(output),
+                stdout=StringIO(),
+            )
+            payload = json.loads(output.read_text())
+        endpoints = {(r["params"]["role"], r["params"]["endpoint"]) for r in payload["results"]}
+        self.assertIn(("staff", "GET /api/players/"), endpoints)
+        self.assertIn(("coach", "GET /api/groups/"), endpoints)
+        for result in payload["results"]:
+            self.assertEqual(result["status"], 200)
+            self.assertGreater(result["queries"], 0)
+            self.assertLessEqual(result["p50_ms"], result["p95_ms"])
+        self.assertFalse(Player.objects.exists())
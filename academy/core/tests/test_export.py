@@ -0,0 +1,81 @@
+import csv
+import datetime
+import io
+import json
+from io import StringIO
+
+from django.contrib.auth.models import User
+from django.core.management import call_command
+from django.test import TestCase
+from rest_framework.test import APIClient
+
+from core.export import export_columns, iter_export_rows
+from core.models import RATING_FIELDS, Coach, Group, Player, PlayerAttendance, PlayerEvaluation
+
+
+class ExportTestCase(TestCase):
+    def setUp(self):
+        self.admin = User.objects.create_user(username="admin", password="admin123", is_staff=True)
+        coach_user = User.objects.create_user(username="coach1", password="coach123", first_name="Sam", last_name="Lee")
+        self.coach = Coach.objects.create(user=coach_user)
+        self.group = Group.objects.create(name="Group A", coach=self.coach)
+        other = Group.objects.create(name="Group B", coach=Coach.objects.create(user=User.objects.create_user(username="coach2")))
+        self.alice = Player.objects.create(group=self.group, name="=HYPERLINK(1)", age=12, phone="+20 100 123 4567")
+        self.bob = Player.objects.create(group=self.group, name="Bob", age=11)
+        self.carl = Player.objects.create(group=other, name="Carl", age=10)
+        PlayerEvaluation.objects.create(player=self.alice, coach=self.coach, passing=4, speed=2, attendance_and_punctuality=5)
+        for player, month, days in ((self.alice, 1, 8), (self.alice, 3, 6), (self.carl, 2, 4)):
+            PlayerAttendance.objects.create(player=player, month=datetime.date(2026, month, 1), days=days)
+        self.client = APIClient()
+        self.client.force_authenticate(user=self.admin)
+
+    def read_csv(self, res):
+        self.assertEqual(res["Content-Type"], "text/csv; charset=utf-8")
+        text = b"".join(res.streaming_content).decode("utf-8-sig")
+        return list(csv.DictReader(io.StringIO(text)))
+
+    def test_csv_export(self):
+        rows = self.read_csv(self.client.get("/api/players/export.csv/"))
+        self.assertEqual(list(rows[0]), export_columns([datetime.date(2026, m, 1) for m in (1, 2, 3)]))
+        self.assertEqual([r["player_id"] for r in rows], [str(p.id) for p in (self.alice, self.bob, self.carl)])
+        alice, bob, carl = rows
+        self.assertEqual(alice["name"], "'=HYPERLINK(1)")
+        self.assertEqual(alice["phone"], "+20 100 123 4567")
+        self.assertEqual(alice["coach"], "Sam Lee")
+        self.assertEqual((alice["passing"], alice["average_rating"]), ("4", "3.0"))
+        self.assertEqual((alice["attendance_2026-01"], alice["attendance_2026-02"], alice["attendance_2026-03"]), ("8", "", "6"))
+        self.assertEqual((bob["passing"], bob["average_rating"]), ("", ""))
+        self.assertEqual(carl["attendance_2026-02"], "4")
+
+    def test_ndjson_export_for_a_group_and_month_range(self):
+        res = self.client.get(f"/api/players/export.ndjson/?group={self.group.id}&since=2026-02")
+        self.assertEqual(res["Content-Type"], "application/x-ndjson")
+        rows = [json.loads(line) for line in b"".join(res.streaming_content).splitlines()]
+        self.assertEqual([r["name"] for r in rows], ["=HYPERLINK(1)", "Bob"])
+        self.assertEqual(rows[0]["attendance_2026-03"], 6)
+        self.assertNotIn("attendance_2026-01", rows[0])
+        self.assertEqual(len([f for f in RATING_FIELDS if f in rows[0]]), 18)
+
+    def test_coaches_only_export_their_players(self):
+        self.client.force_authenticate(user=self.coach.user)
+        rows = self.read_csv(self.client.get("/api/players/export.csv/"))
+        self.assertEqual({r["group"] for r in rows}, {"Group A"})
+
+    def test_invalid_month(self):
+        res = self.client.get("/api/players/export.csv/?since=2026")
+        self.assertEqual(res.status_code, 400)
+
+    def test_query_count_is_constant(self):
+        for i in range(30):
+            player = Player.objects.create(group=self.group, name=f"Extra {i}", age=10)
+            PlayerAttendance.objects.create(player=player, month=datetime.date(2026, 1, 1), days=i)
+        # Players (joined with group, coach and evaluation) and attendance, whatever the chunk size
+        with self.assertNumQueries(2):
+            rows = list(iter_export_rows(Player.objects.all(), [datetime.date(2026, m, 1) for m in (1, 2, 3)], chunk_size=7))
+        self.assertEqual(len(rows), 33)
+
+    def test_management_command(self):
+        out = StringIO()
+        call_command("export_academy", "--format", "ndjson", "--group", "Group B", stdout=out)
+        rows = [json.loads(line) for line in out.getvalue().splitlines()]
+        self.assertEqual([r["name"] for r in rows], ["Carl"])
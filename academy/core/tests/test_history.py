@@ -0,0 +1,97 @@
+import datetime
+
+from django.contrib.auth.models import User
+from django.db import connection
+from django.test import TestCase
+from django.utils import timezone
+from rest_framework.test import APIClient
+
+from core.history import group_trend, record_snapshots, snapshot_queryset
+from core.models import Coach, EvaluationSnapshot, Group, Player, PlayerEvaluation
+
+
+def at(day):
+    return timezone.make_aware(datetime.datetime(2026, 1, 1)) + datetime.timedelta(days=day)
+
+
+class EvaluationHistoryTestCase(TestCase):
+    def setUp(self):
+        self.admin = User.objects.create_user(username="admin", password="admin123", is_staff=True)
+        self.coach = Coach.objects.create(user=User.objects.create_user(username="coach1", password="coach123"))
+        self.group = Group.objects.create(name="Group A", coach=self.coach)
+        self.alice = Player.objects.create(group=self.group, name="Alice", age=12)
+        self.bob = Player.objects.create(group=self.group, name="Bob", age=11)
+        self.evaluation = PlayerEvaluation.objects.create(player=self.alice, coach=self.coach, passing=2, speed=4)
+        self.client = APIClient()
+        self.client.force_authenticate(user=self.coach.user)
+
+    def test_saves_and_resets_append_snapshots(self):
+        res = self.client.patch(f"/api/evaluations/{self.evaluation.id}/", {"passing": 5}, format="json")
+        self.assertEqual(res.status_code, 200)
+        res = self.client.post("/api/evaluations/", {"player": self.bob.id, "speed": 3}, format="json")
+        self.assertEqual(res.status_code, 201)
+        res = self.client.post(f"/api/groups/{self.group.id}/reset-evaluations/")
+        self.assertEqual(res.status_code, 200)
+
+        snapshots = list(EvaluationSnapshot.objects.order_by("id").values_list("player_id", "reason", "passing", "average_rating"))
+        self.assertEqual(
+            snapshots,
+            [
+                (self.alice.id, "save", 5, 4.5),
+                (self.bob.id, "save", None, 3.0),
+                (self.alice.id, "reset", None, None),
+                (self.bob.id, "reset", None, None),
+            ],
+        )
+
+    def test_snapshots_are_append_only(self):
+        record_snapshots([self.evaluation], "save")
+        snapshot = EvaluationSnapshot.objects.get()
+        snapshot.passing = 1
+        with self.assertRaisesMessage(ValueError, "append-only"):
+            snapshot.save()
+
+    def test_player_history_range(self):
+        for day, passing in ((0, 1), (10, 2), (40, 3)):
+            self.evaluation.passing = passing
+            record_snapshots([self.evaluation], "save", at=at(day))
+        res = self.client.get(f"/api/players/{self.alice.id}/evaluation-history/?since=2026-01-05&until=2026-02-10")
+        self.assertEqual(res.status_code, 200)
+        self.assertEqual([(s["passing"], s["reason"]) for s in res.json()], [(2, "save"), (3, "save")])
+        self.assertEqual(self.client.get(f"/api/players/{self.alice.id}/evaluation-history/?since=bad").status_code, 400)
+        res = self.client.get(f"/api/players/{self.alice.id}/evaluation-history/?until=9999-12-31")
+        self.assertEqual((res.status_code, res.json()["detail"]), (400, "Invalid until format; expected YYYY-MM-DD"))
+
+    def test_group_trend(self):
+        bob_evaluation = PlayerEvaluation.objects.create(player=self.bob, coach=self.coach, passing=4)
+        record_snapshots([self.evaluation, bob_evaluation], "save", at=at(0))
+        self.evaluation.passing = 4
+        record_snapshots([self.evaluation], "save", at=at(35))
+        evaluations = PlayerEvaluation.objects.filter(player__group=self.group)
+        evaluations.update(passing=None, speed=None)
+        snapshot_queryset(evaluations, "reset", at=at(36))
+
+        trend = group_trend(self.group, interval="month")
+        self.assertEqual([(t["period"], t["snapshots"], t["players"]) for t in trend], [("2026-01-01", 2, 2), ("2026-02-01", 3, 2)])
+        # Reset snapshots have no ratings, so they do not drag averages down
+        self.assertEqual((trend[0]["passing"], trend[0]["average_rating"]), (3.0, 3.5))
+        self.assertEqual((trend[1]["passing"], trend[1]["average_rating"]), (4.0, 4.0))
+
+        res = self.client.get(f"/api/groups/{self.group.id}/evaluation-trend/?interval=day&since=2026-02-01")
+        self.assertEqual([t["period"] for t in res.json()], ["2026-02-05", "2026-02-06"])
+        self.assertEqual(self.client.get(f"/api/groups/{self.group.id}/evaluation-trend/?interval=year").status_code, 400)
+
+    def test_other_coaches_cannot_read_history(self):
+        other = Coach.objects.create(user=User.objects.create_user(username="coach2"))
+        self.client.force_authenticate(user=other.user)
+        self.assertEqual(self.client.get(f"/api/players/{self.alice.id}/evaluation-history/").status_code, 404)
+        self.assertEqual(self.client.get(f"/api/groups/{self.group.id}/evaluation-trend/").status_code, 404)
+
+    def test_range_reads_use_the_indexes(self):
+        if connection.vendor != "sqlite":
+            self.skipTest("Query plans are checked on SQLite only")
+        for queryset in (
+            EvaluationSnapshot.objects.filter(player=self.alice, created_at__gte=at(0)),
+            EvaluationSnapshot.objects.filter(group=self.group, created_at__gte=at(0)),
+        ):
+            self.assertRegex(queryset.explain(), r"USING INDEX snapshot_(player|group)_time \(\w+_id=\? AND created_at>\?\)")
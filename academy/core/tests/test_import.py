@@ -0,0 +1,172 @@
+import datetime
+import io
+import tempfile
+from pathlib import Path
+
+from django.contrib.auth.models import User
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.core.management import CommandError, call_command
+from django.test import TestCase
+from rest_framework.test import APIClient
+
+from core.export import iter_export_rows, stream_export
+from core.importing import PlayerImporter
+from core.models import Coach, Group, Player, PlayerEvaluation, age_on
+
+
+def import_text(text, **kwargs):
+    return PlayerImporter(**kwargs).run(io.StringIO(text))
+
+
+class PlayerImporterTestCase(TestCase):
+    def setUp(self):
+        self.coach = Coach.objects.create(user=User.objects.create_user(username="coach1", password="coach123"))
+        self.group = Group.objects.create(name="Group A", coach=self.coach)
+        self.other = Group.objects.create(name="Group B", coach=Coach.objects.create(user=User.objects.create_user(username="coach2")))
+        self.uncoached = Group.objects.create(name="No coach")
+        self.alice = Player.objects.create(group=self.group, name="Alice", age=12, phone="1")
+        PlayerEvaluation.objects.create(player=self.alice, coach=self.coach, passing=2, notes="old")
+
+    def test_creates_players_and_evaluations(self):
+        csv_text = (
+            "\ufeffname,group,birth_date,age,phone,passing,speed,notes\n"
+            "Bob,Group A,2015-05-05,,'+1,4,5,quick\n"
+            f"Carl,{self.other.name},,9,,,,\n"
+        )
+        report = import_text(csv_text)
+        self.assertTrue(report.imported)
+        self.assertEqual((report.rows, report.created, report.updated, report.evaluations), (2, 2, 0, 1))
+        bob = Player.objects.get(name="Bob")
+        self.assertEqual(bob.age, age_on(datetime.date(2015, 5, 5), datetime.date.today()))
+        self.assertEqual(bob.phone, "+1")
+        self.assertEqual((bob.evaluation.passing, bob.evaluation.speed, bob.evaluation.notes), (4, 5, "quick"))
+        self.assertEqual(bob.evaluation.coach, self.coach)
+        carl = Player.objects.get(name="Carl")
+        self.assertEqual((carl.group, carl.age), (self.other, 9))
+        self.assertFalse(PlayerEvaluation.objects.filter(player=carl).exists())
+
+    def test_upserts_by_player_id(self):
+        report = import_text(f"player_id,name,group_id,passing,notes\n{self.alice.id},Alicia,{self.group.id},5,\n")
+        self.assertEqual((report.created, report.updated, report.evaluations), (0, 1, 1))
+        self.alice.refresh_from_db()
+        # Columns missing from the file are left alone
+        self.assertEqual((self.alice.name, self.alice.age, self.alice.phone), ("Alicia", 12, "1"))
+        evaluation = PlayerEvaluation.objects.get(player=self.alice)
+        self.assertEqual((evaluation.passing, evaluation.notes), (5, ""))
+
+    def test_export_round_trip(self):
+        Player.objects.create(group=self.other, name="=SUM(1)", birth_date=datetime.date(2014, 3, 1), phone="+20 1")
+        before = list(iter_export_rows(Player.objects.all(), []))
+        exported = b"".join(stream_export(Player.objects.all(), "csv")).decode()
+        report = import_text(exported)
+        self.assertEqual((report.updated, report.error_count), (2, 0))
+        after = list(iter_export_rows(Player.objects.all(), []))
+        for row in before + after:
+            row.pop("evaluation_updated_at")
+        self.assertEqual(after, before)
+
+    def test_invalid_rows_roll_back_everything(self):
+        csv_text = (
+            "name,group_id,age,passing\n"
+            f"Good,{self.group.id},10,3\n"
+            f"Bad rating,{self.group.id},10,6\n"
+            "No group,999,10,\n"
+            f",{self.group.id},,\n"
+            f"No coach,{self.uncoached.id},10,2\n"
+        )
+        report = import_text(csv_text)
+        self.assertFalse(report.imported)
+        self.assertEqual(report.error_count, 4)
+        errors = {e["line"]: e["errors"] for e in report.errors}
+        self.assertEqual(errors[3], {"passing": ["Ensure this value is less than or equal to 5."]})
+        self.assertEqual(errors[4], {"group_id": ["Group 999 not found."]})
+        self.assertEqual(set(errors[5]), {"name", "age"})
+        self.assertEqual(errors[6], {"group": ["The group has no coach to own the evaluation."]})
+        self.assertFalse(Player.objects.filter(name="Good").exists())
+
+        report = import_text(csv_text, skip_invalid=True)
+        self.assertTrue(report.imported)
+        self.assertEqual(report.created, 1)
+        self.assertEqual(Player.objects.get(name="Good").evaluation.passing, 3)
+
+    def test_dry_run_writes_nothing(self):
+        report = import_text(f"name,group_id,age\nNew,{self.group.id},10\n", dry_run=True)
+        self.assertEqual((report.imported, report.created, report.error_count), (False, 1, 0))
+        self.assertFalse(Player.objects.filter(name="New").exists())
+
+    def test_coach_is_limited_to_own_groups(self):
+        carl = Player.objects.create(group=self.other, name="Carl", age=10)
+        csv_text = f"player_id,name,group_id,age\n{carl.id},Carl,{self.group.id},10\n,Dan,{self.other.id},10\n"
+        report = import_text(csv_text, coach=self.coach)
+        self.assertEqual(
+            [e["errors"] for e in sorted(report.errors, key=lambda e: e["line"])],
+            [{"player_id": ["Player not found."]}, {"group_id": [f"Group {self.other.id} not found."]}],
+        )
+
+    def test_batches_use_bulk_queries(self):
+        rows = "".join(f"P{i},{self.group.id},10,3\n" for i in range(50))
+        # Groups, then per batch of 20: player insert, search entries (read, upsert), evaluation upsert and snapshots
+        # (plus the savepoint)
+        with self.assertNumQueries(1 + 3 * 5 + 2):
+            report = import_text("name,group_id,age,passing\n" + rows, batch_size=20)
+        self.assertEqual((report.created, report.evaluations), (50, 50))
+        self.assertEqual(PlayerEvaluation.objects.filter(player__name__startswith="P").count(), 50)
+
+    def test_bad_header_and_duplicates(self):
+        with self.assertRaisesMessage(ValueError, "name and group_id or group"):
+            import_text("player,age\nA,1\n")
+        with self.assertRaisesMessage(ValueError, "The file is empty."):
+            import_text("")
+        report = import_text(f"player_id,name,group_id\n{self.alice.id},A,{self.group.id}\n{self.alice.id},B,{self.group.id}\n")
+        self.assertEqual(report.errors, [{"line": 3, "errors": {"player_id": ["This player appears more than once in the file."]}}])
+
+
+class ImportEndpointTestCase(TestCase):
+    def setUp(self):
+        self.coach = Coach.objects.create(user=User.objects.create_user(username="coach1", password="coach123"))
+        self.group = Group.objects.create(name="Group A", coach=self.coach)
+        self.client = APIClient()
+        self.client.force_authenticate(user=self.coach.user)
+
+    def post(self, content, **data):
+        upload = SimpleUploadedFile("players.csv", content, content_type="text/csv")
+        return self.client.post("/api/players/import.csv/", {"file": upload, **data}, format="multipart")
+
+    def test_import_and_dry_run(self):
+        content = f"name,group_id,age,passing\nNew,{self.group.id},10,4\n".encode()
+        res = self.post(content, dry_run="true")
+        self.assertEqual(res.status_code, 200)
+        self.assertEqual((res.json()["dry_run"], res.json()["created"]), (True, 1))
+        self.assertFalse(Player.objects.exists())
+
+        res = self.post(content)
+        self.assertEqual(res.status_code, 200)
+        self.assertTrue(res.json()["imported"])
+        self.assertEqual(Player.objects.get().evaluation.passing, 4)
+
+    def test_errors(self):
+        res = self.post(f"name,group_id,age\nBad,{self.group.id},-1\n".encode())
+        self.assertEqual(res.status_code, 400)
+        self.assertEqual(res.json()["errors"][0]["line"], 2)
+        self.assertEqual(self.post(b"\xff\xfe\x00").status_code, 400)
+        self.assertEqual(self.client.post("/api/players/import.csv/", {}, format="multipart").status_code, 400)
+
+    def test_users_without_a_coach_profile_are_forbidden(self):
+        self.client.force_authenticate(user=User.objects.create_user(username="parent"))
+        res = self.post(f"name,group_id,age\nNew,{self.group.id},10\n".encode())
+        self.assertEqual(res.status_code, 403)
+        self.assertFalse(Player.objects.exists())
+
+
+class ImportCommandTestCase(TestCase):
+    def test_command(self):
+        group = Group.objects.create(name="Group A", coach=Coach.objects.create(user=User.objects.create_user(username="coach1")))
+        with tempfile.TemporaryDirectory() as tmp:
+            path = Path(tmp) / "players.csv"
+            path.write_text("name,group,age\nNew,Group A,10\nBad,Missing,10\n", encoding="utf-8")
+            with self.assertRaisesMessage(CommandError, "Nothing imported"):
+                call_command("import_players", str(path), stdout=io.StringIO(), stderr=io.StringIO())
+            out = io.StringIO()
+            call_command("import_players", str(path), "--skip-invalid", stdout=out, stderr=io.StringIO())
+        self.assertIn("1 created", out.getvalue())
+        self.assertEqual(list(group.players.values_list("name", flat=True)), ["New"])
@@ -0,0 +1,95 @@
+import datetime
+import json
+
+from django.contrib.auth.models import User
+from django.test import TestCase, override_settings
+from rest_framework.test import APIClient, APIRequestFactory
+
+from core.lean import GroupRows, PlayerRows
+from core.models import Coach, Group, Player, PlayerAttendance, PlayerEvaluation
+from core.serializers import GroupSerializer, PlayerSerializer
+
+
+def as_json(data):
+    return json.loads(json.dumps(data))
+
+
+class LeanFixtureMixin:
+    def setUp(self):
+        self.admin = User.objects.create_user(username="admin", password="admin123", is_staff=True)
+        coach_user = User.objects.create_user(username="coach1", password="coach123", first_name="Sam", email="sam@example.com")
+        self.coach = Coach.objects.create(user=coach_user, bio="Coach", phone="555", photo="coach_photos/c0ffee.jpg")
+        self.group = Group.objects.create(name="Group A", description="A", coach=self.coach)
+        Group.objects.create(name="No coach")
+        Group.objects.create(name="Empty", coach=self.coach)
+        self.players = [
+            Player.objects.create(group=self.group, name="Photo", birth_date=datetime.date(2014, 3, 1), photo="player_photos/abc.jpg", phone="1"),
+            Player.objects.create(group=self.group, name="No evaluation", age=9),
+            Player.objects.create(group=self.group, name="Unrated", age=11, attendance_days=3),
+        ]
+        PlayerEvaluation.objects.create(player=self.players[0], coach=self.coach, passing=4, speed=2, attendance_and_punctuality=5, notes="ok")
+        PlayerEvaluation.objects.create(player=self.players[2], coach=self.coach)
+        PlayerAttendance.objects.create(player=self.players[0], month=datetime.date(2026, 3, 1), days=12)
+        PlayerAttendance.objects.create(player=self.players[2], month=datetime.date(2026, 3, 1), days=0)
+
+
+class LeanParityTestCase(LeanFixtureMixin, TestCase):
+    def test_players_match_serializer(self):
+        request = APIRequestFactory().get("/api/players/")
+        for context, month in (({}, None), ({"request": request}, None), ({"request": request, "attendance_month": "2026-03"}, "2026-03")):
+            queryset = Player.objects.select_related("evaluation").order_by("id")
+            expected = as_json(PlayerSerializer(queryset, many=True, context=context).data)
+            rows = PlayerRows(request=context.get("request"), attendance_month=month).fetch(queryset)
+            self.assertEqual(as_json(rows), expected)
+            self.assertEqual(as_json(list(PlayerRows(context.get("request"), month).iterate(queryset, chunk_size=2))), expected)
+
+    def test_groups_match_serializer(self):
+        request = APIRequestFactory().get("/api/groups/")
+        for month in (None, "2026-03", "bad"):
+            context = {"request": request, "attendance_month": month} if month else {"request": request}
+            queryset = Group.objects.select_related("coach__user").prefetch_related("players").order_by("id")
+            expected = as_json(GroupSerializer(queryset, many=True, context=context).data)
+            self.assertEqual(as_json(GroupRows(request=request, attendance_month=month).fetch(queryset)), expected)
+
+
+class LeanViewsTestCase(LeanFixtureMixin, TestCase):
+    def fetch(self, url, user):
+        client = APIClient()
+        client.force_authenticate(user=user)
+        with override_settings(LEAN_READS=False):
+            expected = client.get(url)
+        res = client.get(url)
+        self.assertEqual(res.status_code, expected.status_code)
+        self.assertEqual(json.loads(res.content), json.loads(expected.content))
+        return res
+
+    def test_endpoints_match_serializer_path(self):
+        for user in (self.admin, self.coach.user):
+            for url in (
+                "/api/players/",
+                "/api/players/?ordering=-age",
+                f"/api/players/?group={self.group.id}",
+                f"/api/players/{self.players[0].id}/",
+                "/api/groups/",
+                f"/api/groups/{self.group.id}/",
+                f"/api/groups/{self.group.id}/?month=2026-03",
+                "/api/players/999999/",
+                "/api/players/not-a-number/",
+            ):
+                with self.subTest(user=user.username, url=url):
+                    self.fetch(url, user)
+
+    def test_coach_scoping(self):
+        other = Coach.objects.create(user=User.objects.create_user(username="coach2", password="coach123"))
+        res = self.fetch(f"/api/groups/{self.group.id}/", other.user)
+        self.assertEqual(res.status_code, 404)
+        self.assertEqual(json.loads(self.fetch("/api/players/", other.user).content), [])
+
+    def test_group_detail_queries_do_not_grow_with_players(self):
+        client = APIClient()
+        client.force_authenticate(user=self.admin)
+        for i in range(20):
+            PlayerEvaluation.objects.create(player=Player.objects.create(group=self.group, name=f"Extra {i}", age=10), coach=self.coach)
+        # Group row, players with evaluations, monthly attendance
+        with self.assertNumQueries(3):
+            client.get(f"/api/groups/{self.group.id}/?month=2026-03")
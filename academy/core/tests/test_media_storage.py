@@ -0,0 +1,94 @@
+import os
+import shutil
+import tempfile
+import time
+from io import StringIO
+from pathlib import Path
+
+from django.contrib.auth.models import User
+from django.core.files.base import ContentFile
+from django.core.files.storage import default_storage
+from django.core.management import call_command
+from django.test import TestCase
+
+from core.images import variant_name
+from core.models import Coach, Group, Player
+from core.tests.test_photos import make_jpeg
+
+
+class ContentHashedMediaTestCase(TestCase):
+    def setUp(self):
+        self.media_root = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.media_root, ignore_errors=True)
+        override = self.settings(MEDIA_ROOT=self.media_root)
+        override.enable()
+        self.addCleanup(override.disable)
+
+        self.coach_user = User.objects.create_user(username="coach1", password="coach123")
+        self.coach = Coach.objects.create(user=self.coach_user, bio="Coach")
+        self.group = Group.objects.create(name="Group A", description="A", coach=self.coach)
+
+    def test_identical_uploads_are_stored_once(self):
+        first = default_storage.save("player_photos/a.jpg", ContentFile(b"same bytes"))
+        second = default_storage.save("player_photos/B.JPG", ContentFile(b"same bytes"))
+        other = default_storage.save("player_photos/c.jpg", ContentFile(b"other bytes"))
+        self.assertEqual(first, second)
+        self.assertNotEqual(first, other)
+        self.assertRegex(first, r"^player_photos/[0-9a-f]{32}\.jpg$")
+        self.assertEqual(len(os.listdir(Path(self.media_root) / "player_photos")), 2)
+
+    def test_unhashed_directories_keep_their_names(self):
+        self.assertEqual(default_storage.save("exports/data.csv", ContentFile(b"x")), "exports/data.csv")
+
+    def test_hashed_media_is_served_immutable(self):
+        name = default_storage.save("player_photos/a.jpg", ContentFile(b"photo bytes"))
+        res = self.client.get(f"/media/{name}")
+        self.assertEqual(res.status_code, 200)
+        self.assertIn("immutable", res["Cache-Control"])
+        etag = res["ETag"]
+        self.assertEqual(etag, f'"{Path(name).stem}"')
+
+        res = self.client.get(f"/media/{name}", HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(res.status_code, 304)
+
+    def test_other_media_is_revalidated(self):
+        default_storage.save("exports/data.csv", ContentFile(b"x"))
+        res = self.client.get("/media/exports/data.csv")
+        self.assertEqual(res.status_code, 200)
+        self.assertNotIn("immutable", res["Cache-Control"])
+        self.assertTrue(res["ETag"].startswith('W/"'))
+
+    def test_gc_removes_only_orphans(self):
+        player = Player.objects.create(group=self.group, name="Alice", age=12)
+        player.photo.save("a.jpg", make_jpeg(size=(300, 300)), save=True)
+        from core.images import generate_photo_variants
+
+        generate_photo_variants(player.photo)
+        orphan = default_storage.save("player_photos/old.jpg", ContentFile(b"orphan"))
+        orphan_variant = default_storage.save(variant_name(orphan, "thumb", "jpeg"), ContentFile(b"v"))
+        past = time.time() - 7200
+        for path in (Path(self.media_root) / "player_photos").rglob("*"):
+            os.utime(path, (past, past))
+
+        call_command("gc_media", stdout=StringIO())
+        self.assertTrue(default_storage.exists(player.photo.name))
+        self.assertTrue(default_storage.exists(variant_name(player.photo.name, "thumb", "webp")))
+        self.assertFalse(default_storage.exists(orphan))
+        self.assertFalse(default_storage.exists(orphan_variant))
+
+    def test_normalizing_a_shared_original_keeps_it_for_the_others(self):
+        first = Player.objects.create(group=self.group, name="Alice", age=12)
+        second = Player.objects.create(group=self.group, name="Bob", age=12)
+        # An original stored before uploads were normalized, shared through deduplication
+        shared = default_storage.save("player_photos/legacy.png", ContentFile(make_jpeg(size=(300, 300)).read()))
+        Player.objects.filter(pk__in=[first.pk, second.pk]).update(photo=shared)
+        self.coach.photo = shared
+        self.coach.save(update_fields=["photo"])
+
+        call_command("generate_photo_variants", "--normalize-originals", stdout=StringIO())
+        first.refresh_from_db()
+        self.assertNotEqual(first.photo.name, shared)
+        # The last record to move off it removes it
+        self.assertFalse(default_storage.exists(shared))
+        for record in (first, Player.objects.get(pk=second.pk), Coach.objects.get(pk=self.coach.pk)):
+            self.assertTrue(default_storage.exists(record.photo.name))
@@ -0,0 +1,63 @@
+from django.contrib.auth.models import User
+from django.test import TestCase, override_settings
+from prometheus_client import REGISTRY
+from rest_framework.test import APIClient
+
+from core.models import Coach, Group, Player, PlayerEvaluation
+
+
+def sample(name, **labels):
+    return REGISTRY.get_sample_value(name, labels) or 0
+
+
+@override_settings(METRICS_ENABLED=True, METRICS_TOKEN="")
+class MetricsEndpointTestCase(TestCase):
+    def setUp(self):
+        self.admin = User.objects.create_user(username="admin", password="admin123", is_staff=True)
+        coach = Coach.objects.create(user=User.objects.create_user(username="coach1", password="coach123"))
+        self.group = Group.objects.create(name="Group A", coach=coach)
+        self.player = Player.objects.create(group=self.group, name="Alice", age=12)
+        PlayerEvaluation.objects.create(player=self.player, coach=coach)
+        self.client = APIClient()
+        self.client.force_authenticate(user=self.admin)
+
+    def test_exposes_domain_counts(self):
+        res = self.client.get("/metrics")
+        self.assertEqual(res.status_code, 200)
+        self.assertTrue(res["Content-Type"].startswith("text/plain"))
+        body = res.content.decode()
+        self.assertIn("academy_groups 1.0", body)
+        self.assertIn("academy_players 1.0", body)
+        self.assertIn("academy_evaluations 1.0", body)
+
+    def test_records_request_latency_and_queries_per_route(self):
+        before = sample("academy_http_request_duration_seconds_count", route="player-list", method="GET")
+        before_queries = sample("academy_http_request_db_queries_count", route="player-list")
+        self.client.get("/api/players/")
+        self.assertEqual(sample("academy_http_request_duration_seconds_count", route="player-list", method="GET"), before + 1)
+        self.assertEqual(sample("academy_http_request_db_queries_count", route="player-list"), before_queries + 1)
+        self.assertIn('route="player-list"', self.client.get("/metrics").content.decode())
+
+    def test_records_pdf_render_duration_and_size(self):
+        before = sample("academy_pdf_size_bytes_count", report="player")
+        before_bytes = sample("academy_pdf_size_bytes_sum", report="player")
+        res = self.client.get(f"/api/players/{self.player.id}/report-pdf/")
+        self.assertEqual(res.status_code, 200)
+        self.assertEqual(sample("academy_pdf_render_duration_seconds_count", report="player"), before + 1)
+        self.assertEqual(sample("academy_pdf_size_bytes_sum", report="player"), before_bytes + len(res.content))
+
+    def test_rejects_other_addresses(self):
+        res = self.client.get("/metrics", REMOTE_ADDR="10.1.2.3")
+        self.assertEqual(res.status_code, 403)
+
+    @override_settings(METRICS_TOKEN="s3cret")
+    def test_token_replaces_the_address_check(self):
+        # Behind a proxy: the address is the proxy's, whoever the client is
+        self.assertEqual(self.client.get("/metrics").status_code, 403)
+        self.assertEqual(self.client.get("/metrics", HTTP_AUTHORIZATION="Bearer wrong").status_code, 403)
+        res = self.client.get("/metrics", REMOTE_ADDR="10.1.2.3", HTTP_AUTHORIZATION="Bearer s3cret")
+        self.assertEqual(res.status_code, 200)
+
+    @override_settings(METRICS_ENABLED=False)
+    def test_off_by_default(self):
+        self.assertEqual(self.client.get("/metrics").status_code, 404)
@@ -1,8 +1,15 @@
-from django.test import TestCase
+import io
+import shutil
+import tempfile
+import zipfile
+from unittest import mock
+
+from django.test import TestCase, override_settings
 from django.contrib.auth.models import User
 from rest_framework.test import APIClient
 
 from core.models import Coach, Group, Player, PlayerEvaluation
+from core.pdf import _ReportImageCache, iter_player_reports, render_group_report_file, report_pool
 
 
 class PdfReportsTestCase(TestCase):
@@ -30,11 +37,107 @@ class PdfReportsTestCase(TestCase):
         res = self.client.get(f"/api/groups/{self.group.id}/report-pdf/")
         self.assertEqual(res.status_code, 200)
         self.assertEqual(res["Content-Type"], "application/pdf")
-        self.assertTrue(res.content[:4] == b"%PDF")
+        self.assertTrue(b"".join(res.streaming_content)[:4] == b"%PDF")
 
     def test_player_pdf_download(self):
         self.client.force_authenticate(user=self.coach_user)
         res = self.client.get(f"/api/players/{self.player.id}/report-pdf/")
         self.assertEqual(res.status_code, 200)
         self.assertEqual(res["Content-Type"], "application/pdf")
-        self.assertTrue(res.content[:4] == b"%PDF")
\ No newline at end of file
+        self.assertTrue(res.content[:4] == b"%PDF")
+
+
+class GroupPlayerReportsZipTestCase(TestCase):
+    def setUp(self):
+        self.coach_user = User.objects.create_user(username="coach1", password="coach123")
+        self.coach = Coach.objects.create(user=self.coach_user, bio="Coach")
+        self.group = Group.objects.create(name="Group A", description="A", coach=self.coach)
+        self.players = [
+            Player.objects.create(group=self.group, name=name, age=13) for name in ("Alice", "Bob", "Charlie")
+        ]
+        PlayerEvaluation.objects.create(player=self.players[0], coach=self.coach, passing=4, speed=5)
+        self.other_user = User.objects.create_user(username="coach2", password="coach123")
+        Coach.objects.create(user=self.other_user, bio="Other")
+        self.client = APIClient()
+
+    @override_settings(REPORT_RENDER_WORKERS=2)
+    def test_zip_contains_one_pdf_per_player(self):
+        self.client.force_authenticate(user=self.coach_user)
+        with self.assertNumQueries(3):
+            res = self.client.get(f"/api/groups/{self.group.id}/player-reports.zip/")
+            body = b"".join(res.streaming_content)
+        self.assertEqual(res.status_code, 200)
+        self.assertEqual(res["Content-Type"], "application/zip")
+        with zipfile.ZipFile(io.BytesIO(body)) as archive:
+            names = sorted(archive.namelist())
+            self.assertEqual(names, sorted(f"player_{p.id}_report.pdf" for p in self.players))
+            for name in names:
+                self.assertEqual(archive.read(name)[:4], b"%PDF")
+                # PDFs are compressed already
+                self.assertEqual(archive.getinfo(name).compress_type, zipfile.ZIP_STORED)
+
+    @override_settings(REPORT_RENDER_WORKERS=1)
+    def test_zip_renders_in_the_request_with_one_worker(self):
+        self.client.force_authenticate(user=self.coach_user)
+        with mock.patch("core.pdf.report_pool") as pool:
+            res = self.client.get(f"/api/groups/{self.group.id}/player-reports.zip/")
+            body = b"".join(res.streaming_content)
+            # A single player never goes to the pool either
+            reports = list(iter_player_reports(self.players[:1], max_workers=4))
+        pool.assert_not_called()
+        self.assertEqual(reports[0][1][:4], b"%PDF")
+        with zipfile.ZipFile(io.BytesIO(body)) as archive:
+            self.assertEqual(len(archive.namelist()), len(self.players))
+
+    def test_report_pools_are_kept_per_size(self):
+        with mock.patch.dict("core.pdf._report_pools", clear=True), mock.patch("core.pdf.ProcessPoolExecutor") as executor:
+            executor.side_effect = lambda **kwargs: mock.Mock(max_workers=kwargs["max_workers"])
+            self.assertIs(report_pool(2), report_pool(2))
+            self.assertEqual(report_pool(3).max_workers, 3)
+        self.assertEqual(executor.call_count, 2)
+
+    def test_other_coach_cannot_download(self):
+        self.client.force_authenticate(user=self.other_user)
+        res = self.client.get(f"/api/groups/{self.group.id}/player-reports.zip/")
+        self.assertEqual(res.status_code, 404)
+
+
+class GroupReportMemoryTestCase(TestCase):
+    def setUp(self):
+        self.media_root = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.media_root, ignore_errors=True)
+        self.coach_user = User.objects.create_user(username="coach1", password="coach123")
+        self.coach = Coach.objects.create(user=self.coach_user, bio="Coach")
+        self.group = Group.objects.create(name="Group A", description="A", coach=self.coach)
+
+    def _write_photo(self, name, size=(1200, 1600)):
+        from pathlib import Path
+        from PIL import Image as PILImage
+
+        path = Path(self.media_root) / name
+        path.parent.mkdir(parents=True, exist_ok=True)
+        PILImage.new("RGB", size, (200, 30, 30)).save(path, "JPEG")
+        return name
+
+    def test_duplicate_photos_share_one_downscaled_image(self):
+        with self.settings(MEDIA_ROOT=self.media_root):
+            name = self._write_photo("player_photos/a.jpg")
+            cache = _ReportImageCache(width=50, height=50)
+            first = cache.get(Player(name="A", photo=name).photo)
+            second = cache.get(Player(name="B", photo=name).photo)
+            self.assertIs(first, second)
+            from PIL import Image as PILImage
+
+            with PILImage.open(first.filename) as thumb:
+                self.assertLessEqual(max(thumb.size), 100)
+
+    def test_group_report_is_spooled_file(self):
+        with self.settings(MEDIA_ROOT=self.media_root):
+            name = self._write_photo("player_photos/a.jpg")
+            for i in range(30):
+                Player.objects.create(group=self.group, name=f"P{i}", age=12, photo=name if i % 2 else "")
+            group = Group.objects.select_related("coach__user").get(pk=self.group.pk)
+            with self.assertNumQueries(1):
+                pdf_file = render_group_report_file(group)
+            with pdf_file:
+                self.assertEqual(pdf_file.read(4), b"%PDF")
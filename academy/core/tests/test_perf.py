@@ -0,0 +1,86 @@
+import json
+
+from django.contrib.auth.models import User
+from django.test import TestCase, override_settings
+from rest_framework.test import APIClient
+
+from core.models import Coach, Group, Player
+from core.perf import RequestMetrics, activate, deactivate, timer
+
+
+class PerformanceMiddlewareTestCase(TestCase):
+    def setUp(self):
+        self.admin = User.objects.create_user(username="admin", password="admin123", is_staff=True)
+        coach = Coach.objects.create(user=User.objects.create_user(username="coach1", password="coach123"))
+        self.group = Group.objects.create(name="Group A", coach=coach)
+        Player.objects.create(group=self.group, name="Alice", age=12)
+        self.client = APIClient()
+        self.client.force_authenticate(user=self.admin)
+
+    def timings(self, response):
+        entries = {}
+        for part in response["Server-Timing"].split(", "):
+            name, *params = part.split(";")
+            entries[name] = dict(p.split("=", 1) for p in params)
+        return entries
+
+    def test_server_timing_header(self):
+        res = self.client.get("/api/players/")
+        self.assertEqual(res.status_code, 200)
+        timings = self.timings(res)
+        self.assertIn("db", timings)
+        self.assertRegex(timings["db"]["desc"], r'^"[1-9]\d* queries"$')
+        for phase in ("serialize", "render", "total"):
+            self.assertIn(phase, timings)
+        self.assertGreaterEqual(float(timings["total"]["dur"]), float(timings["serialize"]["dur"]))
+
+    @override_settings(PERF_SERVER_TIMING=False)
+    def test_server_timing_is_for_staff_only(self):
+        coach = User.objects.get(username="coach1")
+        self.client.force_authenticate(user=coach)
+        with self.assertLogs("core.perf", level="INFO") as logs:
+            res = self.client.get("/api/players/")
+        self.assertEqual(res.status_code, 200)
+        self.assertNotIn("Server-Timing", res)
+        self.assertEqual(json.loads(logs.records[-1].getMessage())["path"], "/api/players/")
+        self.client.force_authenticate(user=None)
+        self.assertNotIn("Server-Timing", self.client.get("/api/players/"))
+        with override_settings(PERF_SERVER_TIMING=True):
+            self.client.force_authenticate(user=coach)
+            self.assertIn("Server-Timing", self.client.get("/api/players/"))
+
+    def test_jwt_authentication_is_timed(self):
+        token = self.client.post("/api/auth/token/", {"username": "admin", "password": "admin123"}, format="json").data["access"]
+        client = APIClient()
+        client.credentials(HTTP_AUTHORIZATION=f"Bearer {token}")
+        res = client.get("/api/players/")
+        self.assertEqual(res.status_code, 200)
+        self.assertIn("auth", self.timings(res))
+
+    @override_settings(PERF_SLOW_REQUEST_MS=0, PERF_SLOW_TOP_QUERIES=2)
+    def test_slow_requests_log_top_queries(self):
+        with self.assertLogs("core.perf.slow", level="WARNING") as logs:
+            self.client.get(f"/api/groups/{self.group.id}/")
+        record = json.loads(logs.records[-1].getMessage())
+        self.assertEqual(record["path"], f"/api/groups/{self.group.id}/")
+        self.assertEqual(record["status"], 200)
+        self.assertGreater(record["db_queries"], 0)
+        self.assertTrue(0 < len(record["top_queries"]) <= 2)
+        self.assertIn("SELECT", record["top_queries"][0]["sql"])
+
+
+class TimerTestCase(TestCase):
+    def test_nested_timers_count_once(self):
+        metrics = RequestMetrics()
+        token = activate(metrics)
+        try:
+            with timer("serialize"):
+                with timer("serialize"):
+                    pass
+        finally:
+            deactivate(token)
+        self.assertEqual(list(metrics.timings), ["serialize"])
+
+    def test_timer_outside_request_is_noop(self):
+        with timer("serialize"):
+            pass
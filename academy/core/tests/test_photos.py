@@ -0,0 +1,94 @@
+import shutil
+import tempfile
+from io import BytesIO, StringIO
+from unittest import mock
+
+from django.contrib.auth.models import User
+from django.core.files.storage import default_storage
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.core.management import call_command
+from django.test import TestCase
+from PIL import Image
+from rest_framework.test import APIClient
+
+from core.images import PHOTO_VARIANTS, VARIANT_FORMATS, variant_name
+from core.models import Coach, Group, Player
+
+
+def make_jpeg(size=(3000, 2000), orientation=None, name="photo.jpg"):
+    im = Image.new("RGB", size, (10, 120, 200))
+    exif = Image.Exif()
+    exif[0x010F] = "PhoneMaker"  # Make
+    if orientation:
+        exif[0x0112] = orientation
+    out = BytesIO()
+    im.save(out, "JPEG", exif=exif)
+    return SimpleUploadedFile(name, out.getvalue(), content_type="image/jpeg")
+
+
+class PhotoVariantsTestCase(TestCase):
+    def setUp(self):
+        media_root = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, media_root, ignore_errors=True)
+        override = self.settings(MEDIA_ROOT=media_root)
+        override.enable()
+        self.addCleanup(override.disable)
+
+        self.coach_user = User.objects.create_user(username="coach1", password="coach123")
+        self.coach = Coach.objects.create(user=self.coach_user, bio="Coach")
+        self.group = Group.objects.create(name="Group A", description="A", coach=self.coach)
+        self.client = APIClient()
+        self.client.force_authenticate(user=self.coach_user)
+
+    def test_player_upload_is_normalized_and_variants_exposed(self):
+        payload = {"group": self.group.id, "name": "Alice", "birth_date": "2013-05-01", "photo": make_jpeg(orientation=6)}
+        res = self.client.post("/api/players/", payload, format="multipart")
+        self.assertEqual(res.status_code, 201)
+
+        player = Player.objects.get(pk=res.data["id"])
+        with default_storage.open(player.photo.name, "rb") as fh, Image.open(fh) as im:
+            # Rotated 90 degrees by the orientation tag, capped and stripped of EXIF
+            self.assertEqual(im.size, (1067, 1600))
+            self.assertEqual(len(im.getexif()), 0)
+
+        variants = res.data["photo_variants"]
+        self.assertEqual(set(variants), set(PHOTO_VARIANTS))
+        self.assertTrue(variants["thumb"]["webp"].endswith(variant_name(player.photo.name, "thumb", "webp")))
+        with default_storage.open(variant_name(player.photo.name, "thumb", "jpeg"), "rb") as fh, Image.open(fh) as im:
+            self.assertEqual(max(im.size), PHOTO_VARIANTS["thumb"])
+
+    def test_me_patch_processes_coach_photo(self):
+        res = self.client.patch("/api/auth/me/", {"photo": make_jpeg()}, format="multipart")
+        self.assertEqual(res.status_code, 200)
+        self.coach.refresh_from_db()
+        self.assertTrue(default_storage.exists(variant_name(self.coach.photo.name, "small", "webp")))
+        self.assertIsNotNone(res.data["coach"]["photo_variants"])
+
+    def test_missing_variants_fall_back_to_the_original(self):
+        player = Player.objects.create(group=self.group, name="Bob", age=13)
+        player.photo.save("legacy.jpg", make_jpeg(), save=True)
+        res = self.client.get(f"/api/players/{player.pk}/")
+        self.assertEqual(res.status_code, 200)
+        original = res.data["photo"]
+        self.assertEqual(
+            res.data["photo_variants"], {variant: {fmt: original for fmt in VARIANT_FORMATS} for variant in PHOTO_VARIANTS}
+        )
+        # The values()-based list path too, with one storage lookup per photo
+        storage_class = type(default_storage._wrapped)
+        with mock.patch.object(storage_class, "exists", autospec=True, side_effect=storage_class.exists) as exists:
+            listed = self.client.get("/api/players/", {"group": self.group.pk}).json()
+        self.assertEqual(exists.call_count, 1)
+        rows = listed["results"] if isinstance(listed, dict) else listed
+        self.assertEqual(rows[0]["photo_variants"]["thumb"]["webp"], original)
+
+    def test_me_patch_rejects_non_image(self):
+        upload = SimpleUploadedFile("notes.jpg", b"not an image", content_type="image/jpeg")
+        res = self.client.patch("/api/auth/me/", {"photo": upload}, format="multipart")
+        self.assertEqual(res.status_code, 400)
+
+    def test_backfill_command_creates_missing_variants(self):
+        player = Player.objects.create(group=self.group, name="Bob", age=13)
+        player.photo.save("legacy.jpg", make_jpeg(), save=True)
+        call_command("generate_photo_variants", stdout=StringIO())
+        for variant in PHOTO_VARIANTS:
+            self.assertTrue(default_storage.exists(variant_name(player.photo.name, variant, "jpeg")))
@@ -0,0 +1,76 @@
+import datetime
+import json
+import uuid
+from decimal import Decimal
+
+import msgpack
+from django.contrib.auth.models import User
+from django.test import TestCase
+from rest_framework.renderers import JSONRenderer
+from rest_framework.test import APIClient
+
+from core.models import Coach, Group, Player, PlayerEvaluation
+from core.renderers import MessagePackRenderer, ORJSONRenderer
+
+
+class RendererEncodingTestCase(TestCase):
+    def test_special_types_match_drf_json(self):
+        data = {
+            "when": datetime.datetime(2026, 3, 1, 12, 30, 15, 123456, tzinfo=datetime.timezone.utc),
+            "day": datetime.date(2026, 3, 1),
+            "at": datetime.time(9, 15),
+            "amount": Decimal("12.50"),
+            "id": uuid.UUID(int=1),
+            "duration": datetime.timedelta(minutes=90),
+            "arabic": "التمرير",
+        }
+        expected = json.loads(JSONRenderer().render(data))
+        self.assertEqual(expected["when"], "2026-03-01T12:30:15.123456Z")
+        self.assertEqual(json.loads(ORJSONRenderer().render(data)), expected)
+        self.assertEqual(msgpack.unpackb(MessagePackRenderer().render(data)), expected)
+
+    def test_file_fields_render_as_urls(self):
+        data = {"photo": Player(photo="player_photos/abc.jpg").photo, "empty": Player().photo}
+        expected = {"photo": "/media/player_photos/abc.jpg", "empty": None}
+        self.assertEqual(json.loads(ORJSONRenderer().render(data)), expected)
+        self.assertEqual(msgpack.unpackb(MessagePackRenderer().render(data)), expected)
+
+    def test_indent_is_honoured(self):
+        rendered = ORJSONRenderer().render({"a": 1}, "application/json; indent=4")
+        self.assertEqual(rendered, b'{\n  "a": 1\n}')
+
+
+class ContentNegotiationTestCase(TestCase):
+    def setUp(self):
+        self.admin = User.objects.create_user(username="admin", password="admin123", is_staff=True)
+        coach = Coach.objects.create(user=User.objects.create_user(username="coach1", password="coach123"))
+        self.group = Group.objects.create(name="Group A", coach=coach)
+        player = Player.objects.create(group=self.group, name="Alice", age=12, birth_date=datetime.date(2014, 3, 1))
+        PlayerEvaluation.objects.create(player=player, coach=coach, passing=4)
+        self.client = APIClient()
+        self.client.force_authenticate(user=self.admin)
+
+    def test_json_is_default(self):
+        res = self.client.get(f"/api/groups/{self.group.id}/")
+        self.assertEqual(res["Content-Type"], "application/json")
+        self.assertEqual(json.loads(res.content)["name"], "Group A")
+
+    def test_msgpack_response_matches_json(self):
+        url = f"/api/groups/{self.group.id}/"
+        as_json = json.loads(self.client.get(url).content)
+        res = self.client.get(url, HTTP_ACCEPT="application/msgpack")
+        self.assertEqual(res["Content-Type"], "application/msgpack")
+        self.assertEqual(msgpack.unpackb(res.content), as_json)
+
+    def test_msgpack_request_body(self):
+        body = msgpack.packb({"group": self.group.id, "name": "Bob", "birth_date": "2015-05-05"})
+        res = self.client.post("/api/players/", body, content_type="application/msgpack", HTTP_ACCEPT="application/msgpack")
+        self.assertEqual(res.status_code, 201)
+        self.assertEqual(msgpack.unpackb(res.content)["name"], "Bob")
+
+    def test_malformed_bodies_are_rejected(self):
+        res = self.client.post("/api/players/", b"{not json", content_type="application/json")
+        self.assertEqual(res.status_code, 400)
+        self.assertIn("JSON parse error", res.json()["detail"])
+        res = self.client.post("/api/players/", b"\xc1", content_type="application/msgpack")
+        self.assertEqual(res.status_code, 400)
@@ -0,0 +1,87 @@
+from django.contrib.auth.models import User
+from django.core.cache import cache
+from django.core.exceptions import MiddlewareNotUsed
+from django.db import router, transaction
+from django.http import HttpResponse, StreamingHttpResponse
+from django.test import RequestFactory, TransactionTestCase, override_settings
+from rest_framework_simplejwt.tokens import AccessToken
+
+from core.middleware import ReplicaReadMiddleware
+from core.models import Player
+from core.replicas import ReplicaRouter
+
+
+@override_settings(DATABASE_REPLICAS=["replica1"], REPLICA_STICKY_SECONDS=10)
+class ReplicaRoutingTestCase(TransactionTestCase):
+    # Not TestCase: its wrapping transaction would keep every read on the primary
+    def setUp(self):
+        cache.clear()
+        self.factory = RequestFactory()
+        self.coach = User.objects.create_user(username="coach1", password="coach123")
+        self.other = User.objects.create_user(username="coach2", password="coach123")
+        self.reads = []
+
+        def view(request):
+            self.reads.append(router.db_for_read(Player))
+            with transaction.atomic():
+                self.reads.append(router.db_for_read(Player))
+            return HttpResponse()
+
+        self.middleware = ReplicaReadMiddleware(view)
+
+    def request(self, method, path="/api/players/", user=None):
+        headers = {"HTTP_AUTHORIZATION": f"Bearer {AccessToken.for_user(user)}"} if user else {}
+        self.reads.clear()
+        self.middleware(getattr(self.factory, method)(path, **headers))
+        return self.reads[0]
+
+    def test_safe_api_reads_go_to_the_replica(self):
+        self.assertEqual(self.request("get", user=self.coach), "replica1")
+        # Transactions read from the primary, as does anything outside the API
+        self.assertEqual(self.reads[1], "default")
+        self.assertEqual(self.request("get", "/admin/core/player/", user=self.coach), "default")
+        self.assertEqual(self.request("post", user=self.coach), "default")
+        self.assertEqual(router.db_for_read(Player), "default")
+
+    def test_clients_read_their_own_writes(self):
+        self.request("patch", user=self.coach)
+        self.assertEqual(self.request("get", user=self.coach), "default")
+        self.assertEqual(self.request("get", user=self.other), "replica1")
+        self.assertEqual(self.request("get"), "replica1")
+        cache.clear()  # the pin expired
+        self.assertEqual(self.request("get", user=self.coach), "replica1")
+
+    def test_streamed_bodies_keep_their_replica(self):
+        def stream(request):
+            return StreamingHttpResponse(router.db_for_read(Player) for _ in range(2))
+
+        response = ReplicaReadMiddleware(stream)(self.factory.get("/api/players/?stream=1"))
+        self.assertEqual(b"".join(response.streaming_content), b"replica1replica1")
+        self.assertEqual(router.db_for_read(Player), "default")
+
+    def test_reads_after_a_write_use_the_primary(self):
+        def view(request):
+            self.reads.append(router.db_for_read(Player))
+            # e.g. schedules expanded or the default season created by a read
+            Player.objects.filter(pk=0).update(name="Ali")
+            self.reads.append(router.db_for_read(Player))
+            return HttpResponse()
+
+        self.reads.clear()
+        ReplicaReadMiddleware(view)(self.factory.get("/api/players/"))
+        self.assertEqual(self.reads, ["replica1", "default"])
+        # Only for that request
+        self.assertEqual(self.request("get", user=self.other), "replica1")
+
+    def test_writes_and_migrations_stay_on_the_primary(self):
+        replica_router = ReplicaRouter()
+        player = Player(name="Ali")
+        player._state.db = "replica1"
+        self.assertEqual(replica_router.db_for_write(Player, instance=player), "default")
+        self.assertFalse(replica_router.allow_migrate("replica1", "core"))
+        self.assertIsNone(replica_router.allow_migrate("default", "core"))
+
+    @override_settings(DATABASE_REPLICAS=[])
+    def test_not_installed_without_replicas(self):
+        with self.assertRaises(MiddlewareNotUsed):
+            ReplicaReadMiddleware(lambda request: HttpResponse())
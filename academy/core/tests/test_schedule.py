@@ -0,0 +1,120 @@
+import datetime
+from unittest import mock
+
+from django.contrib.auth.models import User
+from django.test import TestCase
+from rest_framework.test import APIClient
+
+from core.attendance import update_days
+from core.models import Coach, Group, Player, TrainingSchedule, TrainingSession
+from core.schedule import attendance_rates, calendar, week_window
+
+
+MARCH = datetime.date(2026, 3, 1)
+# 2026-03-02 is a Monday
+TODAY = datetime.date(2026, 3, 4)
+
+
+def on(day):
+    return datetime.date(2026, 3, day)
+
+
+@mock.patch("django.utils.timezone.localdate", lambda *args: TODAY)
+class TrainingScheduleTestCase(TestCase):
+    def setUp(self):
+        self.admin = User.objects.create_user(username="admin", password="admin123", is_staff=True)
+        self.coach = Coach.objects.create(user=User.objects.create_user(username="coach1", password="coach123"))
+        self.group = Group.objects.create(name="Group A", coach=self.coach)
+        self.other = Group.objects.create(name="Group B", coach=Coach.objects.create(user=User.objects.create_user(username="coach2")))
+        self.players = [Player.objects.create(group=self.group, name=f"P{i}", age=10) for i in range(3)]
+        self.monday = TrainingSchedule.objects.create(group=self.group, weekday=0, start_time=datetime.time(17), starts_on=MARCH)
+        self.client = APIClient()
+        self.client.force_authenticate(user=self.coach.user)
+
+    def test_schedules_expand_lazily(self):
+        self.assertFalse(TrainingSession.objects.exists())
+        sessions = calendar([self.group.id], on(8), on(17))
+        self.assertEqual([s.date for s in sessions], [on(9), on(16)])
+        # Everything from starts_on up to the window end now exists, once
+        self.assertEqual(TrainingSession.objects.count(), 3)
+        self.monday.refresh_from_db()
+        self.assertEqual(self.monday.expanded_until, on(17))
+        with self.assertNumQueries(2):  # expansion check (nothing pending), sessions
+            self.assertEqual(len(calendar([self.group.id], on(1), on(17))), 3)
+
+    def test_calendar_endpoint_defaults_to_this_week(self):
+        TrainingSchedule.objects.create(group=self.group, weekday=2, start_time=datetime.time(18), starts_on=MARCH, ends_on=on(4))
+        TrainingSchedule.objects.create(group=self.other, weekday=0, start_time=datetime.time(9), starts_on=MARCH)
+        self.assertEqual(week_window(), (on(2), on(8)))
+        res = self.client.get("/api/sessions/")
+        self.assertEqual(res.status_code, 200)
+        self.assertEqual([(s["date"], s["start_time"]) for s in res.json()], [("2026-03-02", "17:00:00"), ("2026-03-04", "18:00:00")])
+        res = self.client.get("/api/sessions/?since=2026-03-09&until=2026-03-15")
+        self.assertEqual([s["date"] for s in res.json()], ["2026-03-09"])
+        self.assertEqual(self.client.get("/api/sessions/?since=2026-01-01&until=2027-06-01").status_code, 400)
+
+        self.client.force_authenticate(user=self.admin)
+        self.assertEqual(len(self.client.get("/api/sessions/").json()), 3)
+        self.assertEqual(len(self.client.get(f"/api/sessions/?group={self.other.id}").json()), 1)
+
+    def test_edited_sessions_survive_schedule_changes(self):
+        calendar([self.group.id], MARCH, on(31))
+        session = TrainingSession.objects.get(date=on(16))
+        res = self.client.patch(f"/api/sessions/{session.id}/", {"cancelled": True}, format="json")
+        self.assertEqual(res.status_code, 200)
+
+        res = self.client.patch(f"/api/schedules/{self.monday.id}/", {"weekday": 1, "start_time": "16:00"}, format="json")
+        self.assertEqual(res.status_code, 200)
+        dates = list(calendar([self.group.id], MARCH, on(31)).values_list("date", "cancelled"))
+        # Past Monday kept, edited Monday kept, the rest moved to Tuesdays
+        self.assertEqual(dates, [(on(2), False), (on(10), False), (on(16), True), (on(17), False), (on(24), False), (on(31), False)])
+
+    def test_coaches_only_schedule_their_groups(self):
+        res = self.client.post("/api/schedules/", {"group": self.other.id, "weekday": 1, "start_time": "10:00", "starts_on": "2026-03-01"}, format="json")
+        self.assertEqual(res.status_code, 403)
+        res = self.client.post("/api/sessions/", {"group": self.group.id, "date": "2026-03-05", "start_time": "10:00"}, format="json")
+        self.assertEqual(res.status_code, 201)
+        res = self.client.post("/api/schedules/", {"group": self.group.id, "weekday": 1, "start_time": "10:00", "starts_on": "2026-03-05", "ends_on": "2026-03-01"}, format="json")
+        self.assertEqual(res.status_code, 400)
+
+    def test_attendance_rates_against_scheduled_sessions(self):
+        ids = [p.id for p in self.players]
+        update_days(ids[:2], MARCH, mark=[2, 9])
+        update_days(ids[:1], MARCH, mark=[16, 17])  # the 17th is not a session
+        calendar([self.group.id], MARCH, on(31))
+        TrainingSession.objects.filter(date=on(23)).update(cancelled=True)
+        with self.assertNumQueries(2):  # expansion check, aggregate
+            rates = attendance_rates(self.group, MARCH, on(31))
+        self.assertEqual(
+            [(r["player"], r["sessions"], r["attended"], r["rate"]) for r in rates],
+            [(ids[0], 4, 3, 0.75), (ids[1], 4, 2, 0.5), (ids[2], 4, 0, 0.0)],
+        )
+        res = self.client.get(f"/api/groups/{self.group.id}/attendance-rates/?since=2026-03-01&until=2026-03-10")
+        self.assertEqual([r["sessions"] for r in res.json()], [2, 2, 2])
+        # Streak stats now count scheduled sessions only, up to today
+        stats = self.client.get(f"/api/groups/{self.group.id}/attendance-stats/?since=2026-03&until=2026-03").json()
+        self.assertEqual([(s["sessions"], s["attended"]) for s in stats], [(1, 1), (1, 1), (1, 0)])
+
+    def test_attendance_stats_skip_sessions_after_today(self):
+        ids = [p.id for p in self.players]
+        update_days(ids[:1], MARCH, mark=[2])
+        # Mondays the 9th to the 30th are still to come
+        for until in ("", "?until=2026-03", "?until=2026-05"):
+            stats = self.client.get(f"/api/groups/{self.group.id}/attendance-stats/{until}").json()
+            self.assertEqual(
+                [(s["sessions"], s["rate"], s["current_absence"], s["longest_absence"]) for s in stats],
+                [(1, 1.0, 0, 0), (1, 0.0, 1, 1), (1, 0.0, 1, 1)],
+            )
+
+    def test_sessions_are_stored_up_to_the_horizon(self):
+        # 12 weeks from TODAY
+        self.assertEqual(self.client.get("/api/sessions/?since=9000-01-01&until=9000-12-31").status_code, 400)
+        res = self.client.get(f"/api/groups/{self.group.id}/attendance-rates/?since=2026-05-01&until=2026-06-30")
+        self.assertEqual(res.status_code, 400)
+        self.assertEqual(self.client.get("/api/sessions/?since=2026-05-25&until=2026-05-27").status_code, 200)
+        self.assertFalse(TrainingSession.objects.filter(date__gt=datetime.date(2026, 5, 27)).exists())
+        res = self.client.get(f"/api/groups/{self.group.id}/attendance-stats/?until=9000-12")
+        self.assertEqual(res.status_code, 200)
+        self.monday.refresh_from_db()
+        self.assertEqual(self.monday.expanded_until, datetime.date(2026, 5, 27))
+        self.assertEqual(TrainingSession.objects.count(), 13)
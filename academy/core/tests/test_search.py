@@ -0,0 +1,141 @@
+import datetime
+import io
+from io import StringIO
+from unittest import mock
+
+from django.contrib.auth.models import User
+from django.core.management import call_command
+from django.db import connection
+from django.test import TestCase
+from rest_framework.test import APIClient
+
+from core.importing import PlayerImporter, open_csv
+from core.models import Academy, Coach, Group, Player, SearchEntry
+from core import search
+from core.search import matching, normalize
+from core.seasons import start_season
+
+
+class SearchTestCase(TestCase):
+    def setUp(self):
+        self.admin = User.objects.create_user(username="admin", password="admin123", is_staff=True)
+        self.coach_user = User.objects.create_user(username="coach1", password="coach123", first_name="Karim", last_name="Said")
+        self.coach = Coach.objects.create(user=self.coach_user)
+        self.other = Coach.objects.create(user=User.objects.create_user(username="coach2", password="coach123"))
+        self.group = Group.objects.create(name="Falcons U12", coach=self.coach)
+        self.other_group = Group.objects.create(name="Eagles U10", coach=self.other)
+        self.ali = Player.objects.create(group=self.group, name="Ali Hassan", age=11)
+        self.ahmed = Player.objects.create(group=self.group, name="أَحْمَد عَلِيّ", age=11)
+        self.jose = Player.objects.create(group=self.other_group, name="José Álvarez", age=9)
+        self.client = APIClient()
+        self.client.force_authenticate(user=self.admin)
+
+    def search(self, query, **params):
+        res = self.client.get("/api/search/", {"q": query, **params})
+        self.assertEqual(res.status_code, 200)
+        return [(row["type"], row["name"]) for row in res.json()]
+
+    def test_normalize_folds_arabic_and_latin_variants(self):
+        self.assertEqual(normalize("أَحْمَد"), "احمد")
+        self.assertEqual(normalize("إسلام آمنة مصطفى"), "اسلام امنه مصطفي")
+        self.assertEqual(normalize("عـــلي"), "علي")
+        self.assertEqual(normalize("José  ÁLVAREZ-Núñez"), "jose alvarez nunez")
+
+    def test_word_prefixes_in_any_order(self):
+        self.assertEqual(self.search("ali"), [("player", "Ali Hassan")])
+        self.assertEqual(self.search("has al"), [("player", "Ali Hassan")])
+        self.assertEqual(self.search("احمد"), [("player", "أَحْمَد عَلِيّ")])
+        self.assertEqual(self.search("أحم علي"), [("player", "أَحْمَد عَلِيّ")])
+        self.assertEqual(self.search("alva"), [("player", "José Álvarez")])
+        # Prefixes of words only, not substrings
+        self.assertEqual(self.search("assan"), [])
+        self.assertEqual(self.search("fal"), [("group", "Falcons U12")])
+        self.assertEqual(self.search("kar"), [("coach", "Karim Said")])
+        self.assertEqual(self.search("coach"), [("coach", "coach2"), ("coach", "Karim Said")])
+        self.assertEqual(self.search(""), [])
+        self.assertEqual(self.search('ali"* -'), [("player", "Ali Hassan")])
+
+    def test_type_limit_and_validation(self):
+        self.assertEqual(self.search("u1"), [("group", "Eagles U10"), ("group", "Falcons U12")])
+        self.assertEqual(self.search("a", type="player", limit=1), [("player", "Ali Hassan")])
+        self.assertEqual(self.client.get("/api/search/", {"q": "a", "type": "evaluation"}).status_code, 400)
+        self.assertEqual(self.client.get("/api/search/", {"q": "a", "limit": "0"}).status_code, 400)
+        row = self.client.get("/api/search/", {"q": "ali h"}).json()[0]
+        self.assertEqual(row, {"type": "player", "id": self.ali.id, "name": "Ali Hassan", "group": self.group.id})
+
+    def test_coaches_find_their_own_rows(self):
+        self.client.force_authenticate(user=self.coach_user)
+        self.assertEqual(self.search("a"), [("player", "Ali Hassan")])
+        self.assertEqual(self.search("coach"), [("coach", "Karim Said")])
+        self.assertEqual(self.search("eag"), [])
+
+    def test_scoped_to_academy_and_season(self):
+        north = Academy.objects.create(name="North", slug="north")
+        north_coach = Coach.objects.create(user=User.objects.create_user(username="coach3"), academy=north)
+        Player.objects.create(group=Group.objects.create(name="Lions", coach=north_coach), name="Alan", age=10)
+        self.assertEqual(self.search("al", type="player"), [("player", "Ali Hassan"), ("player", "José Álvarez")])
+        res = self.client.get("/api/search/", {"q": "al"}, headers={"X-Academy": "north"})
+        self.assertEqual([row["name"] for row in res.json()], ["Alan"])
+
+        old = self.group.season
+        start_season("Next", datetime.date(2027, 1, 1), datetime.date(2027, 12, 31))
+        self.assertEqual(self.search("ali"), [])
+        self.assertEqual(self.search("ali", season=old.id), [("player", "Ali Hassan")])
+        new, _, _ = start_season("Later", datetime.date(2028, 1, 1), datetime.date(2028, 12, 31))
+        self.assertEqual(self.search("ali", season="all"), [("player", "Ali Hassan")])
+        self.assertEqual(SearchEntry.objects.filter(season=new).count(), 0)
+        self.assertEqual(self.search("karim"), [("coach", "Karim Said")])
+
+    def test_signals_keep_entries_current(self):
+        self.ali.name = "Samir Nasser"
+        self.ali.save()
+        self.assertEqual(self.search("ali"), [])
+        self.assertEqual(self.search("sam"), [("player", "Samir Nasser")])
+        self.coach_user.first_name = "Kamal"
+        self.coach_user.save()
+        self.assertEqual(self.search("kam"), [("coach", "Kamal Said")])
+        # The group's new coach sees its players
+        self.group.coach = self.other
+        self.group.save()
+        self.client.force_authenticate(user=self.other.user)
+        self.assertEqual(self.search("sam"), [("player", "Samir Nasser")])
+        self.group.delete()
+        self.assertEqual(self.search("sam"), [])
+        self.assertFalse(SearchEntry.objects.filter(kind__in=["player", "group"], object_id=self.group.id).exists())
+        self.assertEqual(SearchEntry.objects.count(), 4)
+
+    def test_bulk_paths_and_rebuild(self):
+        report = PlayerImporter().run(open_csv(io.BytesIO(f"name,group_id,age\nمحمود,{self.group.id},10\n".encode())))
+        self.assertTrue(report.imported)
+        self.assertEqual(self.search("محم"), [("player", "محمود")])
+        Player.objects.filter(pk=self.jose.pk).update(name="Pedro")
+        SearchEntry.objects.filter(kind="coach").delete()
+        out = StringIO()
+        call_command("rebuild_search_index", stdout=out)
+        self.assertIn("Indexed 8 names", out.getvalue())
+        self.assertEqual(self.search("ped"), [("player", "Pedro")])
+        self.assertEqual(self.search("kar"), [("coach", "Karim Said")])
+
+    def test_admin_search_uses_the_index(self):
+        self.client.force_login(User.objects.create_superuser(username="root", password="root1234"))
+        res = self.client.get("/admin/core/player/", {"q": "has"})
+        self.assertContains(res, "Ali Hassan")
+        self.assertNotContains(res, "Álvarez")
+
+    def test_matching_is_a_full_text_lookup(self):
+        if connection.vendor != "sqlite":
+            self.skipTest("Query plans are checked on SQLite only")
+        # The full-text matches drive the query; entries are then read by primary key
+        plan = matching("ali").filter(academy=self.group.academy_id, kind__in=["player", "group"]).explain()
+        self.assertIn("VIRTUAL TABLE INDEX", plan)
+        self.assertIn("USING INTEGER PRIMARY KEY (rowid=?)", plan)
+
+    def test_a_missing_full_text_table_is_checked_again(self):
+        if connection.vendor != "sqlite":
+            self.skipTest("SQLite only")
+        search._fts_databases.clear()
+        # e.g. a replica not migrated yet: LIKE matching, and no cached answer
+        with mock.patch.object(connection.introspection, "table_names", return_value=[]):
+            self.assertNotIn("MATCH", str(matching("ali").query))
+        self.assertIn("MATCH", str(matching("ali").query))
+        self.assertEqual(search._fts_databases, {"default"})
@@ -0,0 +1,164 @@
+import datetime
+from io import StringIO
+
+from django.contrib.auth.models import User
+from django.core.management import CommandError, call_command
+from django.db import connection
+from django.test import TestCase
+from django.utils import timezone
+from rest_framework.test import APIClient
+
+from core.attendance import update_days
+from core.history import record_snapshots
+from core.models import (
+    AttendanceArchive,
+    Coach,
+    EvaluationRollup,
+    EvaluationSnapshot,
+    Group,
+    Player,
+    PlayerAttendance,
+    PlayerEvaluation,
+    Season,
+    TrainingSession,
+    TrainingSessionArchive,
+)
+from core.seasons import archive_season, season_history, season_q, start_season
+
+
+def at(year, month, day):
+    return timezone.make_aware(datetime.datetime(year, month, day, 12))
+
+
+class SeasonTestCase(TestCase):
+    def setUp(self):
+        self.admin = User.objects.create_user(username="admin", password="admin123", is_staff=True)
+        self.coach = Coach.objects.create(user=User.objects.create_user(username="coach1", password="coach123"))
+        self.group = Group.objects.create(name="Group A", coach=self.coach)
+        self.alice = Player.objects.create(group=self.group, name="Alice", age=12)
+        self.client = APIClient()
+        self.client.force_authenticate(user=self.admin)
+
+    def names(self, url):
+        res = self.client.get(url)
+        self.assertEqual(res.status_code, 200)
+        return sorted(row["name"] for row in res.json())
+
+    def test_new_rows_join_the_active_season(self):
+        season = Season.active()
+        self.assertEqual((self.group.season, self.alice.season), (season, season))
+        self.assertEqual(Season.objects.filter(is_active=True).count(), 1)
+
+    def test_rollover_scopes_the_api(self):
+        old = Season.active()
+        new, groups, players = start_season("Next", datetime.date(2027, 1, 1), datetime.date(2027, 12, 31), carry_over=True)
+        self.assertEqual((groups, players), (1, 1))
+        self.alice.refresh_from_db()
+        self.assertEqual(self.alice.season, new)
+
+        # By default, the current groups stay behind
+        start_season("Later", datetime.date(2028, 1, 1), datetime.date(2028, 12, 31))
+        fresh = Group.objects.create(name="Group B", coach=self.coach)
+        Player.objects.create(group=fresh, name="Bob", age=10)
+        self.assertEqual(self.names("/api/groups/"), ["Group B"])
+        self.assertEqual(self.names("/api/players/"), ["Bob"])
+        self.assertEqual(self.names(f"/api/players/?season={new.id}"), ["Alice"])
+        self.assertEqual(self.names("/api/players/?season=all"), ["Alice", "Bob"])
+        self.assertEqual(self.names(f"/api/groups/?season={old.id}"), [])
+        self.assertEqual(self.client.get("/api/players/?season=last").status_code, 400)
+        self.assertEqual(self.client.get(f"/api/players/{self.alice.id}/").status_code, 404)
+
+    def test_previous_season_keeps_its_rows_by_default(self):
+        old = Season.active()
+        new, groups, players = start_season("Next", datetime.date(2027, 1, 1), datetime.date(2027, 12, 31))
+        self.assertEqual((groups, players), (0, 0))
+        self.assertEqual(list(old.groups.all()), [self.group])
+        self.assertEqual(list(old.players.all()), [self.alice])
+        self.assertFalse(new.groups.exists())
+        self.assertEqual(self.names(f"/api/players/?season={old.id}"), ["Alice"])
+
+    def test_start_season_command(self):
+        out = StringIO()
+        call_command("start_season", "2027", "--starts-on", "2027-01-01", "--ends-on", "2027-12-31", "--carry-over", stdout=out)
+        self.assertIn("carried over 1 groups and 1 players", out.getvalue())
+        self.assertEqual(Season.active().name, "2027")
+        with self.assertRaisesMessage(CommandError, "already exists"):
+            call_command("start_season", "2027", "--starts-on", "2027-01-01", "--ends-on", "2027-12-31")
+
+    def test_season_ranges_never_overlap(self):
+        start_season("2030", datetime.date(2030, 1, 1), datetime.date(2030, 12, 31))
+        # The previous season is cut short
+        start_season("2030/31", datetime.date(2030, 9, 1), datetime.date(2031, 6, 30))
+        self.assertEqual(Season.objects.get(name="2030").ends_on, datetime.date(2030, 8, 31))
+        with self.assertRaisesMessage(ValueError, "must start after it"):
+            start_season("Early", datetime.date(2030, 5, 1), datetime.date(2030, 12, 31))
+        Season.objects.create(name="2032", starts_on=datetime.date(2032, 1, 1), ends_on=datetime.date(2032, 12, 31))
+        with self.assertRaisesMessage(CommandError, "overlap 2032"):
+            call_command("start_season", "2031/32", "--starts-on", "2031-08-01", "--ends-on", "2032-03-31")
+        self.assertEqual(Season.active().name, "2030/31")
+
+        # A season that overlaps the active one (from before overlaps were refused) never takes its history
+        legacy = Season.objects.create(name="Legacy", starts_on=datetime.date(2030, 6, 1), ends_on=datetime.date(2030, 10, 31))
+        update_days([self.alice.id], datetime.date(2030, 7, 1), mark=[1])
+        update_days([self.alice.id], datetime.date(2030, 10, 1), mark=[1])
+        months = season_history(legacy)["attendance"].values_list("month", flat=True)
+        self.assertEqual(list(months), [datetime.date(2030, 7, 1)])
+
+    def test_archive_closed_season(self):
+        past = Season.objects.create(name="2024", starts_on=datetime.date(2024, 1, 1), ends_on=datetime.date(2024, 12, 31))
+        bob = Player.objects.create(group=self.group, name="Bob", age=11)
+        for player in (self.alice, bob):
+            update_days([player.id], datetime.date(2024, 11, 1), mark=[4, 11])
+            update_days([player.id], datetime.date(2024, 12, 1), mark=[2])
+        update_days([self.alice.id], datetime.date(2025, 1, 1), mark=[6])
+        for day in (datetime.date(2024, 12, 2), datetime.date(2024, 12, 9), datetime.date(2025, 1, 6)):
+            TrainingSession.objects.create(group=self.group, date=day, start_time=datetime.time(17), location="Pitch 1")
+        evaluation = PlayerEvaluation.objects.create(player=self.alice, coach=self.coach, passing=2, speed=4)
+        record_snapshots([evaluation], "save", at=at(2024, 3, 1))
+        evaluation.passing = 4
+        record_snapshots([evaluation], "save", at=at(2024, 9, 1))
+        record_snapshots([evaluation], "save", at=at(2025, 2, 1))
+
+        counts = archive_season(past, batch_size=2)
+        self.assertEqual(counts, {"attendance": 4, "sessions": 2, "snapshots": 2, "rollups": 1})
+        # Later history stays in the hot tables
+        self.assertEqual(list(PlayerAttendance.objects.values_list("month", flat=True)), [datetime.date(2025, 1, 1)])
+        self.assertEqual(list(TrainingSession.objects.values_list("date", flat=True)), [datetime.date(2025, 1, 6)])
+        self.assertEqual(EvaluationSnapshot.objects.count(), 1)
+
+        archived = AttendanceArchive.objects.get(player_id=bob.id, month=datetime.date(2024, 11, 1))
+        self.assertEqual((archived.season, archived.days, archived.day_mask), (past, 2, 0b10000001000))
+        self.assertEqual(TrainingSessionArchive.objects.filter(season=past, location="Pitch 1").count(), 2)
+        rollup = EvaluationRollup.objects.get()
+        self.assertEqual((rollup.player_id, rollup.group_id, rollup.snapshots), (self.alice.id, self.group.id, 2))
+        self.assertEqual((rollup.first_at, rollup.last_at), (at(2024, 3, 1), at(2024, 9, 1)))
+        self.assertEqual((rollup.average_rating, rollup.final_average_rating), (3.5, 4.0))
+        self.assertEqual((rollup.final_ratings["passing"], rollup.final_ratings["shooting"]), (4, None))
+
+        past.refresh_from_db()
+        self.assertIsNotNone(past.archived_at)
+        with self.assertRaisesMessage(ValueError, "was archived"):
+            archive_season(past)
+
+    def test_archive_command_refuses_open_seasons(self):
+        with self.assertRaisesMessage(CommandError, "is the active season"):
+            call_command("archive_season", Season.active().name)
+        Season.objects.create(name="Future", starts_on=datetime.date(2099, 1, 1), ends_on=datetime.date(2099, 12, 31))
+        with self.assertRaisesMessage(CommandError, "has not ended yet"):
+            call_command("archive_season", "Future")
+
+        past = Season.objects.create(name="2024", starts_on=datetime.date(2024, 1, 1), ends_on=datetime.date(2024, 12, 31))
+        update_days([self.alice.id], datetime.date(2024, 5, 1), mark=[1])
+        out = StringIO()
+        call_command("archive_season", str(past.id), "--dry-run", stdout=out)
+        self.assertEqual(out.getvalue().splitlines(), ["attendance: 1 rows", "sessions: 0 rows", "snapshots: 0 rows"])
+        call_command("archive_season", "2024", stdout=out)
+        self.assertEqual(AttendanceArchive.objects.count(), 1)
+
+    def test_active_season_reads_use_the_composite_index(self):
+        if connection.vendor != "sqlite":
+            self.skipTest("Query plans are checked on SQLite only")
+        players = Player.objects.filter(season_q(), academy=self.group.academy_id)
+        self.assertIn("USING INDEX player_academy_season_group (academy_id=? AND season_id=?)", players.explain())
+        plan = players.filter(group=self.group).explain()
+        self.assertIn("USING INDEX player_academy_season_group (academy_id=? AND season_id=? AND group_id=?)", plan)
@@ -0,0 +1,82 @@
+from io import StringIO
+
+from django.core.management import call_command
+from django.test import TestCase
+
+from core.models import RATING_FIELDS, EvaluationSnapshot, Group, Player, PlayerAttendance, PlayerEvaluation
+
+
+class SeedAcademyTestCase(TestCase):
+    def seed(self, prefix, seed=3):
+        call_command(
+            "seed_academy",
+            coaches=2,
+            groups=3,
+            players_per_group=4,
+            months=2,
+            seed=seed,
+            prefix=prefix,
+            as_of="2026-01-15",
+            batch_size=5,
+            stdout=StringIO(),
+        )
+        players = Player.objects.filter(group__name__startswith=prefix).order_by("id")
+        return [
+            (p.name, p.birth_date, p.age, [getattr(p.evaluation, f) for f in RATING_FIELDS],
+             list(p.attendance_records.order_by("month").values_list("month", "days")))
+            for p in players.select_related("evaluation")
+        ]
+
+    def test_photos_come_from_a_shared_pool(self):
+        import shutil
+        import tempfile
+
+        media_root = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, media_root, ignore_errors=True)
+        with self.settings(MEDIA_ROOT=media_root):
+            call_command("seed_academy", groups=1, players_per_group=30, months=0, photos=True, stdout=StringIO())
+        photos = set(Player.objects.values_list("photo", flat=True))
+        self.assertTrue(all(name.startswith("player_photos/") for name in photos))
+        self.assertLessEqual(len(photos), 24)
+
+    def test_generates_requested_volume(self):
+        self.seed("a")
+        self.assertEqual(Group.objects.filter(name__startswith="a ").count(), 3)
+        self.assertEqual(Player.objects.filter(group__name__startswith="a ").count(), 12)
+        self.assertEqual(PlayerEvaluation.objects.filter(player__group__name__startswith="a ").count(), 12)
+        self.assertEqual(PlayerAttendance.objects.filter(player__group__name__startswith="a ").count(), 24)
+        for group in Group.objects.filter(name__startswith="a "):
+            self.assertFalse(PlayerEvaluation.objects.filter(player__group=group).exclude(coach=group.coach).exists())
+
+    def test_same_seed_is_deterministic(self):
+        self.assertEqual(self.seed("a"), self.seed("b"))
+        self.assertNotEqual(self.seed("c", seed=4), self.seed("d"))
+
+    def test_ages_match_birth_dates(self):
+        for name, birth_date, age, _ratings, _attendance in self.seed("b"):
+            self.assertEqual(age, 2026 - birth_date.year - ((1, 15) < (birth_date.month, birth_date.day)))
+
+    def test_rows_match_what_saving_them_writes(self):
+        call_command("seed_academy", groups=2, players_per_group=3, months=2, prefix="o", batch_size=4, stdout=StringIO())
+        for model in (Player, PlayerEvaluation, PlayerAttendance):
+            objects = model.objects.filter(academy__isnull=False).order_by("pk")
+            seeded = list(objects.values())
+            self.assertTrue(seeded)
+            for obj in objects:
+                obj.save()
+            saved = list(objects.values())
+            if "updated_at" in seeded[0]:
+                self.assertTrue(all(row["updated_at"] for row in seeded))
+                for row in seeded + saved:
+                    del row["updated_at"]
+            self.assertEqual(seeded, saved)
+
+    def test_evaluations_get_an_initial_snapshot(self):
+        self.seed("h")
+        evaluations = PlayerEvaluation.objects.filter(player__group__name__startswith="h ").select_related("player")
+        snapshots = EvaluationSnapshot.objects.filter(reason="initial")
+        self.assertEqual(snapshots.count(), 12)
+        for evaluation in evaluations:
+            snapshot = snapshots.get(player=evaluation.player)
+            self.assertEqual(snapshot.group_id, evaluation.player.group_id)
+            self.assertEqual([getattr(snapshot, f) for f in RATING_FIELDS], [getattr(evaluation, f) for f in RATING_FIELDS])
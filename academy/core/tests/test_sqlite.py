@@ -0,0 +1,55 @@
+import tempfile
+from pathlib import Path
+
+from django.db import connection
+from django.db.backends.sqlite3.base import DatabaseWrapper
+from django.test import SimpleTestCase, override_settings
+
+
+@override_settings(SQLITE_TUNING=True, SQLITE_BUSY_TIMEOUT_MS=1500, SQLITE_MMAP_SIZE=1024 * 1024, SQLITE_CACHE_SIZE_KB=2048)
+class SQLiteTuningTestCase(SimpleTestCase):
+    def setUp(self):
+        if connection.vendor != "sqlite":
+            self.skipTest("SQLite only")
+        directory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        self.path = Path(directory.name) / "branch.sqlite3"
+
+    def connect(self, **options):
+        wrapper = DatabaseWrapper({**connection.settings_dict, "NAME": str(self.path), "OPTIONS": options}, alias="branch")
+        wrapper.ensure_connection()
+        self.addCleanup(wrapper.close)
+        return wrapper
+
+    def pragma(self, wrapper, name):
+        with wrapper.cursor() as cursor:
+            cursor.execute(f"PRAGMA {name}")
+            return cursor.fetchone()[0]
+
+    def test_new_connections_get_the_profile(self):
+        wrapper = self.connect()
+        self.assertEqual(self.pragma(wrapper, "journal_mode"), "wal")
+        self.assertEqual(self.pragma(wrapper, "busy_timeout"), 1500)
+        self.assertEqual(self.pragma(wrapper, "synchronous"), 1)  # NORMAL
+        self.assertEqual(self.pragma(wrapper, "mmap_size"), 1024 * 1024)
+        self.assertEqual(self.pragma(wrapper, "cache_size"), -2048)
+        self.assertEqual(wrapper.transaction_mode, "IMMEDIATE")
+        # A configured transaction mode is kept
+        self.assertEqual(self.connect(transaction_mode="EXCLUSIVE").transaction_mode, "EXCLUSIVE")
+
+    def test_readers_do_not_block_writers(self):
+        writer, reader = self.connect(), self.connect()
+        writer.connection.execute("CREATE TABLE marks (day integer)")
+        reader.connection.execute("BEGIN")
+        reader.connection.execute("SELECT count(*) FROM marks").fetchone()
+        # Commits while the reader's transaction is open, which the rollback journal refuses
+        writer.connection.execute("INSERT INTO marks VALUES (1)")
+        self.assertEqual(reader.connection.execute("SELECT count(*) FROM marks").fetchone()[0], 0)
+        reader.connection.execute("COMMIT")
+        self.assertEqual(reader.connection.execute("SELECT count(*) FROM marks").fetchone()[0], 1)
+
+    @override_settings(SQLITE_TUNING=False)
+    def test_off_by_default(self):
+        wrapper = self.connect()
+        self.assertEqual(self.pragma(wrapper, "journal_mode"), "delete")
+        self.assertIsNone(wrapper.transaction_mode)
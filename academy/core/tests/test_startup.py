@@ -0,0 +1,51 @@
+import json
+import os
+import subprocess
+import sys
+from io import StringIO
+
+from django.conf import settings
+from django.core.management import call_command
+from django.test import SimpleTestCase
+
+
+# Loaded only when a report is rendered (or by the warm-up step), never at startup
+REPORT_ONLY_MODULES = ("reportlab", "PIL", "arabic_reshaper", "bidi")
+# Modules loaded by a fresh worker (setup + URLconf); raise deliberately when a new dependency is worth it
+STARTUP_MODULE_BUDGET = 900
+
+STARTUP_PROBE = """
+import json, sys
+import django
+django.setup()
+from django.urls import get_resolver
+get_resolver().url_patterns
+print(json.dumps(sorted(sys.modules)))
+"""
+
+
+class StartupImportsTestCase(SimpleTestCase):
+    def startup_modules(self):
+        env = {**os.environ, "DJANGO_SETTINGS_MODULE": "academy.settings"}
+        out = subprocess.run(
+            [sys.executable, "-c", STARTUP_PROBE], cwd=settings.BASE_DIR, env=env, capture_output=True, text=True, check=True
+        ).stdout
+        return json.loads(out.strip().splitlines()[-1])
+
+    def test_report_stack_is_not_imported_at_startup(self):
+        modules = self.startup_modules()
+        loaded = sorted({m.split(".")[0] for m in modules} & set(REPORT_ONLY_MODULES))
+        self.assertEqual(loaded, [], f"imported at startup: {loaded}")
+        self.assertLessEqual(len(modules), STARTUP_MODULE_BUDGET, "startup imports grew past the budget")
+
+
+class WarmupCommandTestCase(SimpleTestCase):
+    def test_warmup_loads_report_stack(self):
+        out = StringIO()
+        call_command("warmup", stdout=out)
+        self.assertIn("reports", out.getvalue())
+        self.assertIn("reportlab", sys.modules)
+
+        from core.pdf import _register_arabic_font
+
+        self.assertEqual(_register_arabic_font.cache_info().currsize, 1)
@@ -0,0 +1,62 @@
+import json
+
+import msgpack
+from django.contrib.auth.models import User
+from django.db import connection
+from django.test import TestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+from rest_framework.test import APIClient
+
+from core.models import Coach, Group, Player, PlayerEvaluation
+from core.streaming import stream_json_array
+
+
+class StreamJsonArrayTestCase(TestCase):
+    def test_chunks_form_a_json_array(self):
+        chunks = list(stream_json_array(range(5), lambda n: json.dumps({"n": n}).encode(), flush_bytes=20))
+        self.assertEqual(chunks[0], b"[")
+        self.assertGreater(len(chunks), 3)
+        self.assertEqual(json.loads(b"".join(chunks)), [{"n": n} for n in range(5)])
+
+    def test_empty(self):
+        self.assertEqual(b"".join(stream_json_array([], json.dumps)), b"[]")
+
+
+@override_settings(STREAM_CHUNK_SIZE=2)
+class StreamingListTestCase(TestCase):
+    def setUp(self):
+        self.admin = User.objects.create_user(username="admin", password="admin123", is_staff=True)
+        coach = Coach.objects.create(user=User.objects.create_user(username="coach1", password="coach123"))
+        group = Group.objects.create(name="Group A", coach=coach)
+        for i in range(5):
+            player = Player.objects.create(group=group, name=f"Player {i}", age=10 + i)
+            PlayerEvaluation.objects.create(player=player, coach=coach, passing=1 + i % 5)
+        self.client = APIClient()
+        self.client.force_authenticate(user=self.admin)
+
+    def stream(self, url):
+        res = self.client.get(url)
+        self.assertEqual(res.status_code, 200)
+        self.assertTrue(res.streaming)
+        self.assertEqual(res["Content-Type"], "application/json")
+        return json.loads(b"".join(res.streaming_content))
+
+    def test_players_stream_matches_regular_list(self):
+        expected = json.loads(self.client.get("/api/players/?ordering=-age").content)
+        self.assertEqual(self.stream("/api/players/?ordering=-age&stream=1"), expected)
+
+    def test_evaluations_stream_in_constant_queries(self):
+        expected = json.loads(self.client.get("/api/evaluations/").content)
+        with CaptureQueriesContext(connection) as captured:
+            self.assertEqual(self.stream("/api/evaluations/?stream=1"), expected)
+        # Only the user lookup for authentication plus one query per iterator chunk
+        self.assertLessEqual(len(captured), 4)
+
+    def test_filters_apply(self):
+        rows = self.stream("/api/players/?stream=1&age=13")
+        self.assertEqual([r["name"] for r in rows], ["Player 3"])
+
+    def test_other_formats_are_not_streamed(self):
+        res = self.client.get("/api/players/?stream=1", HTTP_ACCEPT="application/msgpack")
+        self.assertFalse(res.streaming)
+        self.assertEqual(len(msgpack.unpackb(res.content)), 5)
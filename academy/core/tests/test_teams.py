@@ -0,0 +1,116 @@
+import itertools
+import random
+import time
+
+from django.contrib.auth.models import User
+from django.test import TestCase
+from rest_framework.test import APIClient
+
+from core.models import RATING_FIELDS, SKILL_RATING_FIELDS, Coach, Group, Player, PlayerEvaluation
+from core.teams import TeamBalancer, balanced_teams, rating_vectors
+
+
+def pool(size, seed=0):
+    rng = random.Random(seed)
+    return [
+        {"id": i, "name": f"P{i}", **{f: rng.randint(1, 5) if rng.random() > 0.1 else None for f in RATING_FIELDS}}
+        for i in range(size)
+    ]
+
+
+class TeamBalancerTestCase(TestCase):
+    def test_missing_ratings_are_filled_in(self):
+        rows = [
+            {"a": 4, "b": None},
+            {"a": 2, "b": 2},
+            {"a": None, "b": None},
+        ]
+        self.assertEqual(rating_vectors(rows, ["a", "b"]), [[4.0, 4.0], [2.0, 2.0], [3.0, 2.0]])
+
+    def test_finds_the_best_split_of_a_small_pool(self):
+        rows = pool(10, seed=3)
+        fields = SKILL_RATING_FIELDS
+        profiles = rating_vectors(rows, fields)
+        strengths = [sum(p) / len(p) for p in profiles]
+        balancer = TeamBalancer(strengths, profiles, 2, seed=0)
+        found = balancer.solve()
+        assignment = [0] * 10
+        for i in found[1]:
+            assignment[i] = 1
+        best = min(
+            balancer.cost([int(i in half) for i in range(10)]) for half in itertools.combinations(range(10), 5)
+        )
+        self.assertAlmostEqual(balancer.cost(assignment), best, places=6)
+
+    def test_deterministic_and_fast(self):
+        for size, k in ((40, 2), (41, 4), (200, 3)):
+            rows = pool(size, seed=size)
+            started = time.perf_counter()
+            result = balanced_teams(rows, k, seed=5)
+            elapsed = time.perf_counter() - started
+            self.assertEqual(result, balanced_teams(list(reversed(rows)), k, seed=5))
+            sizes = sorted(len(team["players"]) for team in result["teams"])
+            self.assertLessEqual(sizes[-1] - sizes[0], 1)
+            self.assertEqual(sum(sizes), size)
+            # Team totals are balanced, so with uneven sizes the larger team has weaker players
+            self.assertLess(result["strength_spread"], 1.5)
+            if size % k == 0:
+                self.assertLess(result["average_spread"], 0.1)
+            # Generous bounds for slow CI machines; typically about 10 ms and 150 ms
+            self.assertLess(elapsed, 0.5 if size <= 40 else 3)
+
+
+class BalancedTeamsApiTestCase(TestCase):
+    def setUp(self):
+        self.coach = Coach.objects.create(user=User.objects.create_user(username="coach1", password="coach123"))
+        self.group = Group.objects.create(name="Group A", coach=self.coach)
+        self.players = []
+        for i, rating in enumerate([5, 5, 4, 4, 3, 3, 2, 2, 1]):
+            player = Player.objects.create(group=self.group, name=f"P{i}", age=10)
+            PlayerEvaluation.objects.create(player=player, coach=self.coach, **{f: rating for f in SKILL_RATING_FIELDS})
+            self.players.append(player)
+        # No evaluation: rated like the pool average
+        self.players.append(Player.objects.create(group=self.group, name="New", age=10))
+        self.client = APIClient()
+        self.client.force_authenticate(user=self.coach.user)
+        self.url = f"/api/groups/{self.group.id}/balanced-teams/"
+
+    def test_split_group(self):
+        with self.assertNumQueries(3):  # group (players prefetched by the viewset), players with ratings
+            res = self.client.post(self.url, {"seed": 1}, format="json")
+        self.assertEqual(res.status_code, 200)
+        body = res.json()
+        self.assertEqual(body["seed"], 1)
+        self.assertEqual([len(team["players"]) for team in body["teams"]], [5, 5])
+        # Ratings 5 5 4 4 3 3 2 2 1 and the pool average 3.22: 16 against 16.22 is the best possible
+        self.assertEqual(sorted(team["strength"] for team in body["teams"]), [16.0, 16.22])
+        self.assertEqual(set(body["teams"][0]["profile"]), set(SKILL_RATING_FIELDS))
+        self.assertEqual(res.json(), self.client.post(self.url, {"seed": 1}, format="json").json())
+
+    def test_selected_players_and_attendance(self):
+        selected = [p.id for p in self.players[:6]]
+        res = self.client.post(self.url, {"players": selected, "teams": 3, "attendance": True}, format="json")
+        self.assertEqual(res.status_code, 200)
+        body = res.json()
+        self.assertIsInstance(body["seed"], int)
+        self.assertEqual(sorted(p["id"] for team in body["teams"] for p in team["players"]), selected)
+        # 5+3, 5+3, 4+4
+        self.assertEqual([team["strength"] for team in body["teams"]], [8.0, 8.0, 8.0])
+        self.assertIn("attendance_and_punctuality", body["teams"][0]["profile"])
+
+    def test_invalid_requests(self):
+        other = Group.objects.create(name="Group B", coach=self.coach)
+        stranger = Player.objects.create(group=other, name="Elsewhere", age=10)
+        for data in (
+            {"teams": 5},
+            {"teams": "2"},
+            {"seed": "x"},
+            {"players": [self.players[0].id, stranger.id]},
+            {"players": [self.players[0].id], "teams": 2},
+            {"profile_weight": -1},
+        ):
+            self.assertEqual(self.client.post(self.url, data, format="json").status_code, 400, data)
+
+        outsider = Coach.objects.create(user=User.objects.create_user(username="coach2"))
+        self.client.force_authenticate(user=outsider.user)
+        self.assertEqual(self.client.post(self.url, {}, format="json").status_code, 404)
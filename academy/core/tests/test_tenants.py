@@ -0,0 +1,106 @@
+import datetime
+import io
+
+from django.contrib.auth.models import User
+from django.db import connection
+from django.test import TestCase
+from rest_framework.test import APIClient
+
+from core.attendance import update_days
+from core.importing import PlayerImporter, open_csv
+from core.models import Academy, Coach, Group, Player, PlayerAttendance, PlayerEvaluation
+from core.seasons import season_q
+from core.tenants import academy_q
+
+
+class TenantTestCase(TestCase):
+    def setUp(self):
+        self.main = Academy.default()
+        self.north = Academy.objects.create(name="North", slug="north", domain="north.example.com")
+        self.admin = User.objects.create_user(username="admin", password="admin123", is_staff=True)
+        self.main_coach = Coach.objects.create(user=User.objects.create_user(username="coach1", password="coach123"))
+        self.north_coach = Coach.objects.create(
+            user=User.objects.create_user(username="coach2", password="coach123"), academy=self.north
+        )
+        # Same group name in both academies
+        self.main_group = Group.objects.create(name="U12", coach=self.main_coach)
+        self.north_group = Group.objects.create(name="U12", coach=self.north_coach)
+        self.alice = Player.objects.create(group=self.main_group, name="Alice", age=11)
+        self.bob = Player.objects.create(group=self.north_group, name="Bob", age=11)
+        self.client = APIClient()
+
+    def names(self, url, **headers):
+        res = self.client.get(url, headers=headers)
+        self.assertEqual(res.status_code, 200)
+        return sorted(row["name"] for row in res.json())
+
+    def test_rows_carry_their_academy(self):
+        self.assertEqual((self.north_group.academy, self.bob.academy), (self.north, self.north))
+        evaluation = PlayerEvaluation.objects.create(player=self.bob, coach=self.north_coach, passing=3)
+        self.assertEqual(evaluation.academy, self.north)
+        update_days([self.alice.id, self.bob.id], datetime.date(2026, 3, 1), mark=[2])
+        self.assertEqual(
+            dict(PlayerAttendance.objects.values_list("player_id", "academy_id")),
+            {self.alice.id: self.main.id, self.bob.id: self.north.id},
+        )
+
+    def test_staff_pick_the_academy(self):
+        self.client.force_authenticate(user=self.admin)
+        self.assertEqual(self.names("/api/players/"), ["Alice"])
+        self.assertEqual(self.names("/api/players/", **{"X-Academy": "north"}), ["Bob"])
+        self.assertEqual(self.names("/api/players/", Host="north.example.com"), ["Bob"])
+        coaches = self.client.get("/api/coaches/", headers={"X-Academy": "north"}).json()
+        self.assertEqual([c["user"]["username"] for c in coaches], ["coach2"])
+        self.assertEqual(self.client.get("/api/groups/", headers={"X-Academy": "south"}).status_code, 404)
+        # Other academies' rows are not found, for reads and deletes alike
+        self.assertEqual(self.client.get(f"/api/players/{self.bob.id}/").status_code, 404)
+        self.assertEqual(self.client.delete(f"/api/players/{self.bob.id}/").status_code, 404)
+
+    def test_coaches_stay_in_their_academy(self):
+        self.client.force_authenticate(user=self.north_coach.user)
+        self.assertEqual(self.names("/api/groups/"), ["U12"])
+        self.assertEqual(self.names("/api/players/"), ["Bob"])
+        self.assertEqual(self.names("/api/players/", **{"X-Academy": "north"}), ["Bob"])
+        self.assertEqual(self.client.get("/api/players/", headers={"X-Academy": "main"}).status_code, 403)
+
+    def test_writes_are_limited_to_the_academy(self):
+        self.client.force_authenticate(user=self.admin)
+        res = self.client.post("/api/groups/", {"name": "U14", "coach_id": self.north_coach.id}, format="json")
+        self.assertEqual(res.status_code, 400)
+        res = self.client.post(
+            "/api/groups/", {"name": "U14", "coach_id": self.north_coach.id}, format="json", headers={"X-Academy": "north"}
+        )
+        self.assertEqual(res.status_code, 201)
+        self.assertEqual(Group.objects.get(pk=res.json()["id"]).academy, self.north)
+        res = self.client.post("/api/groups/", {"name": "U12", "coach_id": self.main_coach.id}, format="json")
+        self.assertEqual(res.status_code, 400)
+        self.assertIn("name", res.json())
+        res = self.client.post("/api/players/", {"group": self.north_group.id, "name": "Carl", "age": 10}, format="json")
+        self.assertEqual(res.status_code, 400)
+
+    def test_signup_joins_the_requested_academy(self):
+        res = self.client.post(
+            "/api/auth/signup/", {"username": "coach3", "password": "coach123"}, format="json", headers={"X-Academy": "north"}
+        )
+        self.assertEqual(res.status_code, 201)
+        self.assertEqual(Coach.objects.get(user__username="coach3").academy, self.north)
+
+    def test_import_resolves_group_names_within_the_academy(self):
+        report = PlayerImporter(academy=self.north).run(open_csv(io.BytesIO(b"name,group,age\nCarl,U12,10\n")))
+        self.assertTrue(report.imported)
+        carl = Player.objects.get(name="Carl")
+        self.assertEqual((carl.group, carl.academy), (self.north_group, self.north))
+
+    def test_lists_start_from_the_academy_indexes(self):
+        if connection.vendor != "sqlite":
+            self.skipTest("Query plans are checked on SQLite only")
+        self.client.force_authenticate(user=self.admin)
+        request = self.client.get("/api/players/").wsgi_request
+        # Resolved in SQL (host or default academy), still an index search
+        plans = {
+            "player_academy_season_group (academy_id=? AND season_id=?)": Player.objects.filter(academy_q(request), season_q()),
+            "group_academy_season (academy_id=? AND season_id=?)": Group.objects.filter(academy_q(request), season_q()),
+            "evaluation_academy_player (academy_id=?)": PlayerEvaluation.objects.filter(academy_q(request)),
+        }
+        for index, queryset in plans.items():
+            self.assertIn(f"USING INDEX {index}", queryset.explain())
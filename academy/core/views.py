@@ -1,32 +1,73 @@
+import hmac
+import random
+from pathlib import Path
+
+from django.conf import settings
 from django.contrib.auth.models import User
-from django.http import HttpResponse
+from django.core.files.storage import default_storage
+from django.db import transaction
+from django.db.models import F, Q
+from django.http import FileResponse, Http404, HttpResponse, HttpResponseForbidden, HttpResponseNotModified, StreamingHttpResponse
+from django.utils import timezone
+from django.utils.http import parse_etags
+from django.views.static import serve as static_serve
 from rest_framework import viewsets, status
 from rest_framework.decorators import action
 from rest_framework.views import APIView
 from rest_framework.response import Response
 from rest_framework.permissions import IsAuthenticated, AllowAny
-from rest_framework.parsers import MultiPartParser, FormParser, JSONParser
-
-from .models import Coach, Group, Player, PlayerEvaluation
+from rest_framework.parsers import MultiPartParser, FormParser
+
+from .attendance import days_from_mask, group_attendance_stats, update_days, validate_days
+from .export import EXPORT_FORMATS, parse_month, stream_export
+from .filters import PlayerFilter
+from .history import TREND_INTERVALS, group_trend, parse_date_range, player_history, record_snapshots, snapshot_queryset
+from .importing import PlayerImporter, open_csv
+from .images import ensure_photo_variants, normalize_photo
+from .lean import GroupRows, LeanReadMixin, PlayerRows
+from .metrics import cache_lookup, render_metrics
+from .models import (
+    RATING_FIELDS,
+    SKILL_RATING_FIELDS,
+    Coach,
+    Group,
+    Player,
+    PlayerAttendance,
+    PlayerEvaluation,
+    TrainingSchedule,
+    TrainingSession,
+)
 from .serializers import (
     CoachSerializer,
     CoachDetailSerializer,
+    EvaluationSnapshotSerializer,
     GroupSerializer,
     PlayerSerializer,
     PlayerEvaluationSerializer,
     SignupSerializer,
+    TrainingScheduleSerializer,
+    TrainingSessionSerializer,
     UserSerializer,
 )
-from .permissions import IsAdmin, IsAdminOrCoachWriteOwnGroup, IsAdminOrCoachOfObject
-from .pdf import build_group_report, build_player_report
+from .permissions import InAcademy, IsAdmin, IsAdminOrCoachWriteOwnGroup, IsAdminOrCoachOfObject
+from .perf import timer
+from .renderers import MessagePackParser, ORJSONParser
+from .schedule import attendance_rates, calendar, month_window, parse_window, reschedule, week_window
+from .search import MAX_SEARCH_LIMIT, SEARCH_KINDS, SEARCH_LIMIT, matching
+from .seasons import season_q
+from .streaming import StreamingListMixin
+from .teams import MAX_TEAMS, MIN_TEAMS, balanced_teams
+from .tenants import academy_q, request_academy
 
 
 class CoachViewSet(viewsets.ModelViewSet):
-    queryset = Coach.objects.select_related("user").prefetch_related("groups").all()
     serializer_class = CoachDetailSerializer
-    permission_classes = [IsAuthenticated, IsAdmin]
+    permission_classes = [IsAuthenticated, InAcademy, IsAdmin]
+
+    def get_queryset(self):
+        return Coach.objects.filter(academy_q(self.request)).select_related("user").prefetch_related("groups")
 
-    @action(detail=False, methods=["post"], url_path="create-with-user", permission_classes=[IsAuthenticated, IsAdmin])
+    @action(detail=False, methods=["post"], url_path="create-with-user", permission_classes=[IsAuthenticated, InAcademy, IsAdmin])
     def create_with_user(self, request):
         data = request.data
         required = ["username", "password"]
@@ -43,7 +84,9 @@ class CoachViewSet(viewsets.ModelViewSet):
         )
         user.set_password(data["password"])
         user.save()
-        coach = Coach.objects.create(user=user, bio=data.get("bio", ""), phone=data.get("phone", ""))
+        coach = Coach.objects.create(
+            user=user, bio=data.get("bio", ""), phone=data.get("phone", ""), academy=request_academy(request)
+        )
         return Response(CoachSerializer(coach).data, status=status.HTTP_201_CREATED)
 
     def destroy(self, request, *args, **kwargs):
@@ -61,19 +104,21 @@ class CoachViewSet(viewsets.ModelViewSet):
         return response
 
 
-class GroupViewSet(viewsets.ModelViewSet):
+class GroupViewSet(LeanReadMixin, viewsets.ModelViewSet):
     serializer_class = GroupSerializer
-    permission_classes = [IsAuthenticated, IsAdminOrCoachWriteOwnGroup]
+    lean_rows_class = GroupRows
+    permission_classes = [IsAuthenticated, InAcademy, IsAdminOrCoachWriteOwnGroup]
     filterset_fields = ["name", "coach"]
     ordering_fields = ["name", "id"]
 
     def get_queryset(self):
         user = self.request.user
+        groups = Group.objects.filter(academy_q(self.request), season_q(self.request))
         if user.is_staff:
-            return Group.objects.select_related("coach__user").prefetch_related("players").all()
+            return groups.select_related("coach__user").prefetch_related("players")
         coach = getattr(user, "coach_profile", None)
         if coach:
-            return Group.objects.filter(coach=coach).select_related("coach__user").prefetch_related("players")
+            return groups.filter(coach=coach).select_related("coach__user").prefetch_related("players")
         return Group.objects.none()
 
     def get_serializer_context(self):
@@ -88,9 +133,157 @@ class GroupViewSet(viewsets.ModelViewSet):
         group = self.get_object()
         # object-level permission
         self.check_object_permissions(request, group)
-        pdf_bytes = build_group_report(group)
-        response = HttpResponse(pdf_bytes, content_type="application/pdf")
-        response["Content-Disposition"] = f'attachment; filename="group_{group.id}_report.pdf"'
+        # ReportLab is only imported by workers that actually render reports
+        from .pdf import render_group_report_file
+
+        # Spooled to disk for large groups and streamed back in chunks
+        with timer("pdf"):
+            pdf_file = render_group_report_file(group)
+        return FileResponse(
+            pdf_file,
+            as_attachment=True,
+            filename=f"group_{group.id}_report.pdf",
+            content_type="application/pdf",
+        )
+
+    @action(detail=True, methods=["get"], url_path="attendance-rates")
+    def attendance_rates(self, request, pk=None):
+        """Per-player attendance against the group's scheduled sessions.
+
+        ``since``/``until`` (``YYYY-MM-DD``) default to the current month so far.
+        """
+        group = self.get_object()
+        try:
+            start, end = parse_window(request.query_params, month_window())
+        except ValueError as exc:
+            return Response({"detail": str(exc)}, status=status.HTTP_400_BAD_REQUEST)
+        return Response(attendance_rates(group, start, end))
+
+    @action(detail=True, methods=["get"], url_path="evaluation-trend")
+    def evaluation_trend(self, request, pk=None):
+        """Average ratings of the group's evaluation snapshots per day, week or month.
+
+        Query params: ``since``/``until`` (``YYYY-MM-DD``) and ``interval`` (default ``month``).
+        """
+        group = self.get_object()
+        interval = request.query_params.get("interval", "month")
+        if interval not in TREND_INTERVALS:
+            return Response({"detail": f"interval must be one of: {', '.join(TREND_INTERVALS)}"}, status=status.HTTP_400_BAD_REQUEST)
+        try:
+            since, until = parse_date_range(request.query_params)
+        except ValueError as exc:
+            return Response({"detail": str(exc)}, status=status.HTTP_400_BAD_REQUEST)
+        return Response(group_trend(group, since, until, interval))
+
+    @action(detail=True, methods=["post"], url_path="attendance-days")
+    def attendance_days(self, request, pk=None):
+        """Mark sessions for many players at once.
+
+        Body: ``{"month": "YYYY-MM", "days": [..], "present": [player ids], "absent": [player ids]}``;
+        the days are marked for ``present`` players and cleared for ``absent`` ones.
+        """
+        group = self.get_object()
+        self.check_object_permissions(request, group)
+        try:
+            month = parse_month(str(request.data.get("month", "")))
+        except Exception:
+            return Response({"detail": "Invalid month format; expected YYYY-MM"}, status=status.HTTP_400_BAD_REQUEST)
+        try:
+            days = validate_days(request.data.get("days") or [], month)
+        except ValueError as exc:
+            return Response({"detail": str(exc)}, status=status.HTTP_400_BAD_REQUEST)
+        present, absent = request.data.get("present") or [], request.data.get("absent") or []
+        if not all(
+            isinstance(ids, list) and all(isinstance(p, int) and not isinstance(p, bool) for p in ids) for ids in (present, absent)
+        ):
+            return Response({"detail": "present and absent must be lists of player ids"}, status=status.HTTP_400_BAD_REQUEST)
+        requested = set(present) | set(absent)
+        if not requested <= set(group.players.filter(id__in=requested).values_list("id", flat=True)):
+            return Response({"detail": "present and absent must be players of this group"}, status=status.HTTP_400_BAD_REQUEST)
+        masks = {}
+        if present:
+            masks.update(update_days(present, month, mark=days))
+        if absent:
+            masks.update(update_days(absent, month, unmark=days))
+        return Response(
+            [{"player": player_id, "days": days_from_mask(mask)} for player_id, mask in sorted(masks.items())],
+            status=status.HTTP_200_OK,
+        )
+
+    @action(detail=True, methods=["post"], url_path="balanced-teams")
+    def balanced_teams(self, request, pk=None):
+        """Split players of the group into 2–4 teams of equal strength and skill profile.
+
+        Body: ``{"teams": 2, "players": [ids], "seed": 7, "attendance": false, "profile_weight": 1.0}``;
+        every field is optional (default: all players, two teams, a random seed that is returned).
+        """
+        group = self.get_object()
+        self.check_object_permissions(request, group)
+        data = request.data
+        k = data.get("teams", 2)
+        if isinstance(k, bool) or not isinstance(k, int) or not MIN_TEAMS <= k <= MAX_TEAMS:
+            return Response({"detail": f"teams must be between {MIN_TEAMS} and {MAX_TEAMS}"}, status=status.HTTP_400_BAD_REQUEST)
+        seed = data.get("seed")
+        if seed is None:
+            seed = random.SystemRandom().randrange(2**31)
+        elif isinstance(seed, bool) or not isinstance(seed, int):
+            return Response({"detail": "seed must be an integer"}, status=status.HTTP_400_BAD_REQUEST)
+        try:
+            profile_weight = float(data.get("profile_weight", 1.0))
+        except (TypeError, ValueError):
+            profile_weight = -1.0
+        if not 0 <= profile_weight <= 100:
+            return Response({"detail": "profile_weight must be a number from 0 to 100"}, status=status.HTTP_400_BAD_REQUEST)
+        with_attendance = str(data.get("attendance", "")).lower() in ("1", "true")
+
+        fields = RATING_FIELDS if with_attendance else SKILL_RATING_FIELDS
+        players = Player.objects.filter(group=group)
+        selected = data.get("players")
+        if selected is not None:
+            if not isinstance(selected, list) or not all(isinstance(p, int) and not isinstance(p, bool) for p in selected):
+                return Response({"detail": "players must be a list of player ids"}, status=status.HTTP_400_BAD_REQUEST)
+            players = players.filter(id__in=selected)
+        rows = list(players.values("id", "name", **{f: F(f"evaluation__{f}") for f in fields}))
+        if selected is not None and len(rows) != len(set(selected)):
+            return Response({"detail": "players must be players of this group"}, status=status.HTTP_400_BAD_REQUEST)
+        if len(rows) < k:
+            return Response({"detail": f"At least {k} players are needed for {k} teams"}, status=status.HTTP_400_BAD_REQUEST)
+        with timer("teams"):
+            result = balanced_teams(rows, k, seed=seed, with_attendance=with_attendance, profile_weight=profile_weight)
+        return Response(result)
+
+    @action(detail=True, methods=["get"], url_path="attendance-stats")
+    def attendance_stats(self, request, pk=None):
+        """Per-player attendance rate, streaks and absence runs from the day bitmaps.
+
+        Sessions are the group's scheduled sessions, or the days on which a player
+        attended when it has none; ``since``/``until`` (``YYYY-MM``) limit the months.
+        """
+        group = self.get_object()
+        months = {}
+        for param in ("since", "until"):
+            value = request.query_params.get(param)
+            if value:
+                try:
+                    months[param] = parse_month(value)
+                except Exception:
+                    return Response({"detail": f"Invalid {param} format; expected YYYY-MM"}, status=status.HTTP_400_BAD_REQUEST)
+        return Response(group_attendance_stats(group, **months))
+
+    @action(detail=True, methods=["get"], url_path="player-reports.zip")
+    def player_reports_zip(self, request, pk=None):
+        """Stream a ZIP with every player's PDF report in this group.
+
+        Players, evaluations and coaches are loaded in a single query; reports
+        are rendered in parallel and written to the archive as they finish.
+        """
+        group = self.get_object()
+        self.check_object_permissions(request, group)
+        from .pdf import stream_player_reports_zip
+
+        players = group.players.select_related("group__coach__user", "evaluation__coach__user").order_by("name", "id")
+        response = StreamingHttpResponse(stream_player_reports_zip(players), content_type="application/zip")
+        response["Content-Disposition"] = f'attachment; filename="group_{group.id}_player_reports.zip"'
         return response
 
     @action(detail=True, methods=["post"], url_path="reset-evaluations")
@@ -104,31 +297,34 @@ class GroupViewSet(viewsets.ModelViewSet):
         self.check_object_permissions(request, group)
 
         qs = PlayerEvaluation.objects.filter(player__group=group)
-        updated = qs.update(
-            # Technical Skills
-            ball_control=None,
-            passing=None,
-            dribbling=None,
-            shooting=None,
-            using_both_feet=None,
-            # Physical Abilities
-            speed=None,
-            agility=None,
-            endurance=None,
-            strength=None,
-            # Technical Understanding
-            positioning=None,
-            decision_making=None,
-            game_awareness=None,
-            teamwork=None,
-            # Psychological and Social
-            respect=None,
-            sportsmanship=None,
-            confidence=None,
-            leadership=None,
-            # Overall evaluation
-            attendance_and_punctuality=None,
-        )
+        with transaction.atomic():
+            updated = qs.update(
+                # Technical Skills
+                ball_control=None,
+                passing=None,
+                dribbling=None,
+                shooting=None,
+                using_both_feet=None,
+                # Physical Abilities
+                speed=None,
+                agility=None,
+                endurance=None,
+                strength=None,
+                # Technical Understanding
+                positioning=None,
+                decision_making=None,
+                game_awareness=None,
+                teamwork=None,
+                # Psychological and Social
+                respect=None,
+                sportsmanship=None,
+                confidence=None,
+                leadership=None,
+                # Overall evaluation
+                attendance_and_punctuality=None,
+            )
+            # Record the reset; the ratings it wipes are already in the history
+            snapshot_queryset(qs, "reset")
         return Response({"detail": f"Reset evaluations for {updated} player(s).", "updated": updated}, status=status.HTTP_200_OK)
 
     def perform_create(self, serializer):
@@ -138,8 +334,8 @@ class GroupViewSet(viewsets.ModelViewSet):
             coach_id = self.request.data.get("coach_id")
             if coach_id:
                 try:
-                    coach = Coach.objects.get(id=coach_id)
-                except Coach.DoesNotExist:
+                    coach = Coach.objects.filter(academy_q(self.request)).get(id=coach_id)
+                except (Coach.DoesNotExist, ValueError):
                     from rest_framework.exceptions import ValidationError
                     raise ValidationError("Invalid coach_id")
             else:
@@ -155,32 +351,34 @@ class GroupViewSet(viewsets.ModelViewSet):
         serializer.save(coach=coach)
 
 
-class PlayerViewSet(viewsets.ModelViewSet):
+class PlayerViewSet(LeanReadMixin, StreamingListMixin, viewsets.ModelViewSet):
     serializer_class = PlayerSerializer
-    permission_classes = [IsAuthenticated, IsAdminOrCoachWriteOwnGroup]
-    filterset_fields = ["group", "age"]
+    lean_rows_class = PlayerRows
+    permission_classes = [IsAuthenticated, InAcademy, IsAdminOrCoachWriteOwnGroup]
+    filterset_class = PlayerFilter
     ordering_fields = ["name", "age", "id"]
 
     def get_queryset(self):
         user = self.request.user
+        players = Player.objects.filter(academy_q(self.request), season_q(self.request))
         if user.is_staff:
-            return Player.objects.select_related("group__coach__user", "evaluation").all()
+            return players.select_related("group__coach__user", "evaluation")
         coach = getattr(user, "coach_profile", None)
         if coach:
-            return Player.objects.filter(group__coach=coach).select_related("group__coach__user", "evaluation")
+            return players.filter(group__coach=coach).select_related("group__coach__user", "evaluation")
         return Player.objects.none()
 
     def destroy(self, request, *args, **kwargs):
         """Override destroy to avoid queryset-based object lookup causing false 404s.
 
-        We fetch the Player by primary key directly, then enforce object-level
-        permissions explicitly. This prevents scenarios where a valid player
-        becomes invisible to the request's filtered queryset, resulting in a 404
-        even for authorized users (e.g., admins).
+        We fetch the Player by primary key directly (within the request's
+        academy), then enforce object-level permissions explicitly. This prevents
+        scenarios where a valid player becomes invisible to the request's
+        filtered queryset, resulting in a 404 even for authorized users (e.g., admins).
         """
         pk = kwargs.get(self.lookup_field or "pk")
         try:
-            player = Player.objects.select_related("group__coach").get(pk=pk)
+            player = Player.objects.filter(academy_q(request)).select_related("group__coach").get(pk=pk)
         except Player.DoesNotExist:
             return Response({"detail": "No Player matches the given query."}, status=status.HTTP_404_NOT_FOUND)
 
@@ -203,55 +401,153 @@ class PlayerViewSet(viewsets.ModelViewSet):
             raise PermissionDenied("Coaches can only add players to their own group.")
         serializer.save()
 
+    def _export(self, request, fmt):
+        """Stream every visible player (``?group=`` narrows it) with ratings and monthly attendance."""
+        months = {}
+        for param in ("since", "until"):
+            value = request.query_params.get(param)
+            if value:
+                try:
+                    months[param] = parse_month(value)
+                except Exception:
+                    return Response({"detail": f"Invalid {param} format; expected YYYY-MM"}, status=status.HTTP_400_BAD_REQUEST)
+        players = self.filter_queryset(self.get_queryset())
+        response = StreamingHttpResponse(stream_export(players, fmt, **months), content_type=EXPORT_FORMATS[fmt])
+        response["Content-Disposition"] = f'attachment; filename="players.{fmt}"'
+        return response
+
+    @action(detail=False, methods=["get"], url_path="export.csv")
+    def export_csv(self, request):
+        return self._export(request, "csv")
+
+    @action(detail=False, methods=["get"], url_path="export.ndjson")
+    def export_ndjson(self, request):
+        return self._export(request, "ndjson")
+
+    @action(detail=False, methods=["post"], url_path="import.csv", parser_classes=[MultiPartParser, FormParser])
+    def import_csv(self, request):
+        """Create or update players and evaluations from an uploaded CSV ``file``.
+
+        ``dry_run`` validates without writing; ``skip_invalid`` imports the valid
+        rows instead of rolling back when some are invalid.
+        """
+        coach = None if request.user.is_staff else getattr(request.user, "coach_profile", None)
+        if coach is None and not request.user.is_staff:
+            from rest_framework.exceptions import PermissionDenied
+            raise PermissionDenied("Only coaches or admins can import players.")
+        upload = request.FILES.get("file")
+        if not upload:
+            return Response({"detail": "Upload a CSV file as 'file'."}, status=status.HTTP_400_BAD_REQUEST)
+        flags = {
+            name: str(request.data.get(name, request.query_params.get(name, ""))).lower() in ("1", "true")
+            for name in ("dry_run", "skip_invalid")
+        }
+        academy = request_academy(request) if coach is None else None
+        try:
+            with timer("import"):
+                report = PlayerImporter(academy=academy, coach=coach, **flags).run(open_csv(upload.file))
+        except ValueError as exc:
+            return Response({"detail": str(exc)}, status=status.HTTP_400_BAD_REQUEST)
+        ok = report.imported or report.dry_run
+        return Response(report.as_dict(), status=status.HTTP_200_OK if ok else status.HTTP_400_BAD_REQUEST)
+
+    @action(detail=True, methods=["get", "post"], url_path="attendance-days")
+    def attendance_days(self, request, pk=None):
+        """Days attended in a month: ``GET ?month=YYYY-MM`` (default: the current month).
+
+        ``POST {"month": "YYYY-MM", "mark": [..], "unmark": [..]}`` sets and clears days.
+        """
+        player = self.get_object()
+        self.check_object_permissions(request, player)
+        source = request.data if request.method == "POST" else request.query_params
+        try:
+            month = parse_month(str(source.get("month") or f"{timezone.localdate():%Y-%m}"))
+        except Exception:
+            return Response({"detail": "Invalid month format; expected YYYY-MM"}, status=status.HTTP_400_BAD_REQUEST)
+        if request.method == "POST":
+            try:
+                mark = validate_days(request.data.get("mark") or [], month)
+                unmark = validate_days(request.data.get("unmark") or [], month)
+            except ValueError as exc:
+                return Response({"detail": str(exc)}, status=status.HTTP_400_BAD_REQUEST)
+            mask = update_days([player.id], month, mark=mark, unmark=unmark)[player.id]
+            days = mask.bit_count()
+        else:
+            record = PlayerAttendance.objects.filter(player=player, month=month).values("day_mask", "days").first()
+            mask, days = (record["day_mask"], record["days"]) if record else (0, 0)
+        return Response({"player": player.id, "month": f"{month:%Y-%m}", "days": days_from_mask(mask), "count": days})
+
+    @action(detail=True, methods=["get"], url_path="evaluation-history")
+    def evaluation_history(self, request, pk=None):
+        """Every saved state of the player's evaluation, oldest first (``since``/``until`` as ``YYYY-MM-DD``)."""
+        player = self.get_object()
+        try:
+            since, until = parse_date_range(request.query_params)
+        except ValueError as exc:
+            return Response({"detail": str(exc)}, status=status.HTTP_400_BAD_REQUEST)
+        snapshots = player_history(player, since, until)
+        return Response(EvaluationSnapshotSerializer(snapshots, many=True).data)
+
     @action(detail=True, methods=["get"], url_path="report-pdf")
     def report_pdf(self, request, pk=None):
         player = self.get_object()
         self.check_object_permissions(request, player)
-        pdf_bytes = build_player_report(player)
+        from .pdf import build_player_report
+
+        with timer("pdf"):
+            pdf_bytes = build_player_report(player)
         response = HttpResponse(pdf_bytes, content_type="application/pdf")
         response["Content-Disposition"] = f'attachment; filename="player_{player.id}_report.pdf"'
         return response
 
 
-class PlayerEvaluationViewSet(viewsets.ModelViewSet):
+class PlayerEvaluationViewSet(StreamingListMixin, viewsets.ModelViewSet):
     serializer_class = PlayerEvaluationSerializer
-    permission_classes = [IsAuthenticated, IsAdminOrCoachWriteOwnGroup]
+    permission_classes = [IsAuthenticated, InAcademy, IsAdminOrCoachWriteOwnGroup]
     filterset_fields = ["player", "coach"]
     ordering_fields = ["updated_at", "id"]
 
     def get_queryset(self):
         user = self.request.user
+        evaluations = PlayerEvaluation.objects.filter(academy_q(self.request), season_q(self.request, "player__season"))
         if user.is_staff:
-            return PlayerEvaluation.objects.select_related("player__group__coach__user", "coach").all()
+            return evaluations.select_related("player__group__coach__user", "coach")
         coach = getattr(user, "coach_profile", None)
         if coach:
-            return PlayerEvaluation.objects.filter(player__group__coach=coach).select_related("player__group__coach__user", "coach")
+            return evaluations.filter(player__group__coach=coach).select_related("player__group__coach__user", "coach")
         return PlayerEvaluation.objects.none()
 
     def perform_create(self, serializer):
         user = self.request.user
         if user.is_staff:
-            serializer.save()
+            self._save(serializer)
             return
         coach = getattr(user, "coach_profile", None)
         player = serializer.validated_data.get("player")
         if not coach or not player or player.group.coach_id != coach.id:
             from rest_framework.exceptions import PermissionDenied
             raise PermissionDenied("Coaches can only evaluate players in their assigned group.")
-        serializer.save(coach=coach)
+        self._save(serializer, coach=coach)
 
     def perform_update(self, serializer):
         # Maintain coach association for updates
         instance = serializer.instance
         user = self.request.user
         if user.is_staff:
-            serializer.save()
+            self._save(serializer)
             return
         coach = getattr(user, "coach_profile", None)
         if not coach or instance.player.group.coach_id != coach.id:
             from rest_framework.exceptions import PermissionDenied
             raise PermissionDenied("Coaches can only update evaluations within their group.")
-        serializer.save(coach=coach)
+        self._save(serializer, coach=coach)
+
+    @staticmethod
+    def _save(serializer, **kwargs):
+        # Every saved state is appended to the evaluation history
+        with transaction.atomic():
+            evaluation = serializer.save(**kwargs)
+            record_snapshots([evaluation], "save")
 
     @action(detail=True, methods=["get", "put", "patch"], url_path="attendance")
     def attendance(self, request, pk=None):
@@ -259,8 +555,9 @@ class PlayerEvaluationViewSet(viewsets.ModelViewSet):
 
         Use query param 'month' in 'YYYY-MM' format and body {"days": <int>} for updates.
         """
-        player = self.get_object()
-        self.check_object_permissions(request, player)
+        evaluation = self.get_object()
+        self.check_object_permissions(request, evaluation)
+        player = evaluation.player
         month_str = request.query_params.get("month")
         if not month_str:
             return Response({"detail": "month is required (YYYY-MM)"}, status=status.HTTP_400_BAD_REQUEST)
@@ -271,7 +568,6 @@ class PlayerEvaluationViewSet(viewsets.ModelViewSet):
         except Exception:
             return Response({"detail": "Invalid month format; expected YYYY-MM"}, status=status.HTTP_400_BAD_REQUEST)
 
-        from .models import PlayerAttendance
         rec, _ = PlayerAttendance.objects.get_or_create(player=player, month=month_date)
 
         if request.method in ("PUT", "PATCH"):
@@ -285,13 +581,16 @@ class PlayerEvaluationViewSet(viewsets.ModelViewSet):
             if days < 0 or days > 365:
                 return Response({"detail": "days must be between 0 and 365"}, status=status.HTTP_400_BAD_REQUEST)
             rec.days = days
+            # A count that no longer matches the marked days replaces them
+            if rec.day_mask.bit_count() != days:
+                rec.day_mask = 0
             rec.save()
 
         return Response({"player": player.id, "month": month_str, "days": rec.days}, status=status.HTTP_200_OK)
 
 
 class SignupView(APIView):
-    permission_classes = [AllowAny]
+    permission_classes = [AllowAny, InAcademy]
 
     def post(self, request):
         serializer = SignupSerializer(data=request.data)
@@ -305,13 +604,16 @@ class SignupView(APIView):
         )
         user.set_password(data["password"])
         user.save()
-        coach = Coach.objects.create(user=user, bio=data.get("bio", ""), phone=data.get("phone", ""))
+        # New coaches join the academy the signup was made for
+        coach = Coach.objects.create(
+            user=user, bio=data.get("bio", ""), phone=data.get("phone", ""), academy=request_academy(request)
+        )
         return Response(CoachSerializer(coach).data, status=status.HTTP_201_CREATED)
 
 
 class MeView(APIView):
-    permission_classes = [IsAuthenticated]
-    parser_classes = [MultiPartParser, FormParser, JSONParser]
+    permission_classes = [IsAuthenticated, InAcademy]
+    parser_classes = [MultiPartParser, FormParser, ORJSONParser, MessagePackParser]
 
     def get(self, request):
         user = request.user
@@ -349,9 +651,14 @@ class MeView(APIView):
         bio = data.get("bio")
         phone = data.get("phone")
         photo_file = request.FILES.get("photo")
+        if photo_file:
+            try:
+                photo_file = normalize_photo(photo_file)
+            except Exception:
+                return Response({"detail": "Upload a valid image."}, status=status.HTTP_400_BAD_REQUEST)
 
         if coach is None and (bio is not None or phone is not None or photo_file is not None):
-            coach = Coach.objects.create(user=user)
+            coach = Coach.objects.create(user=user, academy=request_academy(request))
 
         if coach is not None:
             if bio is not None:
@@ -361,6 +668,8 @@ class MeView(APIView):
             if photo_file:
                 coach.photo = photo_file
             coach.save()
+            if photo_file:
+                ensure_photo_variants(coach.photo)
 
         return Response({
             "user": UserSerializer(user).data,
@@ -391,4 +700,180 @@ class ChangePasswordView(APIView):
             "coach": CoachSerializer(coach).data if coach else None,
             "is_staff": bool(user.is_staff),
         }
-        return Response(payload, status=status.HTTP_200_OK)
\ No newline at end of file
+        return Response(payload, status=status.HTTP_200_OK)
+
+
+class SearchView(APIView):
+    """Players, groups and coaches of the academy whose names match ``?q=`` (see core/search.py).
+
+    ``?type=player,group`` narrows the kinds, ``?season=`` works as on the
+    lists (coaches match in every season) and ``?limit=`` caps the results.
+    Coaches find their own groups, their players and themselves.
+    """
+
+    permission_classes = [IsAuthenticated, InAcademy]
+
+    def get(self, request):
+        params = request.query_params
+        kinds = [kind for kind in params.get("type", "").split(",") if kind] or list(SEARCH_KINDS)
+        if not set(kinds) <= set(SEARCH_KINDS):
+            return Response({"detail": f"type must be among {', '.join(SEARCH_KINDS)}"}, status=status.HTTP_400_BAD_REQUEST)
+        try:
+            limit = int(params.get("limit", SEARCH_LIMIT))
+        except ValueError:
+            limit = 0
+        if not 1 <= limit <= MAX_SEARCH_LIMIT:
+            return Response({"detail": f"limit must be between 1 and {MAX_SEARCH_LIMIT}"}, status=status.HTTP_400_BAD_REQUEST)
+
+        seasons = season_q(request)
+        if seasons:
+            seasons |= Q(season=None)
+        entries = matching(params.get("q", "")).filter(academy_q(request), seasons, kind__in=kinds)
+        if not request.user.is_staff:
+            coach = getattr(request.user, "coach_profile", None)
+            if coach is None:
+                return Response([])
+            entries = entries.filter(coach_id=coach.id)
+        rows = entries.order_by("text", "kind", "object_id").values("kind", "object_id", "name", "group_id")[:limit]
+        return Response([{"type": r["kind"], "id": r["object_id"], "name": r["name"], "group": r["group_id"]} for r in rows])
+
+
+# One year; content-addressed media never changes under the same URL
+IMMUTABLE_CACHE_CONTROL = "public, max-age=31536000, immutable"
+
+
+def serve_media(request, path):
+    """Serve uploaded media with validators and a caching policy.
+
+    Content-hashed photos and their derivatives are marked immutable with a strong
+    ETag taken from the name; other files get a short, revalidated cache lifetime.
+    """
+    is_immutable = getattr(default_storage, "is_immutable_name", lambda name: False)(path)
+    if is_immutable:
+        etag = f'"{Path(path).stem}"'
+    else:
+        try:
+            stat = (Path(settings.MEDIA_ROOT) / path).stat()
+            etag = f'W/"{stat.st_mtime_ns:x}-{stat.st_size:x}"'
+        except OSError:
+            etag = None
+
+    cache_control = IMMUTABLE_CACHE_CONTROL if is_immutable else f"public, max-age={settings.MEDIA_CACHE_MAX_AGE}"
+    if_none_match = request.headers.get("If-None-Match")
+    revalidated = bool(etag and if_none_match) and etag.removeprefix("W/") in [e.removeprefix("W/") for e in parse_etags(if_none_match)]
+    if if_none_match:
+        cache_lookup("media_etag", revalidated)
+    if revalidated:
+        response = HttpResponseNotModified()
+    else:
+        response = static_serve(request, path, document_root=settings.MEDIA_ROOT)
+    if response.status_code in (200, 304):
+        response["Cache-Control"] = cache_control
+        if etag:
+            response["ETag"] = etag
+    return response
+
+
+def metrics_view(request):
+    """Prometheus scrape endpoint when ``METRICS_ENABLED``.
+
+    Scrapers send ``Authorization: Bearer <METRICS_TOKEN>`` when a token is set;
+    otherwise only ``METRICS_ALLOWED_IPS`` may scrape. Behind a reverse proxy
+    every client has the proxy's address, so use a token there.
+    """
+    if not getattr(settings, "METRICS_ENABLED", False):
+        raise Http404()
+    token = getattr(settings, "METRICS_TOKEN", "")
+    if token:
+        allowed = hmac.compare_digest(request.headers.get("Authorization", "").encode(), f"Bearer {token}".encode())
+    else:
+        addresses = getattr(settings, "METRICS_ALLOWED_IPS", ["127.0.0.1", "::1"])
+        allowed = "*" in addresses or request.META.get("REMOTE_ADDR") in addresses
+    if not allowed:
+        return HttpResponseForbidden()
+    body, content_type = render_metrics()
+    return HttpResponse(body, content_type=content_type)
+
+
+class GroupOwnedWriteMixin:
+    """Coaches may only create or move records into their own groups."""
+
+    def _check_group(self, serializer):
+        user = self.request.user
+        if user.is_staff:
+            return
+        coach = getattr(user, "coach_profile", None)
+        group = serializer.validated_data.get("group") or getattr(serializer.instance, "group", None)
+        if not coach or not group or group.coach_id != coach.id:
+            from rest_framework.exceptions import PermissionDenied
+            raise PermissionDenied("Coaches can only schedule training for their own group.")
+
+    def get_queryset(self):
+        user = self.request.user
+        queryset = self.queryset.filter(
+            academy_q(self.request, "group__academy"), season_q(self.request, "group__season")
+        ).select_related("group")
+        if user.is_staff:
+            return queryset
+        coach = getattr(user, "coach_profile", None)
+        if coach:
+            return queryset.filter(group__coach=coach)
+        return queryset.none()
+
+
+class TrainingScheduleViewSet(GroupOwnedWriteMixin, viewsets.ModelViewSet):
+    queryset = TrainingSchedule.objects.all()
+    serializer_class = TrainingScheduleSerializer
+    permission_classes = [IsAuthenticated, InAcademy, IsAdminOrCoachWriteOwnGroup]
+    filterset_fields = ["group", "weekday"]
+
+    def perform_create(self, serializer):
+        self._check_group(serializer)
+        serializer.save()
+
+    def perform_update(self, serializer):
+        self._check_group(serializer)
+        with transaction.atomic():
+            reschedule(serializer.save())
+
+    def perform_destroy(self, instance):
+        # Sessions already held stay (without a schedule); upcoming ones go
+        with transaction.atomic():
+            reschedule(instance)
+            instance.delete()
+
+
+class TrainingSessionViewSet(GroupOwnedWriteMixin, viewsets.ModelViewSet):
+    """Training calendar: ``GET /sessions/?since=YYYY-MM-DD&until=YYYY-MM-DD`` (default: this week)."""
+
+    queryset = TrainingSession.objects.all()
+    serializer_class = TrainingSessionSerializer
+    permission_classes = [IsAuthenticated, InAcademy, IsAdminOrCoachWriteOwnGroup]
+    filterset_fields = ["group", "cancelled"]
+    ordering_fields = ["date", "start_time"]
+
+    def list(self, request, *args, **kwargs):
+        try:
+            start, end = parse_window(request.query_params, week_window())
+        except ValueError as exc:
+            return Response({"detail": str(exc)}, status=status.HTTP_400_BAD_REQUEST)
+        user = request.user
+        coach = getattr(user, "coach_profile", None)
+        if user.is_staff:
+            groups = Group.objects.filter(academy_q(request), season_q(request))
+        elif coach:
+            groups = Group.objects.filter(academy_q(request), season_q(request), coach=coach)
+        else:
+            groups = Group.objects.none()
+        sessions = calendar(groups.values("id"), start, end).select_related("group").order_by("date", "start_time", "id")
+        queryset = self.filter_queryset(sessions)
+        return Response(self.get_serializer(queryset, many=True).data)
+
+    def perform_create(self, serializer):
+        self._check_group(serializer)
+        serializer.save()
+
+    def perform_update(self, serializer):
+        self._check_group(serializer)
+        # Edited sessions keep their changes when the schedule is changed
+        serializer.save(detached=True)
@@ -0,0 +1,32 @@
+"""Pre-load what the first requests of a fresh worker would otherwise pay for."""
+import time
+
+
+def _warm_urls():
+    from django.urls import get_resolver, reverse
+
+    # Imports every view module and builds the reverse lookup tables
+    get_resolver().url_patterns
+    reverse("me")
+
+
+def _warm_reports():
+    from .pdf import warm_up
+
+    warm_up()
+
+
+WARMUP_STEPS = {
+    "urls": _warm_urls,
+    "reports": _warm_reports,
+}
+
+
+def warm_up(steps=None) -> list[tuple[str, float]]:
+    """Run the named warm-up steps (all by default); returns ``(step, seconds)`` pairs."""
+    timings = []
+    for name in steps or WARMUP_STEPS:
+        started = time.perf_counter()
+        WARMUP_STEPS[name]()
+        timings.append((name, time.perf_counter() - started))
+    return timings